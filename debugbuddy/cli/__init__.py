@@ -33,13 +33,15 @@ def main(ctx, version):
         console.print("Usage: [cyan]dbug [COMMAND] [OPTIONS][/cyan]\n")
         console.print("Commands:")
         console.print("  [cyan]explain[/cyan]     Explain an error message")
-        console.print("  [cyan]predict[/cyan]     Predict errors in a file")
+        console.print("  [cyan]predict[/cyan]     Predict errors in a file or directory")
+        console.print("  [cyan]check[/cyan]       Check a file for errors")
         console.print("  [cyan]watch[/cyan]       Watch files for errors")
         console.print("  [cyan]history[/cyan]     View error history")
         console.print("  [cyan]train[/cyan]       Train custom patterns or ML models")
         console.print("  [cyan]search[/cyan]      Search error patterns")
         console.print("  [cyan]config[/cyan]      Manage configuration")
         console.print("  [cyan]github[/cyan]      GitHub integration")
+        console.print("  [cyan]serve[/cyan]       Run the background daemon")
         console.print("\nOptions:")
         console.print("  [cyan]--version, -v[/cyan]  Show version")
         console.print("  [cyan]--help, -h[/cyan]     Show this message")
@@ -85,6 +87,12 @@ try:
 except ImportError:
     pass
 
+try:
+    from .commands.check import check
+    main.add_command(check)
+except ImportError:
+    pass
+
 try:
     from .commands.train import train
     main.add_command(train)
@@ -97,5 +105,11 @@ try:
 except ImportError:
     pass
 
+try:
+    from .commands.serve import serve
+    main.add_command(serve)
+except ImportError:
+    pass
+
 if __name__ == "__main__":
     main()
@@ -1,10 +1,12 @@
 import click
+import itertools
 import sys
 from rich.console import Console
 from rich.panel import Panel
 from ...core.parsers import ErrorParser
+from ...core.parsers.segmenter import LogSegmenter
 from ...core.explainer import ErrorExplainer
-from ...storage.history import HistoryManager
+from ...storage.history import HistoryManager, deferred_writes
 from ...storage.config import ConfigManager
 from ...tui.runner import should_use_tui
 
@@ -22,27 +24,55 @@ def explain(error_input, file, ai, language):
     history = HistoryManager()
 
     if not error_input:
-        error_input = sys.stdin.read().strip()
-
-    if not error_input:
-        console.print("[yellow]No error provided[/yellow]")
-        console.print("[dim]Usage: dbug explain \"Your error message\"[/dim]")
-        console.print("[dim]Or pipe: python script.py 2>&1 | dbug explain[/dim]")
+        _explain_stream(sys.stdin, parser, explainer, history, config_mgr, ai, language)
         return
 
     if file:
         try:
             with open(error_input, 'r', encoding='utf-8') as f:
-                error_text = f.read().strip()
+                _explain_stream(f, parser, explainer, history, config_mgr, ai, language)
         except FileNotFoundError:
             console.print(f"[red]File not found: {error_input}[/red]")
-            return
         except Exception as e:
             console.print(f"[red]Error reading file: {e}[/red]")
-            return
-    else:
-        error_text = error_input
+        return
+
+    error_text = error_input.strip()
+    if not error_text:
+        _print_usage()
+        return
+
+    _explain_one(error_text, parser, explainer, history, config_mgr, ai, language, allow_tui=True)
+
+
+def _print_usage():
+    console.print("[yellow]No error provided[/yellow]")
+    console.print("[dim]Usage: dbug explain \"Your error message\"[/dim]")
+    console.print("[dim]Or pipe: python script.py 2>&1 | dbug explain[/dim]")
+
+
+def _explain_stream(stream, parser, explainer, history, config_mgr, ai, language):
+    blocks = LogSegmenter().segments(stream)
+    first = next(blocks, None)
+    if first is None:
+        _print_usage()
+        return
+
+    second = next(blocks, None)
+    if second is None:
+        _explain_one(first, parser, explainer, history, config_mgr, ai, language, allow_tui=True)
+        return
+
+    count = 0
+    # One history commit for the whole log rather than one per error.
+    with deferred_writes():
+        for block in itertools.chain((first, second), blocks):
+            count += 1
+            _explain_one(block, parser, explainer, history, config_mgr, ai, language, allow_tui=False)
+    console.print(f"\n[dim]Explained {count} errors[/dim]")
+
 
+def _explain_one(error_text, parser, explainer, history, config_mgr, ai, language, allow_tui):
     parsed = parser.parse(error_text, language=language)
 
     if not parsed:
@@ -72,7 +102,7 @@ def explain(error_input, file, ai, language):
 
     history.add(parsed, explanation)
 
-    if should_use_tui():
+    if allow_tui and should_use_tui():
         from ...tui.views import run_explain_view
         similar = history.find_similar(parsed)
         run_explain_view(parsed, explanation, similar)
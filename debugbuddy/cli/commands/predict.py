@@ -1,8 +1,10 @@
 import click
 from pathlib import Path
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
-from ...core.predictor import ErrorPredictor
+from ...core.changes import GitError
+from ...core.predictor import ErrorPredictor, TopPredictions
 from ...storage.config import ConfigManager
 from ...tui.runner import should_use_tui
 
@@ -13,30 +15,82 @@ console = Console()
 @click.option('--severity', type=click.Choice(['low', 'medium', 'high', 'critical']),
               help='Filter by severity level')
 @click.option('--limit', type=int, default=10, help='Maximum predictions to show')
-def predict(path, severity, limit):
+@click.option('--jobs', '-j', type=int, default=None,
+              help='Worker processes for directories (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Re-analyze files even if they are unchanged')
+@click.option('--changed', is_flag=True, help='Only analyze lines changed since HEAD (needs git)')
+@click.option('--base', metavar='REF', help='With --changed, compare with the merge base of REF instead')
+def predict(path, severity, limit, jobs, no_cache, changed, base):
     config = ConfigManager()
     predictor = ErrorPredictor(config)
+    if no_cache:
+        predictor.cache = None
 
     path = Path(path) if path else Path.cwd()
 
-    console.print(f"\n[bold cyan]Analyzing {path.name}...[/bold cyan]\n")
+    if changed or base:
+        path = path.resolve()
+        target = f"changes to {path.name}" + (f" since {base}" if base else "")
+        results = predictor.iter_changed_predictions(path, base, workers=jobs)
+    else:
+        target = path.name
+        results = predictor.iter_predictions([path], workers=jobs)
 
-    predictions = predictor.predict_file(path)
+    console.print(f"\n[bold cyan]Analyzing {target}...[/bold cyan]\n")
 
-    if severity:
-        predictions = [p for p in predictions if p.severity == severity]
+    top = TopPredictions(limit)
+    use_tui = should_use_tui()
+    analyzed = 0
+    try:
+        with Live(console=console, transient=True, refresh_per_second=8, auto_refresh=not use_tui) as live:
+            for _, file_predictions in results:
+                top.extend(p for p in file_predictions if not severity or p.severity == severity)
+                analyzed += 1
+                if not use_tui:
+                    live.update(_table(top.items(), path, f"Potential Errors ({analyzed} files analyzed)"))
+    except GitError as e:
+        console.print(f"[red]Cannot find changes: {e}[/red]")
+        return
+
+    if (changed or base) and not analyzed:
+        console.print("[green]No changed source files.[/green]")
+        return
 
-    predictions = predictions[:limit]
+    if predictor.cache is not None:
+        hits, misses = predictor.cache_stats()
+        console.print(f"[dim]Cache: {hits} hit{'s' if hits != 1 else ''}, "
+                      f"{misses} miss{'es' if misses != 1 else ''}[/dim]\n")
+
+    predictions = top.items()
+    _print_skipped(predictor.skipped)
 
     if not predictions:
         console.print("[green]No potential errors detected![/green]")
         return
-    if should_use_tui():
+    if use_tui:
         from ...tui.views import run_predict_view
         run_predict_view(predictions)
         return
 
-    table = Table(title="Potential Errors")
+    console.print(_table(predictions, path, "Potential Errors"))
+    console.print(f"\n[dim]Tip: Use --severity to filter by severity level[/dim]")
+
+
+def _print_skipped(skipped, shown: int = 5):
+    if not skipped:
+        return
+    console.print(f"[yellow]Skipped {len(skipped)} file{'s' if len(skipped) != 1 else ''}:[/yellow]")
+    for file, reason in skipped[:shown]:
+        console.print(f"  [dim]{file} ({reason})[/dim]")
+    if len(skipped) > shown:
+        console.print(f"  [dim]...and {len(skipped) - shown} more[/dim]")
+    console.print()
+
+
+def _table(predictions, path: Path, title: str) -> Table:
+    table = Table(title=title)
+    if path.is_dir():
+        table.add_column("File", style="green")
     table.add_column("Line", style="yellow")
     table.add_column("Type", style="red")
     table.add_column("Confidence", style="cyan")
@@ -44,12 +98,12 @@ def predict(path, severity, limit):
 
     for pred in predictions:
         confidence = f"{pred.confidence * 100:.0f}%"
+        file_column = [str(Path(pred.file).relative_to(path))] if path.is_dir() else []
         table.add_row(
+            *file_column,
             str(pred.line),
             pred.error_type,
             confidence,
             pred.message[:60] + "..." if len(pred.message) > 60 else pred.message
         )
-
-    console.print(table)
-    console.print(f"\n[dim]Tip: Use --severity to filter by severity level[/dim]")
+    return table
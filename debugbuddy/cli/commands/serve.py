@@ -0,0 +1,42 @@
+import click
+from rich.console import Console
+from ...daemon import client
+from ...daemon.server import DaemonServer, idle_timeout
+from ...storage.config import ConfigManager
+
+console = Console()
+
+@click.command()
+@click.option('--stop', is_flag=True, help='Stop the running daemon')
+@click.option('--status', is_flag=True, help='Show whether the daemon is running')
+@click.option('--idle', type=int, default=None, metavar='MINUTES',
+              help='Exit after this many idle minutes (0 = never)')
+def serve(stop, status, idle):
+    if stop:
+        if client.stop():
+            console.print("[green]Daemon stopped[/green]")
+        else:
+            console.print("[yellow]No daemon is running[/yellow]")
+        return
+
+    if status:
+        info = client.status()
+        if info is None:
+            console.print("[yellow]No daemon is running[/yellow]")
+            return
+        console.print(f"[green]Daemon running[/green] (pid {info['pid']}, v{info['version']})")
+        console.print(f"[dim]Up {info['uptime'] / 60:.0f} min, {info['requests']} requests served[/dim]")
+        return
+
+    server = DaemonServer(idle_timeout=idle_timeout(ConfigManager(), idle))
+    if not server.bind():
+        console.print("[yellow]A daemon is already running. Stop it with: dbug serve --stop[/yellow]")
+        return
+
+    console.print(f"\n[bold green]Serving on {server.path}[/bold green]")
+    console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+    server.warm()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
@@ -0,0 +1,111 @@
+import codecs
+import re
+import subprocess
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Inclusive (first, last) line ranges, sorted; None stands for the whole file.
+LineRanges = Optional[Tuple[Tuple[int, int], ...]]
+
+# The tree of a repository with no commits yet.
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+_HUNK = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+class GitError(Exception):
+    """Raised when the changes of a working tree cannot be read from git."""
+
+
+def _git(args: Sequence[str], cwd: Path) -> str:
+    try:
+        result = subprocess.run(
+            ['git', '-c', 'core.quotePath=false', *args],
+            cwd=cwd, capture_output=True, text=True, encoding='utf-8', errors='surrogateescape',
+        )
+    except OSError as e:
+        raise GitError(f"git is not available: {e.strerror or e}") from e
+    if result.returncode != 0:
+        message = result.stderr.strip().splitlines()
+        raise GitError(message[-1] if message else f"git {args[0]} failed")
+    return result.stdout
+
+
+def repo_root(path: Path) -> Path:
+    directory = path if path.is_dir() else path.parent
+    return Path(_git(['rev-parse', '--show-toplevel'], directory).strip())
+
+
+def _base_commit(root: Path, base: Optional[str]) -> str:
+    if base is not None:
+        try:
+            return _git(['merge-base', base, 'HEAD'], root).strip()
+        except GitError as e:
+            raise GitError(f"cannot compare with {base}: {e}") from e
+    try:
+        return _git(['rev-parse', '--verify', '--quiet', 'HEAD'], root).strip()
+    except GitError:
+        return EMPTY_TREE
+
+
+def _unquote(name: str) -> str:
+    # Git C-quotes names holding tabs, quotes or backslashes.
+    if name.startswith('"') and name.endswith('"'):
+        raw = name[1:-1].encode('utf-8', 'surrogateescape')
+        return codecs.escape_decode(raw)[0].decode('utf-8', 'surrogateescape')
+    return name
+
+
+def parse_diff(diff: str) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+    """Map each file of a ``--unified=0`` diff to its added or modified lines.
+
+    Files whose hunks only delete lines are kept with no ranges, since the
+    lines around a deletion may still be affected by it.
+    """
+    files: Dict[str, List[Tuple[int, int]]] = {}
+    current: Optional[List[Tuple[int, int]]] = None
+    for line in diff.splitlines():
+        if line.startswith('+++ '):
+            name = _unquote(line[4:].rstrip('\t'))
+            current = None if name == '/dev/null' else files.setdefault(name[2:], [])
+        elif line.startswith('@@') and current is not None:
+            match = _HUNK.match(line)
+            if match:
+                first = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                if count:
+                    current.append((first, first + count - 1))
+    return {name: tuple(sorted(ranges)) for name, ranges in files.items()}
+
+
+def changed_lines(path: Path, base: Optional[str] = None) -> Dict[Path, LineRanges]:
+    """Files under ``path`` that differ from ``base``, with their changed lines.
+
+    Without ``base`` the working tree, staged changes included, is compared
+    with HEAD. With it, the comparison is against the merge base of ``base``
+    and HEAD, which is what a branch would bring into ``base``. Untracked
+    files that are not ignored count as changed throughout.
+    """
+    path = Path(path).resolve()
+    root = repo_root(path)
+    pathspec = ['--', str(path.relative_to(root)) if path != root else '.']
+
+    # Explicit prefixes override diff.noprefix and diff.mnemonicPrefix, which
+    # parse_diff would otherwise misread.
+    diff = _git(['diff', _base_commit(root, base), '--unified=0', '--no-color', '--no-ext-diff',
+                 '--src-prefix=a/', '--dst-prefix=b/', '--diff-filter=d', '--ignore-submodules',
+                 *pathspec], root)
+    changes: Dict[Path, LineRanges] = {root / name: ranges for name, ranges in parse_diff(diff).items()}
+
+    untracked = _git(['ls-files', '--others', '--exclude-standard', '--full-name', '-z', *pathspec], root)
+    for name in filter(None, untracked.split('\0')):
+        changes[root / name] = None
+    return changes
+
+
+def in_ranges(line: int, ranges: LineRanges) -> bool:
+    if ranges is None:
+        return True
+    i = bisect_right(ranges, (line, float('inf')))
+    return i > 0 and ranges[i - 1][0] <= line <= ranges[i - 1][1]
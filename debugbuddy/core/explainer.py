@@ -1,17 +1,58 @@
-import difflib
 from typing import Dict, List, Optional
-import builtins
 import re
-from ..storage.patterns import PatternManager
+from ..storage.registry import PatternRegistry, shared_registry
+from .fingerprint import EXPLAIN_NORMALIZERS, SignatureCache, normalize, signature
+from .pattern_index import PatternIndex, SearchIndex
+from .symbols import suggest_names
 
 class ErrorExplainer:
 
-    def __init__(self):
-        self.pattern_mgr = PatternManager()
-        self.patterns = self._load_patterns()
+    def __init__(self, registry: Optional[PatternRegistry] = None):
+        self.registry = registry or shared_registry()
+        self.registry.expire()
+        self.pattern_mgr = self.registry.manager
+        self.patterns = self.registry.patterns
+        self._explain_cache = SignatureCache()
+        self._generation = self.registry.generation
+
+    def _language_key(self, language: Optional[str]) -> str:
+        return language if language and language in self.patterns else 'common'
+
+    def _compiled_for(self, language: Optional[str]) -> Dict:
+        key = self._language_key(language)
+        languages = (key,) if key == 'common' else (key, 'common')
+        return self.registry.compiled(('match', key), languages, lambda: self._compile(key))
+
+    def _compile(self, language: str) -> Dict:
+        # Each language is matched against its own patterns first and the
+        # common ones after, so that order is baked into one index per language.
+        common = list(self.patterns.get('common', []))
+        own = list(self.patterns[language]) if language != 'common' else []
+        index = PatternIndex(own + common)
+        languages = (language, 'common')
+        return {
+            'files': self.pattern_mgr.cached_files(languages),
+            'index': index,
+            'volatile_keywords': self._collect_volatile_keywords(index.patterns),
+        }
+
+    def _collect_volatile_keywords(self, patterns: List[Dict]) -> tuple:
+        # Keywords that normalization would rewrite, such as '401', can't be
+        # told apart by signature alone, so their hits join the cache key.
+        keywords = {
+            str(keyword).lower()
+            for pattern in patterns
+            for keyword in pattern.get('keywords', [])
+        }
+        return tuple(sorted(kw for kw in keywords if normalize(kw, EXPLAIN_NORMALIZERS) != kw.strip()))
 
-    def _load_patterns(self) -> Dict:
-        return self.pattern_mgr.load_patterns()
+    def pattern_stats(self) -> Dict[str, int]:
+        return {
+            'available': len(self.patterns),
+            'loaded': len(self.patterns.loaded_languages),
+            'indexed': sum(1 for key in self.registry.compiled_keys() if key[0] == 'match'),
+            'file_loads': self.patterns.loads,
+        }
 
     def explain(self, parsed_error: Dict) -> Dict:
 
@@ -19,10 +60,25 @@ class ErrorExplainer:
         language = parsed_error.get('language', 'common')
         message = parsed_error.get('message', '')
 
-        explanation = self._match_pattern(error_type, message, language)
+        # Looking up the index first lets the registry notice edited pattern
+        # files, which bumps its generation.
+        volatile_keywords = self._compiled_for(language)['volatile_keywords']
+        if self._generation != self.registry.generation:
+            self._explain_cache.clear()
+            self._generation = self.registry.generation
 
-        if not explanation:
-            explanation = self._generic_explanation(parsed_error)
+        message_lower = message.lower()
+        key = (
+            signature(parsed_error, EXPLAIN_NORMALIZERS),
+            tuple(kw for kw in volatile_keywords if kw in message_lower),
+        )
+        explanation = self._explain_cache.get(key)
+        if explanation is None:
+            explanation = self._match_pattern(error_type, message, language)
+            if not explanation:
+                explanation = self._generic_explanation(parsed_error)
+            self._explain_cache.put(key, explanation)
+        explanation = dict(explanation)
 
         if 'name' in error_type.lower() and 'not defined' in message.lower():
             explanation['suggestions'] = self._get_name_suggestions(message, parsed_error)
@@ -30,33 +86,8 @@ class ErrorExplainer:
         return explanation
 
     def _match_pattern(self, error_type: str, message: str, language: str) -> Optional[Dict]:
-
-        if language in self.patterns:
-            for pattern in self.patterns[language]:
-                if self._matches(error_type, message, pattern):
-                    return pattern.copy()
-
-        if 'common' in self.patterns:
-            for pattern in self.patterns['common']:
-                if self._matches(error_type, message, pattern):
-                    return pattern.copy()
-
-        return None
-
-    def _matches(self, error_type: str, message: str, pattern: Dict) -> bool:
-
-        pattern_type = pattern.get('type', '').lower()
-        keywords = pattern.get('keywords', [])
-
-        if pattern_type and pattern_type in error_type:
-            return True
-
-        message_lower = message.lower()
-        for keyword in keywords:
-            if keyword.lower() in message_lower:
-                return True
-
-        return False
+        pattern = self._compiled_for(language)['index'].match(error_type, message)
+        return pattern.copy() if pattern is not None else None
 
     def _generic_explanation(self, parsed_error: Dict) -> Dict:
         return {
@@ -72,14 +103,7 @@ class ErrorExplainer:
             return []
 
         undefined_name = match.group(1)
-
-        dir_builtins = dir(builtins)
-        close_matches = difflib.get_close_matches(
-            undefined_name,
-            dir_builtins,
-            n=3,
-            cutoff=0.6
-        )
+        close_matches = suggest_names(undefined_name, parsed_error.get('file'))
 
         suggestions = []
         if close_matches:
@@ -94,24 +118,24 @@ class ErrorExplainer:
 
         return suggestions
 
-    def search_patterns(self, keyword: str) -> List[Dict]:
-
-        results = []
-        keyword_lower = keyword.lower()
-
-        for lang, data in self.patterns.items():
-            for pattern in data:
-                searchable = [
-                    pattern.get('type', ''),
-                    pattern.get('simple', ''),
-                    pattern.get('fix', ''),
-                ] + pattern.get('keywords', [])
+    def _search_index(self) -> SearchIndex:
+        return self.registry.compiled(('search',), None, self._compile_search)['index']
 
-                if any(keyword_lower in str(field).lower() for field in searchable):
-                    results.append({
-                        'name': pattern.get('type', 'Unknown'),
-                        'description': pattern.get('simple', '').replace('Search ', ''),
-                        'language': lang
-                    })
+    def _compile_search(self) -> Dict:
+        index = SearchIndex(self.patterns)
+        return {
+            'files': self.pattern_mgr.cached_files(self.patterns.available),
+            'index': index,
+        }
 
-        return results
\ No newline at end of file
+    def search_patterns(self, keyword: str, limit: Optional[int] = None) -> List[Dict]:
+        results = [
+            {
+                'name': pattern.get('type', 'Unknown'),
+                'description': pattern.get('simple', '').replace('Search ', ''),
+                'language': lang,
+                'score': score,
+            }
+            for score, lang, pattern in self._search_index().search(keyword)
+        ]
+        return results[:limit] if limit else results
@@ -0,0 +1,69 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+ADDRESS = (re.compile(r'0x[0-9a-fA-F]+'), '<addr>')
+TEMP_PATH = (
+    re.compile(r'(?:/tmp|/var/folders|/private/var/folders|[A-Za-z]:\\[^\s"\']*?\\Temp)[^\s"\':,)]*'),
+    '<tmp>',
+)
+QUOTED = (re.compile(r'(["\'])[^"\'\n]*\1'), "'<id>'")
+LINE_NUMBER = (re.compile(r'\bline \d+', re.IGNORECASE), 'line <n>')
+POSITION = (re.compile(r':\d+(?::\d+)?\b'), ':<n>')
+NUMBER = (re.compile(r'\b\d+(?:\.\d+)?\b'), '<num>')
+WHITESPACE = (re.compile(r'\s+'), ' ')
+
+NORMALIZERS = (ADDRESS, TEMP_PATH, QUOTED, LINE_NUMBER, POSITION, NUMBER, WHITESPACE)
+
+# Pattern keywords can match inside quoted names and temp paths, so keys for
+# cached explanations only drop the purely numeric noise.
+EXPLAIN_NORMALIZERS = (ADDRESS, LINE_NUMBER, POSITION, NUMBER)
+
+
+def normalize(text: str, normalizers=NORMALIZERS) -> str:
+    for pattern, replacement in normalizers:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def signature(parsed: Dict, normalizers=NORMALIZERS) -> str:
+    key = '\x1f'.join((
+        str(parsed.get('language') or 'unknown'),
+        str(parsed.get('type') or ''),
+        normalize(str(parsed.get('message') or ''), normalizers),
+    ))
+    return hashlib.sha1(key.encode('utf-8', 'replace')).hexdigest()[:16]
+
+
+class SignatureCache:
+    """Bounded LRU used to memoize results for repeated errors."""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,5 +1,7 @@
+import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from .base import BaseParser
 from .python import PythonParser
 from .javascript import JavaScriptParser
@@ -8,10 +10,31 @@ from .c import CParser
 from .php import PHPParser
 from .java import JavaParser
 from .ruby import RubyParser
-from typing import Dict, List, Optional, Any, Tuple
+from .detector import LanguageDetector
+from .segmenter import LogSegmenter
+from .frames import LazyFrames
+from .record import ParsedError
+from ..fingerprint import SignatureCache
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 
+_worker_parser = None
+
+
+def _parse_chunk(task: Tuple[List[str], Optional[str]]) -> List['ParsedError']:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ErrorParser()
+    texts, language = task
+    return [_worker_parser.parse(text, language=language) for text in texts]
+
+
 class ErrorParser:
+    detector = LanguageDetector()
+    PARALLEL_THRESHOLD = 2000
+    MAX_CACHED_TEXT = 65536
+    _cache = SignatureCache(max_size=1024)
+
     def __init__(self):
         self.parsers = {
             'python': PythonParser(),
@@ -23,8 +46,24 @@ class ErrorParser:
             'ruby': RubyParser(),
         }
 
-    def parse(self, error_text: str, language=None):
+    def parse(self, error_text: str, language=None) -> ParsedError:
         error_text = error_text.strip()
+        if len(error_text) > self.MAX_CACHED_TEXT:
+            return self._parse(error_text, language)
+
+        key = (language, error_text)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._parse(error_text, language)
+            self._cache.put(key, cached)
+        return cached.copy()
+
+    def _parse(self, error_text: str, language=None) -> ParsedError:
+        result = ParsedError.from_dict(error_text, self._detect_and_parse(error_text, language))
+        result.frames = LazyFrames(error_text, result.language)
+        return result
+
+    def _detect_and_parse(self, error_text: str, language=None) -> Dict:
         lower_text = error_text.lower()
 
         if language:
@@ -34,91 +73,33 @@ class ErrorParser:
                     result['language'] = language
                     return result
 
-        js_specific_indicators = [
-            'referenceerror',
-            'urierror',
-            'evalerror',
-        ]
-        
-        if any(indicator in lower_text for indicator in js_specific_indicators):
-            result = self.parsers['javascript'].parse(error_text)
+        for detected in self.detector.candidates(lower_text):
+            result = self.parsers[detected].parse(error_text)
             if result:
-                result['language'] = 'javascript'
-                return result
-        
-        python_indicators = [
-            'nameerror', 'valueerror', 'indentationerror',
-            'modulenotfounderror', 'zerodivisionerror', 'filenotfounderror',
-            'traceback', 'file "', "name '", 'is not defined'
-        ]
-        
-        if any(indicator in lower_text for indicator in python_indicators):
-            result = self.parsers['python'].parse(error_text)
-            if result:
-                result['language'] = 'python'
-                return result
-        
-        java_indicators = ['exception in thread', 'java.lang.', 'nullpointerexception', '.java:']
-        if any(indicator in lower_text for indicator in java_indicators):
-            result = self.parsers['java'].parse(error_text)
-            if result:
-                result['language'] = 'java'
+                result['language'] = detected
                 return result
 
-        ruby_indicators = ['nomethoderror', 'ruby', '.rb:', 'undefined method', 'syntaxerror']
-        if any(indicator in lower_text for indicator in ruby_indicators):
-            result = self.parsers['ruby'].parse(error_text)
-            if result:
-                result['language'] = 'ruby'
-                return result
-
-        if any(err in lower_text for err in ['typeerror', 'syntaxerror']):
-            if any(clue in lower_text for clue in ['cannot read property', 'undefined', 'null', 'javascript', 'js', 'node']):
-                result = self.parsers['javascript'].parse(error_text)
-                if result:
-                    result['language'] = 'javascript'
-                    return result
-            
-            if any(clue in lower_text for clue in ['traceback', "name '", 'python', '.py']):
-                result = self.parsers['python'].parse(error_text)
-                if result:
-                    result['language'] = 'python'
-                    return result
-            
-            result = self.parsers['python'].parse(error_text)
-            if result:
-                result['language'] = 'python'
-                return result
-        
-        if any(err in lower_text for err in ['indexerror', 'keyerror', 'attributeerror', 'importerror']):
-            result = self.parsers['python'].parse(error_text)
-            if result:
-                result['language'] = 'python'
-                return result
-        
-        ts_indicators = ['type error', 'cannot find name', 'typescript', 'ts', 'ts2']
-        if any(indicator in lower_text for indicator in ts_indicators):
-            result = self.parsers['typescript'].parse(error_text)
-            if result:
-                result['language'] = 'typescript'
-                return result
-        
-        c_indicators = ['undefined reference', 'gcc', 'segmentation fault', 'segfault']
-        if any(indicator in lower_text for indicator in c_indicators):
-            result = self.parsers['c'].parse(error_text)
-            if result:
-                result['language'] = 'c'
-                return result
-        
-        php_indicators = ['parse error', 'fatal error', 'php']
-        if any(indicator in lower_text for indicator in php_indicators):
-            result = self.parsers['php'].parse(error_text)
-            if result:
-                result['language'] = 'php'
-                return result
-        
         return self._parse_generic(error_text)
 
+    def parse_stream(self, stream: Iterable[str], language=None) -> Iterator[ParsedError]:
+        for block in LogSegmenter().segments(stream):
+            yield self.parse(block, language=language)
+
+    def parse_many(self, error_texts: Iterable[str], workers: Optional[int] = None,
+                   language=None, chunk_size: int = 500) -> List[ParsedError]:
+        texts = list(error_texts)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(texts) < self.PARALLEL_THRESHOLD:
+            return [self.parse(text, language=language) for text in texts]
+
+        chunk_size = max(1, min(chunk_size, -(-len(texts) // workers)))
+        chunks = [(texts[i:i + chunk_size], language) for i in range(0, len(texts), chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return [parsed for chunk in pool.map(_parse_chunk, chunks) for parsed in chunk]
+        except (OSError, RuntimeError):
+            return [self.parse(text, language=language) for text in texts]
+
     def _parse_generic(self, text: str) -> Dict:
         lines = text.split('\n')
         first_line = lines[0] if lines else text
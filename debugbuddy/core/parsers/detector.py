@@ -0,0 +1,135 @@
+import re
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Sequence, Tuple
+
+JS_SPECIFIC_INDICATORS = ('referenceerror', 'urierror', 'evalerror')
+
+PYTHON_INDICATORS = (
+    'nameerror', 'valueerror', 'indentationerror',
+    'modulenotfounderror', 'zerodivisionerror', 'filenotfounderror',
+    'traceback', 'file "', "name '", 'is not defined',
+)
+
+JAVA_INDICATORS = ('exception in thread', 'java.lang.', 'nullpointerexception', '.java:')
+
+RUBY_INDICATORS = ('nomethoderror', 'ruby', '.rb:', 'undefined method', 'syntaxerror')
+
+AMBIGUOUS_ERRORS = ('typeerror', 'syntaxerror')
+
+JS_CLUES = ('cannot read property', 'undefined', 'null', 'javascript', 'js', 'node')
+
+PYTHON_RUNTIME_ERRORS = ('indexerror', 'keyerror', 'attributeerror', 'importerror')
+
+TS_INDICATORS = ('type error', 'cannot find name', 'typescript', 'ts', 'ts2')
+
+C_INDICATORS = ('undefined reference', 'gcc', 'segmentation fault', 'segfault')
+
+PHP_INDICATORS = ('parse error', 'fatal error', 'php')
+
+# Each rule fires when every indicator group has at least one hit. Rules are
+# listed in priority order; that order decides ties between languages.
+DETECTION_RULES: Tuple[Tuple[str, Tuple[Sequence[str], ...]], ...] = (
+    ('javascript', (JS_SPECIFIC_INDICATORS,)),
+    ('python', (PYTHON_INDICATORS,)),
+    ('java', (JAVA_INDICATORS,)),
+    ('ruby', (RUBY_INDICATORS,)),
+    ('javascript', (AMBIGUOUS_ERRORS, JS_CLUES)),
+    ('python', (AMBIGUOUS_ERRORS,)),
+    ('python', (PYTHON_RUNTIME_ERRORS,)),
+    ('typescript', (TS_INDICATORS,)),
+    ('c', (C_INDICATORS,)),
+    ('php', (PHP_INDICATORS,)),
+)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Builds a regex matching any of ``words``, longest first at each position.
+
+    Alternatives share their common prefixes, so the regex engine tests one
+    branch per character instead of trying every word in turn.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class LanguageDetector:
+    """Scores languages from indicator hits using a rule table built once.
+
+    Each distinct indicator is searched for at most once per text, however many
+    rules share it, and ``candidates`` only scans as far as it has to.
+    ``scan`` finds every indicator in one regex pass: a match also implies the
+    indicators inside it, and only those that could begin inside a match and
+    run past its end need a second look.
+    """
+
+    def __init__(self, rules=DETECTION_RULES):
+        self.rules = tuple(
+            (language, tuple(tuple(dict.fromkeys(group)) for group in groups))
+            for language, groups in rules
+        )
+        self.indicators = tuple(dict.fromkeys(
+            ind for _, groups in self.rules for group in groups for ind in group
+        ))
+        self.pattern = re.compile(_trie_pattern(self.indicators))
+        self.contained = {
+            ind: frozenset(other for other in self.indicators if other in ind)
+            for ind in self.indicators
+        }
+        self.straddling = {
+            ind: tuple(
+                other for other in self.indicators
+                if other not in ind and any(ind.endswith(other[:k]) for k in range(1, len(other)))
+            )
+            for ind in self.indicators
+        }
+
+    def candidates(self, lower_text: str) -> Iterator[str]:
+        hits: Dict[str, bool] = {}
+
+        def hit(indicator: str) -> bool:
+            found = hits.get(indicator)
+            if found is None:
+                found = hits[indicator] = indicator in lower_text
+            return found
+
+        yielded = set()
+        for language, groups in self.rules:
+            if language in yielded:
+                continue
+            if all(any(hit(ind) for ind in group) for group in groups):
+                yielded.add(language)
+                yield language
+
+    def scan(self, lower_text: str) -> FrozenSet[str]:
+        if not self.indicators:
+            return frozenset()
+        hits = set()
+        for match in set(self.pattern.findall(lower_text)):
+            hits.update(self.contained[match])
+        for ind in {other for match in tuple(hits) for other in self.straddling[match]} - hits:
+            if ind in lower_text:
+                hits.add(ind)
+        return frozenset(hits)
+
+    def rank(self, lower_text: str) -> List[Tuple[str, int]]:
+        hits = self.scan(lower_text)
+        evidence: Dict[str, set] = {}
+        for language, groups in self.rules:
+            matched = [hits.intersection(group) for group in groups]
+            if all(matched):
+                evidence.setdefault(language, set()).update(*matched)
+        # Stable sort: rule priority still decides between equal scores.
+        return sorted(((language, len(found)) for language, found in evidence.items()),
+                      key=lambda item: item[1], reverse=True)
@@ -0,0 +1,100 @@
+import re
+from typing import Dict, Iterator, List, Optional, Pattern
+
+FRAME_PATTERNS: Dict[str, Pattern] = {
+    'python': re.compile(r'File "(?P<file>[^"]+)", line (?P<line>\d+)(?:, in (?P<function>[^\n]+))?'),
+    'javascript': re.compile(
+        r'^\s*at (?:(?P<function>[^\n(]+?) \()?(?P<file>[^\s()]+?):(?P<line>\d+)(?::\d+)?\)?$',
+        re.MULTILINE,
+    ),
+    'java': re.compile(
+        r'^\s*at (?P<function>[\w$.<>/]+)\((?P<file>[^():\n]+)(?::(?P<line>\d+))?\)',
+        re.MULTILINE,
+    ),
+}
+FRAME_PATTERNS['typescript'] = FRAME_PATTERNS['javascript']
+
+
+class Frame:
+    """A single stack frame; ``offset`` is where it starts in the source text."""
+
+    __slots__ = ('file', 'line', 'function', 'offset')
+
+    def __init__(self, file: str, line: Optional[int], function: Optional[str], offset: int):
+        self.file = file
+        self.line = line
+        self.function = function
+        self.offset = offset
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Frame):
+            return NotImplemented
+        return (self.file, self.line, self.function, self.offset) == \
+            (other.file, other.line, other.function, other.offset)
+
+    def __hash__(self) -> int:
+        return hash((self.file, self.line, self.function, self.offset))
+
+    def __repr__(self) -> str:
+        return f"Frame(file={self.file!r}, line={self.line!r}, function={self.function!r}, offset={self.offset})"
+
+
+def extract_frames(text: str, language: Optional[str]) -> List[Frame]:
+    pattern = FRAME_PATTERNS.get(language or '')
+    if pattern is None:
+        return []
+
+    frames = []
+    for match in pattern.finditer(text):
+        line = match.group('line')
+        function = match.group('function')
+        frames.append(Frame(
+            match.group('file'),
+            int(line) if line else None,
+            function.strip() if function else None,
+            match.start(),
+        ))
+    return frames
+
+
+class LazyFrames:
+    """Sequence of frames that only scans the text the first time it is read."""
+
+    __slots__ = ('_text', '_language', '_frames')
+
+    def __init__(self, text: str, language: Optional[str]):
+        self._text = text
+        self._language = language
+        self._frames: Optional[List[Frame]] = None
+
+    @property
+    def materialized(self) -> bool:
+        return self._frames is not None
+
+    def _load(self) -> List[Frame]:
+        if self._frames is None:
+            self._frames = extract_frames(self._text, self._language)
+            self._text = None
+        return self._frames
+
+    def __iter__(self) -> Iterator[Frame]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._load())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyFrames):
+            other = other._load()
+        return self._load() == other
+
+    def __repr__(self) -> str:
+        if self._frames is None:
+            return f"LazyFrames(<{self._language} frames not loaded>)"
+        return f"LazyFrames({self._frames!r})"
@@ -1,23 +1,77 @@
+import builtins
 import re
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from .base import BaseParser
 
+# Exception classes with a dedicated display type, in the order they win when
+# a traceback mentions more than one of them.
+KNOWN_ERRORS = (
+    ('NameError', 'Name Error'),
+    ('TypeError', 'Type Error'),
+    ('IndexError', 'Index Error'),
+    ('KeyError', 'Key Error'),
+    ('SyntaxError', 'Syntax Error'),
+    ('AttributeError', 'Attribute Error'),
+    ('ImportError', 'Import Error'),
+    ('ModuleNotFoundError', 'Module Not Found Error'),
+    ('ValueError', 'Value Error'),
+)
+
+KNOWN_PRIORITY = {name: rank for rank, (name, _) in enumerate(KNOWN_ERRORS)}
+KNOWN_PRIORITY['ModuleNotFoundError'] = KNOWN_PRIORITY['ImportError']
+GENERIC_PRIORITY = len(KNOWN_ERRORS)
+UNMATCHED = GENERIC_PRIORITY + 1
+MAX_TYPE_TABLE = 4096
+MAX_CLASS_NAME = 80
+
+
+def _spaced_type(name: str) -> str:
+    base = name[:-5]
+    spaced = re.sub(r'([A-Z])', r' \1', base).strip()
+    return f"{spaced} Error"
+
+
+def _classify(name: str) -> Tuple[int, str]:
+    # Subclasses such as ``MyKeyError`` report as the known error they end with.
+    for known, display in KNOWN_ERRORS:
+        if name.endswith(known):
+            return KNOWN_PRIORITY[known], display
+    if name == 'Error':
+        return UNMATCHED, ''
+    return GENERIC_PRIORITY, _spaced_type(name)
+
+
+# Maps the class-name prefix before "Error" to its priority and display type,
+# e.g. "ZeroDivision" -> (GENERIC_PRIORITY, "Zero Division Error").
+TYPE_TABLE: Dict[str, Tuple[int, str]] = {
+    name[:-5]: _classify(name) for name in dir(builtins) if name.endswith('Error')
+}
+
+
+def _remember_type(prefix: str) -> Tuple[int, str]:
+    entry = _classify(prefix + 'Error')
+    if len(TYPE_TABLE) < MAX_TYPE_TABLE:
+        TYPE_TABLE[prefix] = entry
+    return entry
+
+
 class PythonParser(BaseParser):
     language = 'python'
 
     PATTERNS = {
-        'traceback': re.compile(r'Traceback \(most recent call last\):.*?(\w+Error.*?)(?:\n|$)', re.DOTALL),
-        'error_line': re.compile(r'(\w+Error): (.+)'),
-        'syntax_error': re.compile(r'SyntaxError: (.+)'),
-        'name_error': re.compile(r'NameError: name \'([^\']+)\' is not defined'),
-        'type_error': re.compile(r'TypeError: (.+)'),
-        'attribute_error': re.compile(r'AttributeError: (.+)'),
-        'import_error': re.compile(r'(ImportError|ModuleNotFoundError): (.+)'),
-        'index_error': re.compile(r'IndexError: (.+)'),
-        'key_error': re.compile(r'KeyError: (.+)'),
-        'value_error': re.compile(r'ValueError: (.+)'),
+        'file_line': re.compile(r'File "([^"]+)", line (\d+)'),
+        'error': re.compile(r'Error:'),
+        'class_prefix': re.compile(r'\w*\Z'),
+        'message': re.compile(r'\s*([^\n]+)'),
+        'name_quoted': re.compile(r"name ['\"]([^'\"]+)['\"] is not defined", re.IGNORECASE),
+        'name_bare': re.compile(r"name ([^\s]+) is not defined", re.IGNORECASE),
     }
 
+    _find_file = PATTERNS['file_line'].search
+    _find_error = PATTERNS['error'].search
+    _class_prefix = PATTERNS['class_prefix'].search
+    _message_at = PATTERNS['message'].match
+
     def parse(self, text: str) -> Optional[Dict]:
         result = {
             "raw": text,
@@ -28,93 +82,35 @@ class PythonParser(BaseParser):
             "language": "python"
         }
 
-        file_match = re.search(r'File "([^"]+)", line (\d+)', text)
+        file_match = self._find_file(text)
         if file_match:
             result['file'] = file_match.group(1)
             result['line'] = int(file_match.group(2))
 
-        text_clean = text.strip()
+        text_clean = result['message']
 
         if "NameError" in text_clean:
-            name_patterns = [
-                r"name ['\"]([^'\"]+)['\"] is not defined",
-                r"name ([^\s]+) is not defined",
-            ]
-            
-            for pattern in name_patterns:
-                match = re.search(pattern, text_clean, re.IGNORECASE)
-                if match:
-                    var_name = match.group(1)
-                    result['type'] = 'Name Error'
-                    result['message'] = f"name '{var_name}' is not defined"
-                    return result
-            
-            msg_match = re.search(r'NameError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
+            match = (self.PATTERNS['name_quoted'].search(text_clean)
+                     or self.PATTERNS['name_bare'].search(text_clean))
+            if match:
                 result['type'] = 'Name Error'
-                result['message'] = msg_match.group(1).strip()
+                result['message'] = f"name '{match.group(1)}' is not defined"
                 return result
 
-        if "TypeError" in text_clean:
-            msg_match = re.search(r'TypeError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Type Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
-
-        if "IndexError" in text_clean:
-            msg_match = re.search(r'IndexError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Index Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
-
-        if "KeyError" in text_clean:
-            msg_match = re.search(r'KeyError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Key Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
-
-        if "SyntaxError" in text_clean:
-            msg_match = re.search(r'SyntaxError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Syntax Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
-
-        if "AttributeError" in text_clean:
-            msg_match = re.search(r'AttributeError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Attribute Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
-
-        if "ImportError" in text_clean or "ModuleNotFoundError" in text_clean:
-            msg_match = re.search(r'(ImportError|ModuleNotFoundError):\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                error_name = msg_match.group(1)
-                result['type'] = 'Import Error' if error_name == 'ImportError' else 'Module Not Found Error'
-                result['message'] = msg_match.group(2).strip()
-                return result
-
-        if "ValueError" in text_clean:
-            msg_match = re.search(r'ValueError:\s*(.+?)(?:\n|$)', text_clean)
-            if msg_match:
-                result['type'] = 'Value Error'
-                result['message'] = msg_match.group(1).strip()
-                return result
+        best_rank = UNMATCHED
+        match = self._find_error(text_clean)
+        while match is not None:
+            start, end = match.span()
+            name = self._class_prefix(text_clean, start - MAX_CLASS_NAME if start > MAX_CLASS_NAME else 0, start).group()
+            entry = TYPE_TABLE.get(name) or _remember_type(name)
+            if entry[0] < best_rank:
+                message = self._message_at(text_clean, end)
+                if message is not None:
+                    best_rank = entry[0]
+                    result['type'] = entry[1]
+                    result['message'] = message.group(1).strip()
+                    if best_rank == 0:
+                        break
+            match = self._find_error(text_clean, end)
 
-        error_match = re.search(r'(\w+Error):\s*(.+?)(?:\n|$)', text_clean)
-        if error_match:
-            error_type = error_match.group(1)
-            if error_type.endswith('Error'):
-                base = error_type[:-5]
-                spaced = re.sub(r'([A-Z])', r' \1', base).strip()
-                result['type'] = f"{spaced} Error"
-            else:
-                result['type'] = error_type
-            result['message'] = error_match.group(2).strip()
-            return result
-
-        return result
\ No newline at end of file
+        return result
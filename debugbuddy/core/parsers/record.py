@@ -0,0 +1,145 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+Buffer = Union[str, memoryview]
+Span = Tuple[int, int]
+
+FIELDS = ('raw', 'type', 'message', 'file', 'line', 'language', 'frames')
+
+
+class ParsedError(MutableMapping):
+    """A parse result that points into the text it was parsed from.
+
+    ``raw`` and ``message`` are kept as ``(start, end)`` spans over a shared
+    source buffer and only turned into strings when read, so a batch of
+    results holds one copy of the log rather than one per field. The record
+    behaves like the dict the parsers used to return.
+    """
+
+    __slots__ = ('_source', '_raw', '_message', 'type', 'file', 'line', 'language', 'frames', '_extra')
+
+    def __init__(self, source: Buffer, raw: Optional[Span] = None, message: Union[Span, str, None] = None,
+                 type: str = 'Unknown Error', file: Optional[str] = None, line: Optional[int] = None,
+                 language: str = 'unknown', frames=None):
+        self._source = source
+        self._raw = raw if raw is not None else (0, len(source))
+        self._message = message if message is not None else self._raw
+        self.type = type
+        self.file = file
+        self.line = line
+        self.language = language
+        self.frames = frames
+        self._extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, source: str, result: Dict) -> 'ParsedError':
+        record = cls(
+            source,
+            type=result.get('type', 'Unknown Error'),
+            file=result.get('file'),
+            line=result.get('line'),
+            language=result.get('language', 'unknown'),
+            frames=result.get('frames'),
+        )
+        raw = result.get('raw')
+        if raw is not None and raw is not source:
+            record.raw = raw
+        record.message = result.get('message', '')
+        for key, value in result.items():
+            if key not in FIELDS:
+                record[key] = value
+        return record
+
+    def _slice(self, span: Span) -> str:
+        start, end = span
+        if isinstance(self._source, str):
+            return self._source[start:end]
+        return bytes(self._source[start:end]).decode('utf-8', 'replace')
+
+    @property
+    def source(self) -> Buffer:
+        return self._source
+
+    @property
+    def raw(self) -> str:
+        return self._slice(self._raw)
+
+    @raw.setter
+    def raw(self, value: str):
+        self._raw = self._span_of(value)
+
+    @property
+    def message(self) -> str:
+        message = self._message
+        return message if isinstance(message, str) else self._slice(message)
+
+    @message.setter
+    def message(self, value: str):
+        self._message = self._span_of(value)
+
+    def _span_of(self, value: Union[str, Span]) -> Union[str, Span]:
+        if not isinstance(value, str) or not isinstance(self._source, str):
+            return value
+        if value is self._source:
+            return (0, len(value))
+        start = self._source.find(value) if value else -1
+        return (start, start + len(value)) if start >= 0 else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FIELDS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in FIELDS:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in FIELDS:
+            raise KeyError(f"{key!r} is a fixed field of ParsedError")
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key) -> bool:
+        return key in FIELDS or bool(self._extra and key in self._extra)
+
+    def copy(self) -> 'ParsedError':
+        clone = ParsedError.__new__(ParsedError)
+        clone._source = self._source
+        clone._raw = self._raw
+        clone._message = self._message
+        clone.type = self.type
+        clone.file = self.file
+        clone.line = self.line
+        clone.language = self.language
+        clone.frames = self.frames
+        clone._extra = dict(self._extra) if self._extra is not None else None
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __repr__(self) -> str:
+        return f"ParsedError(type={self.type!r}, message={self.message!r}, language={self.language!r})"
@@ -0,0 +1,117 @@
+import re
+from collections import deque
+from typing import Iterable, Iterator, List, Optional
+
+PYTHON_TRACEBACK = re.compile(r'^Traceback \(most recent call last\):')
+# ``python bad.py`` reports a SyntaxError without a traceback header.
+PYTHON_SYNTAX_LOCATION = re.compile(r'^\s*File "[^"]*", line \d+\s*$')
+JAVA_EXCEPTION = re.compile(r'^Exception in thread ')
+GCC_DIAGNOSTIC = re.compile(r'^[^\s:][^:]*:\d+(?::\d+)?: (?:fatal )?error: ')
+GCC_NOTE = re.compile(r'^[^\s:][^:]*:\d+(?::\d+)?: note: |^In file included from |^[^\s:][^:]*: In function ')
+ERROR_LINE = re.compile(
+    r'^(?:Uncaught )?(?:PHP )?[A-Za-z_][\w.$:]*(?:Error|Exception)\b(?::|$)'
+    r'|^(?:PHP )?(?:Fatal|Parse) error: '
+)
+FRAME_LINE = re.compile(r'^\s+at |^\s+\.\.\. \d+ more|^Caused by: |^\s+from \S+:\d+')
+GCC_CONTEXT = re.compile(r'^\s*\d*\s*\|')
+
+
+class LogSegmenter:
+    """Splits a log stream into individual error blocks.
+
+    Lines are consumed one at a time and a block is yielded as soon as the
+    next line cannot belong to it, so memory stays bounded by
+    ``max_block_lines`` regardless of how large the log is.
+    """
+
+    def __init__(self, max_block_lines: int = 200, max_line_length: int = 4096):
+        self.max_block_lines = max_block_lines
+        self.max_line_length = max_line_length
+
+    def segments(self, stream: Iterable[str]) -> Iterator[str]:
+        block: Optional[_Block] = None
+        preamble: List[str] = []
+        emitted = False
+
+        for raw_line in stream:
+            line = raw_line.rstrip('\r\n')[:self.max_line_length]
+
+            if block is not None:
+                if block.accepts(line):
+                    block.append(line)
+                    if block.closed:
+                        yield block.text()
+                        emitted = True
+                        block = None
+                    continue
+                yield block.text()
+                emitted = True
+                block = None
+
+            kind = self._block_kind(line)
+            if kind:
+                block = _Block(kind, line, self.max_block_lines)
+            elif not emitted and len(preamble) < self.max_block_lines and line.strip():
+                preamble.append(line)
+
+        if block is not None:
+            yield block.text()
+            emitted = True
+
+        if not emitted and preamble:
+            yield '\n'.join(preamble)
+
+    def _block_kind(self, line: str) -> Optional[str]:
+        if PYTHON_TRACEBACK.match(line) or PYTHON_SYNTAX_LOCATION.match(line):
+            return 'python'
+        if JAVA_EXCEPTION.match(line):
+            return 'java'
+        if GCC_DIAGNOSTIC.match(line):
+            return 'gcc'
+        if ERROR_LINE.match(line):
+            return 'error'
+        return None
+
+
+class _Block:
+    __slots__ = ('kind', 'head', 'tail', 'dropped', 'limit', 'closed')
+
+    def __init__(self, kind: str, first_line: str, limit: int):
+        self.kind = kind
+        self.limit = max(limit, 2)
+        self.head: List[str] = [first_line]
+        self.tail: deque = deque(maxlen=self.limit // 2)
+        self.dropped = 0
+        self.closed = False
+
+    def accepts(self, line: str) -> bool:
+        if not line.strip():
+            return False
+        if self.kind == 'python':
+            # Indented frames belong to the traceback; the first flush-left
+            # line is the exception itself and ends the block.
+            return True
+        if self.kind == 'gcc':
+            return bool(line[:1].isspace() or GCC_CONTEXT.match(line) or GCC_NOTE.match(line))
+        return bool(FRAME_LINE.match(line))
+
+    def append(self, line: str):
+        if self.kind == 'python' and not line[:1].isspace():
+            self.closed = True
+        if len(self.head) < self.limit - self.tail.maxlen:
+            self.head.append(line)
+            return
+        if len(self.tail) == self.tail.maxlen:
+            self.dropped += 1
+        self.tail.append(line)
+
+    def text(self) -> str:
+        lines = list(self.head)
+        if self.dropped:
+            lines.append(f'  ... {self.dropped} lines omitted ...')
+        lines.extend(self.tail)
+        return '\n'.join(lines)
+
+
+def iter_error_blocks(stream: Iterable[str], max_block_lines: int = 200) -> Iterator[str]:
+    return LogSegmenter(max_block_lines=max_block_lines).segments(stream)
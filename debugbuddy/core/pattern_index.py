@@ -0,0 +1,243 @@
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+GRAM = 3
+MAX_TYPE_CACHE = 1024
+
+
+def _grams(text: str) -> Set[str]:
+    return set(map(''.join, zip(text, text[1:], text[2:])))
+
+
+class SubstringIndex:
+    """Finds which needles may occur in a haystack without testing them all.
+
+    Every needle is filed under its rarest trigram. A needle can only be a
+    substring of the haystack if that trigram is, so looking up the
+    haystack's trigrams yields a small superset of the real hits. Needles
+    shorter than a trigram are always returned.
+    """
+
+    def __init__(self, needles: Iterable[Tuple[str, int]]):
+        needles = [(needle, owner) for needle, owner in needles]
+        frequency = Counter(gram for needle, _ in needles for gram in _grams(needle))
+
+        self.postings: Dict[str, Set[int]] = {}
+        self.always: Set[int] = set()
+        for needle, owner in needles:
+            grams = _grams(needle)
+            if not grams:
+                self.always.add(owner)
+                continue
+            anchor = min(grams, key=lambda gram: (frequency[gram], gram))
+            self.postings.setdefault(anchor, set()).add(owner)
+        self.anchors = frozenset(self.postings)
+
+    def candidates(self, haystack: str) -> Set[int]:
+        found = set(self.always)
+        postings = self.postings
+        for gram in _grams(haystack) & self.anchors:
+            found |= postings[gram]
+        return found
+
+
+class PatternIndex:
+    """Matches an error against an ordered pattern list in one lookup.
+
+    A pattern matches when its type is a substring of the error type or any
+    of its keywords is a substring of the message; the earliest matching
+    pattern in the list wins, exactly as a linear scan would.
+    """
+
+    def __init__(self, patterns: List[Dict]):
+        self.patterns = patterns
+        self.rules: List[Tuple[str, Tuple[str, ...]]] = []
+        self.by_type: Dict[str, int] = {}
+        types = []
+        keywords = []
+
+        for priority, pattern in enumerate(patterns):
+            pattern_type = pattern.get('type', '').lower()
+            pattern_keywords = tuple(keyword.lower() for keyword in pattern.get('keywords', []))
+            self.rules.append((pattern_type, pattern_keywords))
+
+            if pattern_type:
+                self.by_type.setdefault(pattern_type, priority)
+                types.append((pattern_type, priority))
+            keywords.extend((keyword, priority) for keyword in pattern_keywords)
+
+        self.type_index = SubstringIndex(types)
+        self.keyword_index = SubstringIndex(keywords)
+        self._type_candidates: Dict[str, Tuple[int, ...]] = {}
+
+    def match(self, error_type: str, message: str) -> Optional[Dict]:
+        best = self.by_type.get(error_type, len(self.patterns))
+        message_lower = message.lower()
+
+        candidates = self.keyword_index.candidates(message_lower)
+        candidates.update(self._candidates_for_type(error_type))
+
+        for priority in sorted(p for p in candidates if p < best):
+            pattern_type, keywords = self.rules[priority]
+            if (pattern_type and pattern_type in error_type) or any(kw in message_lower for kw in keywords):
+                best = priority
+                break
+
+        if best < len(self.patterns):
+            return self.patterns[best]
+        return None
+
+    def _candidates_for_type(self, error_type: str) -> Tuple[int, ...]:
+        # Error types come from a small vocabulary, so their candidates are
+        # worth remembering.
+        found = self._type_candidates.get(error_type)
+        if found is None:
+            found = tuple(self.type_index.candidates(error_type))
+            if len(self._type_candidates) < MAX_TYPE_CACHE:
+                self._type_candidates[error_type] = found
+        return found
+
+
+class SearchIndex:
+    """Trigram index over the searchable text of every pattern.
+
+    A query is answered from the patterns holding all of its trigrams and
+    ranked by how often it occurs in each field, weighted by the field.
+    """
+
+    FIELD_WEIGHTS = (('type', 5), ('keywords', 3), ('simple', 2), ('fix', 1))
+
+    def __init__(self, patterns: Mapping[str, List[Dict]]):
+        self.entries: List[Tuple[str, Dict, Tuple[Tuple[str, int], ...]]] = []
+        self.postings: Dict[str, Set[int]] = {}
+
+        for language, data in patterns.items():
+            for pattern in data:
+                doc_id = len(self.entries)
+                fields = tuple(self._fields(pattern))
+                self.entries.append((language, pattern, fields))
+                for text, _ in fields:
+                    for gram in _grams(text):
+                        self.postings.setdefault(gram, set()).add(doc_id)
+
+    def _fields(self, pattern: Dict) -> Iterator[Tuple[str, int]]:
+        for field, weight in self.FIELD_WEIGHTS:
+            if field == 'keywords':
+                for keyword in pattern.get('keywords', []):
+                    yield str(keyword).lower(), weight
+            else:
+                yield str(pattern.get(field, '')).lower(), weight
+
+    def search(self, keyword: str) -> List[Tuple[int, str, Dict]]:
+        query = keyword.lower()
+        grams = _grams(query)
+        if grams:
+            postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = range(len(self.entries))
+
+        ranked = []
+        for doc_id in sorted(candidates):
+            language, pattern, fields = self.entries[doc_id]
+            score = sum(weight * text.count(query) for text, weight in fields)
+            if score:
+                ranked.append((-score, doc_id, language, pattern))
+        ranked.sort()
+        return [(-neg_score, language, pattern) for neg_score, _, language, pattern in ranked]
+
+
+class KeywordScanner:
+    """Counts, for every line of a text, how many keywords of each pattern it holds.
+
+    All keywords are compiled into one Aho-Corasick automaton, so the text
+    is scanned once regardless of how many patterns there are. Lines are
+    taken one at a time, so they can be streamed from a file. A keyword
+    counts once per line however often it occurs, as with ``kw in line``.
+    """
+
+    def __init__(self, patterns: List[Dict]):
+        self.patterns = patterns
+        # keyword id -> ((pattern index, times listed), ...)
+        owners: List[Dict[int, int]] = []
+        keyword_ids: Dict[str, int] = {}
+        self.always: Dict[int, int] = {}
+
+        for priority, pattern in enumerate(patterns):
+            for keyword in pattern.get('keywords', []):
+                keyword = keyword.lower()
+                if not keyword:
+                    self.always[priority] = self.always.get(priority, 0) + 1
+                    continue
+                if len((keyword + '.').splitlines()) > 1:
+                    # A line never holds a line break, so this cannot match.
+                    continue
+                keyword_id = keyword_ids.setdefault(keyword, len(keyword_ids))
+                if keyword_id == len(owners):
+                    owners.append({})
+                owners[keyword_id][priority] = owners[keyword_id].get(priority, 0) + 1
+        self.owners = [tuple(owned.items()) for owned in owners]
+        self._build(list(keyword_ids))
+
+    def _build(self, keywords: List[str]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(keyword_id)
+
+        # Breadth-first, resolve failure links into a full transition table so
+        # scanning never has to follow them.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0)
+                delta[state][char] = nxt
+                queue.append(nxt)
+
+        self.delta = delta
+        self.outputs: List[Tuple[int, ...]] = [tuple(sorted(found)) for found in outputs]
+
+    def scan(self, lines: Iterable[str]) -> List[Tuple[int, int, int]]:
+        """Return ``(line number, pattern index, matches)`` for every line and
+        pattern with at least one keyword hit, ordered by line then pattern."""
+        return self.scan_numbered(enumerate(lines, 1))
+
+    def scan_numbered(self, lines: Iterable[Tuple[int, str]]) -> List[Tuple[int, int, int]]:
+        """``scan`` for a subset of lines, given as ``(line number, line)``."""
+        delta = self.delta
+        outputs = self.outputs
+        always = self.always
+        results = []
+        for line_number, line in lines:
+            # Keywords never span lines, so every line starts from the root.
+            state = 0
+            found = None
+            for char in line.lower():
+                state = delta[state].get(char, 0)
+                if outputs[state]:
+                    if found is None:
+                        found = set()
+                    found.update(outputs[state])
+            if found is None and not always:
+                continue
+
+            counts = dict(always)
+            for keyword_id in found or ():
+                for priority, times in self.owners[keyword_id]:
+                    counts[priority] = counts.get(priority, 0) + times
+            results.extend((line_number, priority, counts[priority]) for priority in sorted(counts))
+        return results
@@ -1,44 +1,213 @@
-from typing import List
-import ast
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import fnmatch
+import heapq
+import multiprocessing
+import os
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from .. import __version__
 from ..models.prediction import Prediction
-from ..storage.patterns import PatternManager
-from ..monitoring.checker import SimpleChecker
+from .changes import LineRanges, changed_lines, in_ranges
+from .pattern_index import KeywordScanner
+from .rules import default_engine, parse_python
+from .source import SkippedFile, SourceFile
+from ..storage.bundle import PatternBundle
+from ..storage.prediction_cache import MAX_ENTRIES, PredictionCache
+from ..storage.registry import shared_registry
+
+# Files per task handed to a worker; large enough that pickling predictions
+# back is cheap relative to the analysis.
+CHUNK_SIZE = 64
+
+# Candidate lines sent to the ML classifier per forward pass.
+ML_BATCH_LINES = 4096
+
+# Bump whenever a change to the analyzers alters their output, so cached
+# predictions from older releases are not reused.
+ANALYZER_VERSION = 3
+
+_worker: Optional['ErrorPredictor'] = None
+
+
+def _pool_context():
+    # Never fork: the TUI and the daemon predict while other threads (the
+    # pattern watcher among them) may hold locks or sqlite handles, and a
+    # forked worker would inherit them held. Workers build their own state
+    # in _init_worker instead.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _init_worker(config_manager, cache_file: Optional[Path], max_entries: Optional[int]):
+    global _worker
+    _worker = ErrorPredictor(config_manager)
+    _worker.cache = PredictionCache(cache_file, max_entries) if cache_file else None
+
+
+def _predict_chunk(paths: List[str], ranges: Optional[Dict[str, LineRanges]] = None
+                   ) -> Tuple[List[Tuple[str, List[Prediction]]], int, int, List[Tuple[str, str]]]:
+    _worker._reset_versions()
+    _worker.skipped = []
+    hits, misses = _worker.cache_stats()
+    ranges = ranges or {}
+    results = [(path, _worker._predict_cached(Path(path), ranges.get(path))) for path in paths]
+    _worker._flush_cache()
+    new_hits, new_misses = _worker.cache_stats()
+    return results, new_hits - hits, new_misses - misses, _worker.skipped
+
+
+class TopPredictions:
+    """The ``n`` most confident predictions seen so far, kept in a min-heap.
+
+    Among equally confident predictions the earlier one ranks first, as
+    with a stable sort of everything.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.seen = 0
+        self._heap: List[Tuple[float, int, Prediction]] = []
+
+    def push(self, prediction: Prediction):
+        entry = (prediction.confidence, -self.seen, prediction)
+        self.seen += 1
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, predictions: Iterable[Prediction]):
+        for prediction in predictions:
+            self.push(prediction)
+
+    def items(self) -> List[Prediction]:
+        return [prediction for _, _, prediction in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
 
 class ErrorPredictor:
 
     def __init__(self, config_manager):
         self.config = config_manager
-        self.pattern_mgr = PatternManager()
+        self.registry = shared_registry()
+        self.pattern_mgr = self.registry.manager
         self.ml_engine = None
         self._init_ml_engine()
+        self.cache = None
+        if self.config.get('prediction_cache', True):
+            self.cache = PredictionCache(max_entries=self.config.get('prediction_cache_entries', MAX_ENTRIES))
+        self._versions: Dict[str, str] = {}
+        self._manifests: Dict[str, Tuple] = {}
+        max_mb = self.config.get('predict_max_file_mb', 20)
+        self.max_file_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        # (file, reason) for files the last run did not analyze.
+        self.skipped: List[Tuple[str, str]] = []
 
     def _init_ml_engine(self):
         try:
             use_ml = self.config.get('use_ml_prediction', False)
             if use_ml:
-                from ..models.ml_engine import MLEngine
-                self.ml_engine = MLEngine()
-                
+                from ..models.ml_engine import shared_engine
+
                 try:
-                    self.ml_engine.load_models()
+                    self.ml_engine = shared_engine()
                 except Exception:
                     self.ml_engine = None
         except ImportError:
             self.ml_engine = None
 
     def predict_file(self, file_path: Path) -> List[Prediction]:
+        self._reset_versions()
+        self.skipped = []
+        predictions = self._predict_cached(file_path)
+        self._flush_cache()
+        return predictions
+
+    def cache_stats(self) -> Tuple[int, int]:
+        """Return ``(hits, misses)`` of the prediction cache so far."""
+        if self.cache is None:
+            return 0, 0
+        return self.cache.hits, self.cache.misses
+
+    def _predict_cached(self, file_path: Path, ranges: LineRanges = None) -> List[Prediction]:
+        try:
+            source = SourceFile.open(file_path, self.max_file_bytes)
+        except SkippedFile as e:
+            self.skipped.append((str(file_path), e.reason))
+            return []
+
+        with source:
+            if self.cache is None:
+                return self._predict_content(file_path, source, ranges)
+
+            version = self._analysis_version(file_path)
+            if ranges is not None:
+                version += repr(ranges)
+            key = PredictionCache.key(source.data, version)
+            predictions = self.cache.get(key, str(file_path))
+            if predictions is None:
+                predictions = self._predict_content(file_path, source, ranges)
+                self.cache.put(key, predictions)
+            return predictions
+
+    def _flush_cache(self):
+        if self.cache is not None:
+            self.cache.flush()
+
+    def _reset_versions(self):
+        # Pattern and model files are stat'ed once per run, not once per file.
+        self._versions.clear()
+        self._manifests.clear()
+        self.registry.expire()
+
+    def _pattern_manifest(self, lang: str) -> Tuple:
+        manifest = self._manifests.get(lang)
+        if manifest is None:
+            manifest = self._manifests[lang] = PatternBundle(self.pattern_mgr, languages=(lang,)).manifest()
+        return manifest
+
+    def _analysis_version(self, file_path: Path) -> str:
+        # Everything besides the content that a file's predictions depend on.
+        suffix = file_path.suffix
+        version = self._versions.get(suffix)
+        if version is None:
+            lang = self.pattern_mgr.get_language_for_file(file_path)
+            parts = [ANALYZER_VERSION, __version__, suffix, self._pattern_manifest(lang)]
+            if self.ml_engine:
+                model_dir = self.ml_engine.model_dir
+                parts.append(self._stat_all([model_dir / 'classifier.pkl', model_dir / 'embeddings.pkl']))
+            version = self._versions[suffix] = repr(parts)
+        return version
+
+    @staticmethod
+    def _stat_all(files: List[Path]) -> List[Tuple[str, int, int]]:
+        entries = []
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            entries.append((str(file), stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _predict_content(self, file_path: Path, content: Union[str, SourceFile],
+                         ranges: LineRanges = None) -> List[Prediction]:
         predictions = []
-        content = self._read_file(file_path)
 
+        # Static checks always cover the whole file: an edit can break code
+        # it did not touch, e.g. by removing an import used further down.
         static_preds = self._analyze_static(file_path, content)
         predictions.extend(static_preds)
 
-        pattern_preds = self._analyze_patterns(file_path, content)
+        pattern_preds = self._analyze_patterns(file_path, content, ranges)
         predictions.extend(pattern_preds)
 
         if self.ml_engine:
-            ml_preds = self._analyze_ml(file_path, content)
+            ml_preds = self._analyze_ml(file_path, content, ranges)
             predictions.extend(ml_preds)
         
         predictions = self._deduplicate_predictions(predictions)
@@ -46,7 +215,112 @@ class ErrorPredictor:
         
         return predictions
 
-    def _analyze_static(self, file_path: Path, content: str = None) -> List[Prediction]:
+    def iter_predictions(self, paths: Iterable[Path],
+                         workers: Optional[int] = None) -> Iterator[Tuple[str, List[Prediction]]]:
+        """Yield ``(file, predictions)`` for each file as soon as it is analyzed.
+
+        Directories are expanded to their source files. With several workers
+        files arrive in completion order, not walk order.
+        """
+        yield from self._iter_results(self._expand(paths), workers)
+
+    def iter_changed_predictions(self, path: Path, base: Optional[str] = None,
+                                 workers: Optional[int] = None) -> Iterator[Tuple[str, List[Prediction]]]:
+        """Like ``iter_predictions``, for the files under ``path`` changed since ``base``.
+
+        Only the changed lines of each file are scanned for patterns and by
+        the ML model. Raises ``GitError`` when ``path`` is not in a git
+        repository or ``base`` does not exist.
+        """
+        path = Path(path).resolve()
+        root = path if path.is_dir() else path.parent
+        exclude = self.config.get('watch_exclude', []) or []
+        ranges = {
+            str(file): lines for file, lines in changed_lines(path, base).items()
+            if self._is_source(file.name)
+            and not any(self._excluded(part, exclude) for part in file.relative_to(root).parts)
+        }
+        yield from self._iter_results(sorted(ranges), workers, ranges)
+
+    def _expand(self, paths: Iterable[Path]) -> List[str]:
+        files = []
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                files.extend(str(file) for file in self.iter_source_files(path))
+            else:
+                files.append(str(path))
+        return files
+
+    def _iter_results(self, files: List[str], workers: Optional[int],
+                      ranges: Optional[Dict[str, LineRanges]] = None) -> Iterator[Tuple[str, List[Prediction]]]:
+        self._reset_versions()
+        self.skipped = []
+        workers = workers or os.cpu_count() or 1
+        chunks = [files[i:i + CHUNK_SIZE] for i in range(0, len(files), CHUNK_SIZE)]
+
+        if workers == 1 or len(chunks) <= 1:
+            try:
+                for file in files:
+                    yield file, self._predict_cached(Path(file), ranges.get(file) if ranges else None)
+            finally:
+                self._flush_cache()
+            return
+
+        cache_file = self.cache.db_file if self.cache is not None else None
+        max_entries = self.cache.max_entries if self.cache is not None else None
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=_pool_context(),
+                                 initializer=_init_worker,
+                                 initargs=(self.config, cache_file, max_entries)) as pool:
+            futures = [
+                pool.submit(_predict_chunk, chunk, {file: ranges[file] for file in chunk} if ranges else None)
+                for chunk in chunks
+            ]
+            try:
+                for future in as_completed(futures):
+                    results, hits, misses, skipped = future.result()
+                    self.skipped.extend(skipped)
+                    if self.cache is not None:
+                        self.cache.hits += hits
+                        self.cache.misses += misses
+                    yield from results
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def iter_source_files(self, root: Path) -> Iterator[Path]:
+        """Walk ``root`` for files of known languages, skipping ``watch_exclude``."""
+        exclude = self.config.get('watch_exclude', []) or []
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                if self._excluded(entry.name, exclude):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and self._is_source(entry.name):
+                        yield Path(entry.path)
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+
+    def _is_source(self, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in self.pattern_mgr.extension_map
+
+    @staticmethod
+    def _excluded(name: str, exclude: Iterable[str]) -> bool:
+        return any(name == pattern or fnmatch.fnmatch(name, pattern) for pattern in exclude)
+
+    def _analyze_static(self, file_path: Path, content: Union[str, SourceFile, None] = None) -> List[Prediction]:
         predictions = []
         
         if file_path.suffix != '.py':
@@ -55,42 +329,15 @@ class ErrorPredictor:
         try:
             if content is None:
                 content = self._read_file(file_path)
+            elif isinstance(content, SourceFile):
+                content = content.text()
             
             if not content.strip():
                 return predictions
             
             try:
-                tree = ast.parse(content, filename=str(file_path))
-                checker = SimpleChecker(str(file_path))
-                checker.visit(tree)
-                
-                for name, lines in checker.undefined_locations.items():
-                    for line in lines:
-                        predictions.append(Prediction(
-                            file=str(file_path),
-                            line=line,
-                            column=None,
-                            error_type='NameError',
-                            message=f"name '{name}' is not defined",
-                            confidence=0.85,
-                            suggestion=f"Define '{name}' before using it or import it",
-                            severity='high'
-                        ))
-                
-                for name in checker.imports:
-                    if name not in checker.used:
-                        line = checker.import_lines.get(name, 1)
-                        predictions.append(Prediction(
-                            file=str(file_path),
-                            line=line,
-                            column=None,
-                            error_type='UnusedImport',
-                            message=f"'{name}' imported but unused",
-                            confidence=0.9,
-                            suggestion=f"Remove unused import '{name}'",
-                            severity='low'
-                        ))
-                        
+                tree = parse_python(content, str(file_path))
+                predictions.extend(default_engine().run(tree, str(file_path)))
             except (SyntaxError, IndentationError) as e:
                 predictions.append(Prediction(
                     file=str(file_path),
@@ -108,43 +355,51 @@ class ErrorPredictor:
             
         return predictions
 
-    def _analyze_patterns(self, file_path: Path, content: str = None) -> List[Prediction]:
+    def _analyze_patterns(self, file_path: Path, content: Union[str, SourceFile, None] = None,
+                          ranges: LineRanges = None) -> List[Prediction]:
         lang = self.pattern_mgr.get_language_for_file(file_path)
-        patterns = self.pattern_mgr.load_patterns(lang)
+        scanner = self._keyword_scanner(lang)
+        patterns = scanner.patterns
         predictions = []
         
         try:
-            lang = self.pattern_mgr.get_language_for_file(file_path)
             if content is None:
                 content = self._read_file(file_path)
             if not content:
                 return predictions
-            lines = content.splitlines()
-                
-            for i, line in enumerate(lines, 1):
-                line_lower = line.lower()
-                
-                for pattern in patterns:
-                    keywords = pattern.get('keywords', [])
-                    matches = sum(1 for kw in keywords if kw.lower() in line_lower)
-                    
-                    if matches >= 2:
-                        predictions.append(Prediction(
-                            file=str(file_path),
-                            line=i,
-                            column=None,
-                            error_type=pattern.get('type', 'Unknown'),
-                            message=pattern.get('simple', 'Potential issue detected'),
-                            confidence=0.4 + (matches * 0.1),
-                            suggestion=pattern.get('fix', 'Review this line'),
-                            severity='medium'
-                        ))
+
+            for i, priority, matches in scanner.scan_numbered(self._numbered_lines(content, ranges)):
+                if matches >= 2:
+                    pattern = patterns[priority]
+                    predictions.append(Prediction(
+                        file=str(file_path),
+                        line=i,
+                        column=None,
+                        error_type=pattern.get('type', 'Unknown'),
+                        message=pattern.get('simple', 'Potential issue detected'),
+                        confidence=0.4 + (matches * 0.1),
+                        suggestion=pattern.get('fix', 'Review this line'),
+                        severity='medium'
+                    ))
         except Exception:
             pass
             
         return predictions
 
-    def _analyze_ml(self, file_path: Path, content: str = None) -> List[Prediction]:
+    def _keyword_scanner(self, lang: str) -> KeywordScanner:
+        # The registry rebuilds the scanner when the language's pattern files
+        # change on disk.
+        return self.registry.compiled(('predict', lang), (lang,), lambda: self._compile_scanner(lang))['scanner']
+
+    def _compile_scanner(self, lang: str) -> Dict:
+        scanner = KeywordScanner(self.pattern_mgr.load_patterns(lang))
+        return {
+            'files': self.pattern_mgr.cached_files((lang,)),
+            'scanner': scanner,
+        }
+
+    def _analyze_ml(self, file_path: Path, content: Union[str, SourceFile, None] = None,
+                    ranges: LineRanges = None) -> List[Prediction]:
         if not self.ml_engine:
             return []
             
@@ -155,33 +410,53 @@ class ErrorPredictor:
                 content = self._read_file(file_path)
             if not content:
                 return predictions
-            lines = content.splitlines()
-            
-            for i, line in enumerate(lines, 1):
-                if not line.strip() or line.strip().startswith('#'):
-                    continue
-                
-                result = self.ml_engine.classify_error(line, lang)
-                
-                if result and result.get('top_prediction'):
-                    top = result['top_prediction']
-                    
-                    if top['confidence'] > 0.6:
-                        predictions.append(Prediction(
-                            file=str(file_path),
-                            line=i,
-                            column=None,
-                            error_type=top['type'],
-                            message=f"ML detected potential {top['type']}",
-                            confidence=top['confidence'],
-                            suggestion="Review this line for potential issues",
-                            severity=self._confidence_to_severity(top['confidence'])
-                        ))
+            lang = self.pattern_mgr.get_language_for_file(file_path)
+            candidates = (
+                (i, line) for i, line in self._numbered_lines(content, ranges)
+                if line.strip() and not line.strip().startswith('#')
+            )
+            while True:
+                batch = list(islice(candidates, ML_BATCH_LINES))
+                if not batch:
+                    break
+                results = self.ml_engine.classify_batch([line for _, line in batch], lang)
+                predictions.extend(self._ml_predictions(file_path, batch, results))
         except Exception:
             pass
             
         return predictions
 
+    def _ml_predictions(self, file_path: Path, batch: List[Tuple[int, str]],
+                        results: List[Dict]) -> Iterator[Prediction]:
+        for (i, line), result in zip(batch, results):
+            if result and result.get('top_prediction'):
+                top = result['top_prediction']
+                
+                if top['confidence'] > 0.6:
+                    yield Prediction(
+                        file=str(file_path),
+                        line=i,
+                        column=None,
+                        error_type=top['type'],
+                        message=f"ML detected potential {top['type']}",
+                        confidence=top['confidence'],
+                        suggestion="Review this line for potential issues",
+                        severity=self._confidence_to_severity(top['confidence'])
+                    )
+
+    @staticmethod
+    def _lines(content: Union[str, SourceFile]) -> Iterable[str]:
+        if isinstance(content, SourceFile):
+            return content.lines()
+        return content.splitlines()
+
+    @classmethod
+    def _numbered_lines(cls, content: Union[str, SourceFile], ranges: LineRanges) -> Iterator[Tuple[int, str]]:
+        numbered = enumerate(cls._lines(content), 1)
+        if ranges is None:
+            return numbered
+        return ((i, line) for i, line in numbered if in_ranges(i, ranges))
+
     def _read_file(self, file_path: Path) -> str:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
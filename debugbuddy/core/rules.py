@@ -0,0 +1,216 @@
+import ast
+import hashlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from .fingerprint import SignatureCache
+from ..models.prediction import Prediction
+
+BUILTIN_NAMES = frozenset({
+    'abs', 'all', 'any', 'ascii', 'bin', 'bool', 'bytearray', 'bytes', 'callable',
+    'chr', 'classmethod', 'compile', 'complex', 'delattr', 'dict', 'dir', 'divmod',
+    'enumerate', 'eval', 'exec', 'filter', 'float', 'format', 'frozenset', 'getattr',
+    'globals', 'hasattr', 'hash', 'help', 'hex', 'id', 'input', 'int', 'isinstance',
+    'issubclass', 'iter', 'len', 'list', 'locals', 'map', 'max', 'memoryview', 'min',
+    'next', 'object', 'oct', 'open', 'ord', 'pow', 'print', 'property', 'range',
+    'repr', 'reversed', 'round', 'set', 'setattr', 'slice', 'sorted', 'staticmethod',
+    'str', 'sum', 'super', 'tuple', 'type', 'vars', 'zip', '__import__',
+    'False', 'None', 'True'
+})
+
+_trees = SignatureCache(max_size=64)
+
+
+def parse_python(content: str, filename: str = '<unknown>') -> ast.AST:
+    """Parse Python source, sharing the tree between everyone who asks.
+
+    Trees are cached by content hash, so predict, check and watch parse an
+    unchanged file once. Syntax errors are cached too and raised anew for
+    each caller. Callers must treat the returned tree as read-only.
+    """
+    key = hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+    cached = _trees.get(key)
+    if cached is None:
+        try:
+            cached = ast.parse(content, filename=filename)
+        except SyntaxError as e:
+            # Keep only the details: a cached exception object would collect
+            # frames on every re-raise and carry the first caller's filename.
+            cached = (type(e), e.msg, e.lineno, e.offset, e.text, e.end_lineno, e.end_offset)
+        _trees.put(key, cached)
+    if isinstance(cached, tuple):
+        cls, msg, lineno, offset, text, end_lineno, end_offset = cached
+        raise cls(msg, (filename, lineno, offset, text, end_lineno, end_offset))
+    return cached
+
+
+class Rule:
+    """A check run during the shared tree walk.
+
+    Subclasses define ``visit_<NodeType>`` methods for the nodes they care
+    about; nodes are visited in the same pre-order as ``ast.NodeVisitor``.
+    ``findings`` is called once the walk is over.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def findings(self) -> List[Prediction]:
+        return []
+
+    def _prediction(self, line: int, error_type: str, message: str, confidence: float,
+                    suggestion: str, severity: str) -> Prediction:
+        return Prediction(
+            file=self.filename,
+            line=line,
+            column=None,
+            error_type=error_type,
+            message=message,
+            confidence=confidence,
+            suggestion=suggestion,
+            severity=severity
+        )
+
+
+class UndefinedNameRule(Rule):
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self.defined = set()
+        self.imports = set()
+        self.locations: Dict[str, set] = {}
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.add(alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                self.imports.add(alias.asname or alias.name)
+
+    def visit_FunctionDef(self, node):
+        self.defined.add(node.name)
+
+    def visit_ClassDef(self, node):
+        self.defined.add(node.name)
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.defined.add(target.id)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            name = node.id
+            if name not in self.defined and name not in self.imports and name not in BUILTIN_NAMES:
+                self.locations.setdefault(name, set()).add(node.lineno)
+
+    def findings(self) -> List[Prediction]:
+        return [
+            self._prediction(line, 'NameError', f"name '{name}' is not defined", 0.85,
+                             f"Define '{name}' before using it or import it", 'high')
+            for name, lines in self.locations.items()
+            for line in sorted(lines)
+        ]
+
+
+class UnusedImportRule(Rule):
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self.import_lines: Dict[str, int] = {}
+        self.used = set()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.import_lines.setdefault(alias.name.split('.')[0], node.lineno)
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                self.import_lines.setdefault(alias.asname or alias.name, node.lineno)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.used.add(node.id)
+
+    def findings(self) -> List[Prediction]:
+        return [
+            self._prediction(line, 'UnusedImport', f"'{name}' imported but unused", 0.9,
+                             f"Remove unused import '{name}'", 'low')
+            for name, line in self.import_lines.items()
+            if name not in self.used
+        ]
+
+
+DEFAULT_RULES: Tuple[Type[Rule], ...] = (UndefinedNameRule, UnusedImportRule)
+
+
+class RuleEngine:
+    """Runs any number of rules over a tree in a single walk.
+
+    Which rule methods handle which node type is worked out once, when the
+    engine is built, so each node costs one dict lookup plus the handlers
+    that actually want it.
+    """
+
+    def __init__(self, rules: Sequence[Type[Rule]] = DEFAULT_RULES):
+        self.rules = tuple(rules)
+        table: Dict[type, List[Tuple[int, str]]] = {}
+        for index, rule in enumerate(self.rules):
+            for attr in dir(rule):
+                if not attr.startswith('visit_'):
+                    continue
+                node_type = getattr(ast, attr[len('visit_'):], None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    table.setdefault(node_type, []).append((index, attr))
+        self.dispatch: Dict[type, Tuple[Tuple[int, str], ...]] = {
+            node_type: tuple(handlers) for node_type, handlers in table.items()
+        }
+
+    def run(self, tree: ast.AST, filename: str) -> List[Prediction]:
+        rules = [rule(filename) for rule in self.rules]
+        handlers: Dict[type, List[Callable]] = {
+            node_type: [getattr(rules[index], attr) for index, attr in methods]
+            for node_type, methods in self.dispatch.items()
+        }
+
+        # Field-less nodes nobody handles (Load, Store, operators) are not
+        # worth a trip through the stack.
+        get = handlers.get
+        stack = [tree]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            wanted = get(node.__class__)
+            if wanted:
+                for handler in wanted:
+                    handler(node)
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if value.__class__ is list:
+                    for item in value:
+                        if isinstance(item, ast.AST) and (item._fields or item.__class__ in handlers):
+                            children.append(item)
+                elif isinstance(value, ast.AST) and (value._fields or value.__class__ in handlers):
+                    children.append(value)
+            if children:
+                children.reverse()
+                extend(children)
+
+        predictions = []
+        for rule in rules:
+            predictions.extend(rule.findings())
+        return predictions
+
+
+_default_engine: Optional[RuleEngine] = None
+
+
+def default_engine() -> RuleEngine:
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = RuleEngine()
+    return _default_engine
@@ -0,0 +1,108 @@
+import codecs
+import mmap
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+# Bytes inspected to tell text from binary before anything else is read.
+SNIFF_BYTES = 8192
+
+# Line boundaries str.splitlines() honours besides "\n".
+_OTHER_BREAKS = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class SkippedFile(Exception):
+    """Raised when a file is not worth analyzing; ``reason`` says why."""
+
+    def __init__(self, path: Path, reason: str):
+        super().__init__(f"{path}: {reason}")
+        self.path = path
+        self.reason = reason
+
+
+class SourceFile:
+    """A source file mapped into memory and read a line at a time.
+
+    Only the first chunk is decoded up front, to reject binary and
+    non-UTF-8 files early. ``lines`` then decodes one line at a time
+    straight from the mapping, splitting exactly like ``str.splitlines``,
+    so a large file is never held as one string plus a list of its lines.
+    """
+
+    def __init__(self, path: Path, data: Union[mmap.mmap, bytes]):
+        self.path = path
+        self.data = data
+
+    @classmethod
+    def open(cls, path: Path, max_bytes: Optional[int] = None) -> 'SourceFile':
+        try:
+            with open(path, 'rb') as f:
+                size = f.seek(0, 2)
+                if max_bytes is not None and size > max_bytes:
+                    raise SkippedFile(path, f"larger than {max_bytes / (1024 * 1024):g} MB")
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        except OSError as e:
+            raise SkippedFile(path, e.strerror or 'unreadable') from e
+
+        source = cls(path, data)
+        reason = source._sniff()
+        if reason:
+            source.close()
+            raise SkippedFile(path, reason)
+        return source
+
+    def _sniff(self) -> Optional[str]:
+        head = self.data[:SNIFF_BYTES]
+        if b'\0' in head:
+            return 'binary'
+        try:
+            # The incremental decoder tolerates a character cut off at the end.
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=len(head) == len(self.data))
+        except UnicodeDecodeError:
+            return 'not UTF-8'
+        return None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def text(self) -> str:
+        """The whole file decoded, with newlines translated as text mode would."""
+        text = self._decode(self.data[:])
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def lines(self) -> Iterator[str]:
+        data = self.data
+        end = len(data)
+        start = 0
+        while start < end:
+            stop = data.find(b'\n', start)
+            if stop < 0:
+                piece = self._decode(data[start:end])
+                if _OTHER_BREAKS.search(piece):
+                    yield from piece.splitlines()
+                else:
+                    yield piece
+                return
+            piece = self._decode(data[start:stop])
+            if _OTHER_BREAKS.search(piece):
+                yield from (piece + '\n').splitlines()
+            else:
+                yield piece
+            start = stop + 1
+
+    @staticmethod
+    def _decode(raw: bytes) -> str:
+        # Anything past the sniffed chunk that is not valid UTF-8 is replaced
+        # rather than failing the whole file.
+        return raw.decode('utf-8', 'replace')
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b''
+
+    def __enter__(self) -> 'SourceFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,210 @@
+import ast
+import builtins
+import hashlib
+import sys
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .fingerprint import SignatureCache
+from .rules import parse_python
+
+SOURCE_RANK = {'file': 0, 'builtin': 1, 'module': 2}
+
+
+def _bigrams(word: str) -> List[Tuple[str, int]]:
+    # Repeated bigrams are numbered so that shared tokens count multiplicity.
+    padded = f'^{word}$'
+    seen: Dict[str, int] = {}
+    tokens = []
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        seen[gram] = seen.get(gram, 0) + 1
+        tokens.append((gram, seen[gram]))
+    return tokens
+
+
+def max_distance(name: str) -> int:
+    return 1 if len(name) <= 4 else 2
+
+
+def _within_one(a: str, b: str) -> bool:
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    for ca, cb in zip(a, b):
+        if ca != cb:
+            break
+        i += 1
+    if len(a) != len(b):
+        return a[i:] == b[i + 1:]
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    return i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    if limit == 1:
+        return 1 if _within_one(a, b) else 2
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletions(word: str) -> set:
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class SymbolIndex:
+    """Index for finding names within a small edit distance.
+
+    Names one edit away share a single-character deletion with the query, so
+    they are looked up directly in a table of every name's deletions. Wider
+    searches use a bigram count filter: an edit breaks at most three of a
+    name's bigrams (a transposition touches three), so a name within
+    distance ``k`` shares all but ``3k`` of the query's bigrams. Only the
+    survivors get a full, bounded edit distance check.
+    """
+
+    def __init__(self, symbols: Iterable[Tuple[str, str]]):
+        self.symbols: List[Tuple[str, str, str]] = []
+        self.deletions: Dict[str, List[int]] = {}
+        self.postings: Dict[Tuple[str, int], List[int]] = {}
+        self.by_length: Dict[int, List[int]] = {}
+        seen = set()
+        for name, source in symbols:
+            if name in seen:
+                continue
+            seen.add(name)
+            symbol_id = len(self.symbols)
+            lowered = name.lower()
+            self.symbols.append((name, lowered, source))
+            self.by_length.setdefault(len(lowered), []).append(symbol_id)
+            for variant in _deletions(lowered):
+                self.deletions.setdefault(variant, []).append(symbol_id)
+            for gram in _bigrams(lowered):
+                self.postings.setdefault(gram, []).append(symbol_id)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def lookup(self, name: str, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        # Widen the search one edit at a time; the closest names are the only
+        # ones worth suggesting and the tight bound keeps the candidate set small.
+        query = name.lower()
+        limit = max_distance(name) if limit is None else limit
+        for distance in range(1, limit + 1):
+            matches = self._lookup_within(name, query, distance)
+            if matches:
+                return matches
+        return []
+
+    def _lookup_within(self, name: str, query: str, limit: int) -> List[Tuple[int, str, str]]:
+        if limit == 1:
+            candidates = set(chain.from_iterable(self.deletions.get(v, ()) for v in _deletions(query)))
+        else:
+            grams = _bigrams(query)
+            needed = len(grams) - 3 * limit
+            if needed > 0:
+                counts = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+                candidates = [symbol_id for symbol_id, shared in counts.items() if shared >= needed]
+            else:
+                candidates = chain.from_iterable(
+                    self.by_length.get(length, ()) for length in range(len(query) - limit, len(query) + limit + 1)
+                )
+
+        matches = []
+        for symbol_id in candidates:
+            symbol, lowered, source = self.symbols[symbol_id]
+            if symbol == name or abs(len(lowered) - len(query)) > limit:
+                continue
+            distance = edit_distance(query, lowered, limit)
+            if distance <= limit:
+                matches.append((distance, symbol, source))
+        return matches
+
+
+_base_index: Optional[SymbolIndex] = None
+_file_indexes = SignatureCache(max_size=64)
+
+
+def base_index() -> SymbolIndex:
+    global _base_index
+    if _base_index is None:
+        modules = getattr(sys, 'stdlib_module_names', ())
+        _base_index = SymbolIndex(chain(
+            ((name, 'builtin') for name in dir(builtins) if not name.startswith('__')),
+            ((name, 'module') for name in sorted(modules) if not name.startswith('_')),
+        ))
+    return _base_index
+
+
+def defined_names(source: str) -> List[str]:
+    try:
+        tree = parse_python(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.append(node.id)
+        elif isinstance(node, ast.arg):
+            names.append(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != '*':
+                    names.append(alias.asname or alias.name.split('.')[0])
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.extend(node.names)
+    return names
+
+
+def file_index(path: Optional[str]) -> Optional[SymbolIndex]:
+    if not path:
+        return None
+    try:
+        data = Path(path).read_bytes()
+    except (OSError, ValueError):
+        return None
+
+    digest = hashlib.sha1(data).hexdigest()
+    index = _file_indexes.get(digest)
+    if index is None:
+        source = data.decode('utf-8', 'replace')
+        index = SymbolIndex((name, 'file') for name in defined_names(source))
+        _file_indexes.put(digest, index)
+    return index
+
+
+def suggest_names(name: str, path: Optional[str] = None, n: int = 3) -> List[str]:
+    matches = base_index().lookup(name)
+    local = file_index(path)
+    if local is not None:
+        matches.extend(local.lookup(name))
+
+    best: Dict[str, Tuple] = {}
+    for distance, symbol, source in matches:
+        key = (distance, SOURCE_RANK[source], symbol[:1] != name[:1], abs(len(symbol) - len(name)), symbol)
+        if symbol not in best or key < best[symbol]:
+            best[symbol] = key
+    return [symbol for symbol in sorted(best, key=best.get)[:n]]
@@ -4,7 +4,7 @@ import re
 import json
 from ..models.training import TrainingData
 from ..models.pattern import Pattern
-from ..storage.patterns import PatternManager
+from ..storage.registry import shared_registry
 
 class PatternTrainer:
 
@@ -12,7 +12,8 @@ class PatternTrainer:
         self.storage = storage_manager
         self.custom_patterns_dir = Path.home() / '.debugbuddy' / 'patterns' / 'custom'
         self.custom_patterns_dir.mkdir(parents=True, exist_ok=True)
-        self.pattern_mgr = PatternManager()
+        self.registry = shared_registry()
+        self.pattern_mgr = self.registry.manager
 
     def add_training_example(self, error_text: str, explanation: str, 
                             fix: str, language: str) -> bool:
@@ -57,6 +58,7 @@ class PatternTrainer:
                     f.seek(0)
                     json.dump({'errors': errors}, f)
                     f.truncate()
+                    self.registry.invalidate(file.stem)
                     return True
         return False
 
@@ -104,4 +106,5 @@ class PatternTrainer:
                 patterns = data.get('errors', [])
         patterns.append(pattern.__dict__)
         with open(file_path, 'w') as f:
-            json.dump({'errors': patterns}, f, indent=2)
\ No newline at end of file
+            json.dump({'errors': patterns}, f, indent=2)
+        self.registry.invalidate(pattern.language)
\ No newline at end of file
@@ -0,0 +1,11 @@
+from .client import run, should_forward, start_daemon, status, stop
+from .protocol import socket_path
+
+__all__ = [
+    'run',
+    'should_forward',
+    'start_daemon',
+    'status',
+    'stop',
+    'socket_path',
+]
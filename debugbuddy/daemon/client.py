@@ -0,0 +1,179 @@
+import os
+import shutil
+import socket
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .. import __version__
+from ..tui.runner import tui_requested
+from .protocol import receive, send, socket_path
+
+# Commands the daemon can run; everything else always runs in-process.
+COMMANDS = ('explain', 'predict', 'check')
+
+# Commands that open the TUI on a terminal, which has to run in-process.
+TUI_COMMANDS = ('explain', 'predict')
+
+CONNECT_TIMEOUT = 0.5
+
+# The daemon serves one request at a time. A client that waits this long
+# for its request to start runs it in-process rather than queue behind,
+# say, a long ``predict``.
+QUEUE_TIMEOUT = 1.0
+
+# Variables the daemon needs to render for this terminal.
+CONSOLE_ENV = ('TERM', 'COLORTERM', 'NO_COLOR', 'FORCE_COLOR', 'COLUMNS', 'LINES')
+
+# Options of ``explain`` that take a value, so their value is not the error.
+_EXPLAIN_VALUE_OPTIONS = ('-l', '--language')
+
+
+def main():
+    """Entry point of ``dbug``: use the daemon when it can help, else run here."""
+    argv = sys.argv[1:]
+    if should_forward(argv):
+        code = run(argv)
+        if code is not None:
+            sys.exit(code)
+
+    from ..cli import main as cli_main
+    cli_main(prog_name='dbug')
+
+
+def should_forward(argv: List[str]) -> bool:
+    if not argv or argv[0] not in COMMANDS:
+        return False
+    if os.environ.get('DEBUGBUDDY_DAEMON', '1').lower() in {'0', 'false', 'no'}:
+        return False
+    if not hasattr(socket, 'AF_UNIX'):
+        return False
+    if _reads_stdin(argv):
+        # Piped logs are segmented as they are read, which only works here.
+        return False
+    if argv[0] == 'explain' and '--ai' in argv:
+        # A network call would hold the daemon up for everyone else.
+        return False
+    if argv[0] not in TUI_COMMANDS:
+        return True
+    return not (tui_requested() and find_spec('textual') is not None)
+
+
+def run(argv: List[str], autostart: bool = True) -> Optional[int]:
+    """Run ``dbug <argv>`` in the daemon, streaming its output here.
+
+    Returns the command's exit code, or None when no daemon took the
+    request in time and it should run in-process instead. With
+    ``autostart`` a missing daemon is started in the background for the
+    next invocation.
+    """
+    conn = _connect(autostart)
+    if conn is None:
+        return None
+
+    request = {
+        'op': 'run',
+        'version': __version__,
+        'argv': argv,
+        'cwd': os.getcwd(),
+        'columns': shutil.get_terminal_size().columns,
+        'color': sys.stdout.isatty(),
+        'env': {name: os.environ[name] for name in CONSOLE_ENV if name in os.environ},
+    }
+
+    streams = {'out': sys.stdout, 'err': sys.stderr}
+    started = False
+    try:
+        with conn:
+            conn.settimeout(QUEUE_TIMEOUT)
+            send(conn, request)
+            for message in receive(conn):
+                if 'started' in message:
+                    conn.settimeout(None)
+                    continue
+                if 'exit' in message:
+                    return message['exit']
+                if 'error' in message:
+                    break
+                for key, text in message.items():
+                    started = True
+                    streams[key].write(text)
+                    streams[key].flush()
+    except (OSError, ValueError):
+        pass
+
+    if started:
+        sys.stderr.write("dbug: lost connection to the daemon\n")
+        return 1
+    return None
+
+
+def status() -> Optional[Dict]:
+    return _ask({'op': 'status'})
+
+
+def stop() -> bool:
+    return _ask({'op': 'stop'}) is not None
+
+
+def start_daemon():
+    import subprocess
+
+    # Run from the directory holding the package so ``-m`` finds it even
+    # when it is not installed.
+    subprocess.Popen(
+        [sys.executable, '-m', 'debugbuddy.daemon.server'],
+        cwd=Path(__file__).resolve().parents[2],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _ask(message: Dict) -> Optional[Dict]:
+    conn = _connect(autostart=False)
+    if conn is None:
+        return None
+    try:
+        with conn:
+            send(conn, dict(message, version=__version__))
+            reply = next(receive(conn), None)
+    except (OSError, ValueError):
+        return None
+    if reply is None or 'error' in reply:
+        return None
+    return reply
+
+
+def _connect(autostart: bool) -> Optional[socket.socket]:
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(CONNECT_TIMEOUT)
+    try:
+        conn.connect(str(socket_path()))
+    except OSError:
+        conn.close()
+        if autostart:
+            try:
+                start_daemon()
+            except OSError:
+                pass
+        return None
+    conn.settimeout(None)
+    return conn
+
+
+def _reads_stdin(argv: List[str]) -> bool:
+    # ``explain`` reads errors from stdin when it is given none as an argument.
+    if argv[0] != 'explain' or sys.stdin is None or sys.stdin.isatty():
+        return False
+    args = iter(argv[1:])
+    for arg in args:
+        if arg in ('--help', '-h'):
+            return False
+        if arg in _EXPLAIN_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return False
+    return True
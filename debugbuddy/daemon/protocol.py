@@ -0,0 +1,51 @@
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Dict, Iterator
+
+# Each message is one line of JSON. A client sends a single request and
+# reads replies until the connection closes.
+
+# Neither side needs large messages: requests carry argv and a few settings,
+# and output is sent in pieces of at most OUTPUT_CHUNK characters.
+MAX_MESSAGE = 1 << 20
+OUTPUT_CHUNK = 16384
+
+
+def socket_path() -> Path:
+    override = os.environ.get('DEBUGBUDDY_SOCKET')
+    if override:
+        return Path(override)
+    return Path.home() / '.debugbuddy' / 'daemon.sock'
+
+
+def send(conn: socket.socket, message: Dict):
+    conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def receive(conn: socket.socket, max_size: int = MAX_MESSAGE) -> Iterator[Dict]:
+    """Yield messages as they arrive; raises ValueError for one over ``max_size`` bytes."""
+    pending = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        newline = chunk.find(b'\n')
+        while newline >= 0:
+            if size + newline > max_size:
+                raise ValueError("message too large")
+            pending.append(chunk[:newline])
+            yield json.loads(b''.join(pending))
+            pending = []
+            size = 0
+            chunk = chunk[newline + 1:]
+            newline = chunk.find(b'\n')
+        size += len(chunk)
+        if size > max_size:
+            raise ValueError("message too large")
+        pending.append(chunk)
+    rest = b''.join(pending)
+    if rest.strip():
+        yield json.loads(rest)
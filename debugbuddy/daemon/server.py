@@ -0,0 +1,232 @@
+import fcntl
+import io
+import os
+import socket
+import sys
+import time
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, Optional
+
+import click
+from rich.console import Console
+
+from .. import __version__
+from ..storage.config import ConfigManager
+from ..storage.history import deferred_writes
+from ..storage.registry import shared_registry
+from .protocol import OUTPUT_CHUNK, receive, send, socket_path
+
+WARM_UP_ERROR = "NameError: name 'x' is not defined"
+
+
+class _Output(io.TextIOBase):
+    """A text stream that forwards every write to the client as it happens."""
+
+    def __init__(self, conn: socket.socket, key: str):
+        self.conn = conn
+        self.key = key
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text) -> int:
+        if isinstance(text, (bytes, bytearray)):
+            # click.echo writes bytes to streams it takes for binary ones.
+            text = bytes(text).decode('utf-8', 'replace')
+        for start in range(0, len(text), OUTPUT_CHUNK):
+            send(self.conn, {self.key: text[start:start + OUTPUT_CHUNK]})
+        return len(text)
+
+    def isatty(self) -> bool:
+        # The TUI cannot run remotely, so commands must never choose it here.
+        return False
+
+
+class DaemonServer:
+    """Runs dbug commands for thin clients, keeping everything they load warm.
+
+    Patterns, compiled indexes and ML models live in process-wide registries,
+    so each request only pays for the command itself. Requests are served one
+    at a time; commands change the working directory and standard streams.
+    A run request is acknowledged when it starts, and skipped if its client
+    gave up waiting and went to run it in-process.
+    """
+
+    def __init__(self, path: Optional[Path] = None, idle_timeout: Optional[float] = None):
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        self.started = time.time()
+        self._sock: Optional[socket.socket] = None
+        self._lock_file = None
+        self._running = False
+
+    def bind(self) -> bool:
+        """Claim the socket. Returns False when another daemon already serves it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(f"{self.path}.lock", 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+
+        # Holding the lock means any socket file left behind is stale.
+        self.path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o077)
+        try:
+            sock.bind(str(self.path))
+        finally:
+            os.umask(umask)
+        sock.listen(16)
+        self._sock = sock
+        return True
+
+    def warm(self):
+        from ..cli import main  # noqa: F401  registers every command
+        from ..core.explainer import ErrorExplainer
+        from ..core.parsers import ErrorParser
+        from ..core.predictor import ErrorPredictor
+
+        config = ConfigManager()
+        if config.get('pattern_hot_reload', True):
+            shared_registry().watch()
+        ErrorExplainer().explain(ErrorParser().parse(WARM_UP_ERROR))
+        ErrorPredictor(config)
+
+    def serve_forever(self):
+        if self._sock is None and not self.bind():
+            return
+        self._sock.settimeout(self.idle_timeout)
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    conn.settimeout(None)
+                    self.handle(conn)
+        finally:
+            self.close()
+
+    def handle(self, conn: socket.socket):
+        try:
+            request = next(receive(conn), None)
+            if request is None:
+                return
+            if request.get('version') != __version__:
+                # An upgraded client: let it run in-process while a fresh
+                # daemon replaces this one.
+                send(conn, {'error': f"daemon runs version {__version__}"})
+                self._running = False
+                return
+
+            op = request.get('op', 'run')
+            if op == 'status':
+                send(conn, {'pid': os.getpid(), 'version': __version__, 'requests': self.requests,
+                            'uptime': time.time() - self.started})
+            elif op == 'stop':
+                self._running = False
+                send(conn, {'stopped': True})
+            elif op == 'run':
+                # Fails with a broken pipe if the client stopped waiting.
+                send(conn, {'started': True})
+                self.requests += 1
+                # History is written once the client has its answer.
+                with deferred_writes():
+                    send(conn, {'exit': self.run(request, conn)})
+            else:
+                send(conn, {'error': f"unknown request {op!r}"})
+        except (ConnectionError, ValueError):
+            # The client went away or sent garbage; nothing to answer.
+            pass
+        except Exception:
+            # A failure outside the command must not take the daemon down;
+            # the client sees the connection close and reports it.
+            traceback.print_exc()
+
+    def run(self, request: Dict, conn: socket.socket) -> int:
+        from ..cli import main
+
+        out = _Output(conn, 'out')
+        err = _Output(conn, 'err')
+        console = Console(file=out, width=request.get('columns') or 80,
+                          force_terminal=bool(request.get('color')), _environ=request.get('env') or {})
+        with self._session(request, out, err, console):
+            try:
+                result = main.main(args=list(request.get('argv', [])), prog_name='dbug', standalone_mode=False)
+            except click.ClickException as e:
+                e.show()
+                return e.exit_code
+            except click.Abort:
+                err.write("Aborted!\n")
+                return 1
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    return e.code or 0
+                err.write(f"{e.code}\n")
+                return 1
+            except ConnectionError:
+                raise
+            except Exception:
+                err.write(traceback.format_exc())
+                return 1
+        return result if isinstance(result, int) else 0
+
+    @contextmanager
+    def _session(self, request: Dict, out: _Output, err: _Output, console: Console):
+        # Commands print through module-level consoles created for this
+        # process's terminal; point them at the client's for the request.
+        swapped = {}
+        for name, module in list(sys.modules.items()):
+            if name.startswith('debugbuddy.cli') and isinstance(getattr(module, 'console', None), Console):
+                swapped[module] = module.console
+                module.console = console
+        cwd = os.getcwd()
+        stdin = sys.stdin
+        try:
+            os.chdir(request.get('cwd') or cwd)
+            # Clients never forward stdin; see client.should_forward.
+            sys.stdin = io.StringIO('')
+            with redirect_stdout(out), redirect_stderr(err):
+                yield
+        finally:
+            sys.stdin = stdin
+            os.chdir(cwd)
+            for module, original in swapped.items():
+                module.console = original
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        self._running = False
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self.path.unlink(missing_ok=True)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def idle_timeout(config: ConfigManager, minutes: Optional[int] = None) -> Optional[float]:
+    minutes = config.get('daemon_idle_minutes', 30) if minutes is None else minutes
+    return minutes * 60 if minutes else None
+
+
+def main():
+    server = DaemonServer(idle_timeout=idle_timeout(ConfigManager()))
+    if server.bind():
+        server.warm()
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,12 @@ import json
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
+import operator
 import pickle
 import re
+import threading
 from collections import Counter
+from itertools import chain, repeat
 
 @dataclass
 class TrainingExample:
@@ -104,6 +107,19 @@ class NeuralNetwork:
     def predict(self, X: np.ndarray) -> np.ndarray:
         return self.forward(X)
 
+# Slots in the negative sampling table; a word fills a share of them equal
+# to its probability under the unigram^0.75 noise distribution.
+NOISE_TABLE_SIZE = 1_000_000
+MAX_SCORE = 6.0
+MAX_ROW_UPDATES = 16
+MIN_BATCHES = 100
+MIN_BATCH_SIZE = 32
+# Default subsampling threshold: word2vec's 1e-3, tightened on large corpora
+# so a frequent token stops adding pairs once it is seen ~SAMPLE_COUNT times.
+MAX_SAMPLE = 1e-3
+SAMPLE_COUNT = 100
+
+
 class ErrorEmbedding:
 
     def __init__(self, embedding_dim: int = 128, window_size: int = 3):
@@ -112,6 +128,8 @@ class ErrorEmbedding:
         self.word_to_idx = {}
         self.idx_to_word = {}
         self.embeddings = None
+        self.context_embeddings = None
+        self.counts = None
         self.vocab_size = 0
 
     def tokenize(self, text: str) -> List[str]:
@@ -120,18 +138,19 @@ class ErrorEmbedding:
         return tokens
 
     def build_vocab(self, texts: List[str]):
-        all_tokens = []
-        for text in texts:
-            all_tokens.extend(self.tokenize(text))
+        self._build_vocab([self.tokenize(text) for text in texts])
 
-        token_counts = Counter(all_tokens)
-        vocab = [token for token, _ in token_counts.most_common(5000)]
+    def _build_vocab(self, tokenized: List[List[str]], rng: Optional[np.random.Generator] = None):
+        token_counts = Counter(chain.from_iterable(tokenized))
+        most_common = token_counts.most_common(5000)
+        vocab = [token for token, _ in most_common]
 
         self.word_to_idx = {word: idx for idx, word in enumerate(vocab)}
         self.idx_to_word = {idx: word for word, idx in self.word_to_idx.items()}
         self.vocab_size = len(vocab)
+        self.counts = np.array([count for _, count in most_common], dtype=np.int64)
 
-        self.embeddings = np.random.randn(self.vocab_size, self.embedding_dim) * 0.01
+        self.embeddings = (rng or np.random).standard_normal((self.vocab_size, self.embedding_dim)) * 0.01
 
     def generate_training_pairs(self, text: str) -> List[Tuple[int, int]]:
         tokens = self.tokenize(text)
@@ -153,37 +172,111 @@ class ErrorEmbedding:
 
         return pairs
 
-    def train(self, texts: List[str], epochs: int = 10, lr: float = 0.025):
+    def train(self, texts: List[str], epochs: int = 10, lr: float = 0.025, negative: int = 5,
+              batch_size: int = 1024, sample: Optional[float] = None, seed: Optional[int] = None):
+        """Train skip-gram embeddings with negative sampling on ``texts``."""
         print(f"Building vocabulary from {len(texts)} texts...")
-        self.build_vocab(texts)
-
-        all_pairs = []
-        for text in texts:
-            all_pairs.extend(self.generate_training_pairs(text))
-
-        print(f"Training on {len(all_pairs)} word pairs...")
+        tokenized = [self.tokenize(text) for text in texts]
+        rng = np.random.default_rng(seed)
+        self._build_vocab(tokenized, rng)
+        ids = np.fromiter((self.word_to_idx.get(token, -1) for tokens in tokenized for token in tokens),
+                          dtype=np.int64)
+        docs = np.repeat(np.arange(len(tokenized)), [len(tokens) for tokens in tokenized])
+        known = ids >= 0
+        ids, docs = ids[known], docs[known]
+
+        if sample is None:
+            sample = min(MAX_SAMPLE, SAMPLE_COUNT / max(len(ids), 1))
+        frequency = self.counts / max(self.counts.sum(), 1)
+        keep = np.minimum(1.0, (np.sqrt(frequency / sample) + 1) * sample / np.maximum(frequency, 1e-12))
+        noise = self._noise_table()
+
+        embeddings = self.embeddings.astype(np.float32)
+        context = np.zeros_like(embeddings)
+        labels = np.zeros((1, negative + 1), dtype=np.float32)
+        labels[0, 0] = 1
+
+        print(f"Training on {len(ids)} tokens...")
 
         for epoch in range(epochs):
-            np.random.shuffle(all_pairs)
-            total_loss = 0
-
-            for target_idx, context_idx in all_pairs:
-                target_vec = self.embeddings[target_idx]
-                context_vec = self.embeddings[context_idx]
-
-                score = np.dot(target_vec, context_vec)
-                prob = 1 / (1 + np.exp(-score))
-
-                grad = (prob - 1) * lr
-                self.embeddings[target_idx] -= grad * context_vec
-                self.embeddings[context_idx] -= grad * target_vec
-
-                total_loss += -np.log(prob + 1e-8)
-
-            if epoch % 2 == 0:
-                avg_loss = total_loss / len(all_pairs)
+            targets, contexts = self._pairs(ids, docs, keep, rng)
+            total_loss = 0.0
+            # Small histories still get enough steps per epoch to converge.
+            step = max(MIN_BATCH_SIZE, min(batch_size, len(targets) // MIN_BATCHES))
+
+            for start in range(0, len(targets), step):
+                # Learning rate decays linearly over the whole run.
+                progress = (epoch + start / len(targets)) / epochs
+                alpha = lr * max(1e-4, 1 - progress)
+
+                target = targets[start:start + step]
+                samples = noise[rng.integers(0, len(noise), size=(len(target), negative))]
+                candidates = np.concatenate([contexts[start:start + step, None], samples], axis=1)
+
+                vectors = embeddings[target]
+                outputs = context[candidates]
+                # Clipped like word2vec's MAX_EXP so the sigmoid cannot overflow.
+                scores = np.clip(np.einsum('bd,bkd->bk', vectors, outputs), -MAX_SCORE, MAX_SCORE)
+                # Gradient of the logistic loss: sigmoid(score) - label.
+                grad = (1 / (1 + np.exp(-scores)) - labels) * alpha
+
+                total_loss += np.logaddexp(0, -scores[:, 0]).sum() + np.logaddexp(0, scores[:, 1:]).sum()
+                context_grad = grad / self._repeat_scale(candidates.ravel()).reshape(grad.shape)
+                self._scatter_add(context, candidates.ravel(), context_grad[:, :, None] * -vectors[:, None, :])
+                target_grad = grad / self._repeat_scale(target)[:, None]
+                self._scatter_add(embeddings, target, -np.einsum('bk,bkd->bd', target_grad, outputs))
+
+            if epoch % 2 == 0 and len(targets):
+                avg_loss = total_loss / len(targets)
                 print(f"Epoch {epoch}/{epochs}, Loss: {avg_loss:.4f}")
 
+        self.embeddings = embeddings
+        self.context_embeddings = context
+
+    def _repeat_scale(self, rows: np.ndarray) -> np.ndarray:
+        # A frequent word can appear hundreds of times in one batch, and
+        # summing all of its updates overshoots; past MAX_ROW_UPDATES they are
+        # scaled down so the row moves as if it had been updated that often.
+        repeats = np.bincount(rows)[rows]
+        return np.maximum(1, repeats / MAX_ROW_UPDATES).astype(np.float32)
+
+    def _scatter_add(self, matrix: np.ndarray, rows: np.ndarray, updates: np.ndarray):
+        # np.add.at takes its fast path on flat arrays, so add element-wise
+        # into the flattened matrix rather than row-wise into the 2-D one.
+        cells = (rows[:, None] * self.embedding_dim + np.arange(self.embedding_dim)).ravel()
+        np.add.at(matrix.reshape(-1), cells, updates.ravel())
+
+    def _pairs(self, ids: np.ndarray, docs: np.ndarray, keep: np.ndarray,
+               rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        kept = rng.random(len(ids)) < keep[ids]
+        ids, docs = ids[kept], docs[kept]
+        # Nearer words are more often inside the window: each token gets a
+        # window drawn from 1..window_size.
+        reach = rng.integers(1, self.window_size + 1, size=len(ids))
+
+        targets, contexts = [], []
+        for offset in range(1, self.window_size + 1):
+            same_doc = docs[offset:] == docs[:-offset]
+            left = same_doc & (reach[offset:] >= offset)
+            right = same_doc & (reach[:-offset] >= offset)
+            targets += [ids[offset:][left], ids[:-offset][right]]
+            contexts += [ids[:-offset][left], ids[offset:][right]]
+
+        if not targets:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        targets = np.concatenate(targets)
+        contexts = np.concatenate(contexts)
+        order = rng.permutation(len(targets))
+        return targets[order], contexts[order]
+
+    def _noise_table(self) -> np.ndarray:
+        weights = self.counts.astype(float) ** 0.75
+        if not len(weights):
+            return np.zeros(1, dtype=np.int64)
+        cumulative = np.cumsum(weights / weights.sum())
+        slots = (np.arange(NOISE_TABLE_SIZE) + 0.5) / NOISE_TABLE_SIZE
+        return np.minimum(np.searchsorted(cumulative, slots), self.vocab_size - 1)
+
     def embed(self, text: str) -> np.ndarray:
         tokens = self.tokenize(text)
         embeddings = []
@@ -198,6 +291,38 @@ class ErrorEmbedding:
 
         return np.mean(embeddings, axis=0)
 
+# Character classes counted from raw bytes by ``FeatureExtractor.extract_batch``:
+# newlines, ASCII capitals, then each of COUNTED_CHARS. All are ASCII, and an
+# ASCII byte in UTF-8 only ever encodes that character.
+COUNTED_CHARS = '()[]{}:;'
+N_CHAR_CLASSES = 2 + len(COUNTED_CHARS)
+
+
+def _char_class_table() -> np.ndarray:
+    table = np.full(256, -1, dtype=np.intp)
+    table[ord('\n')] = 0
+    table[ord('A'):ord('Z') + 1] = 1
+    for i, char in enumerate(COUNTED_CHARS, 2):
+        table[ord(char)] = i
+    return table
+
+
+_CHAR_CLASSES = _char_class_table()
+
+# Substrings ``extract`` flags at the end of every feature vector.
+TRAILING_FLAGS = ('error', 'warning', 'exception')
+
+
+def _char_counts(texts: List[str]) -> np.ndarray:
+    raw = [text.encode('utf-8', 'surrogatepass') for text in texts]
+    sizes = np.fromiter(map(len, raw), dtype=np.intp, count=len(raw))
+    classes = _CHAR_CLASSES[np.frombuffer(b''.join(raw), dtype=np.uint8)]
+    rows = np.repeat(np.arange(len(raw)), sizes)
+    hit = classes >= 0
+    counts = np.bincount(rows[hit] * N_CHAR_CLASSES + classes[hit], minlength=len(raw) * N_CHAR_CLASSES)
+    return counts.reshape(len(raw), N_CHAR_CLASSES)
+
+
 class FeatureExtractor:
 
     def __init__(self):
@@ -248,6 +373,47 @@ class FeatureExtractor:
 
         return np.array(features, dtype=float)
 
+    def extract_batch(self, error_texts: List[str], dtype=np.float32) -> np.ndarray:
+        """Features of many texts at once; row ``i`` equals ``extract(error_texts[i])``.
+
+        Character counts come from a single pass over all the texts' bytes.
+        Each distinct keyword is searched for once per text, and the keyword,
+        language and trailing features are assembled from those hits.
+        """
+        n = len(error_texts)
+        groups = list(self.language_indicators.values())
+        needles = list(dict.fromkeys(chain(self.error_keywords, chain.from_iterable(groups), TRAILING_FLAGS)))
+        column = {needle: i for i, needle in enumerate(needles)}
+
+        lowered = [text.lower() for text in error_texts]
+        found = np.empty((len(needles), n), dtype=np.int64)
+        for i, needle in enumerate(needles):
+            found[i] = np.fromiter(map(operator.contains, lowered, repeat(needle)), dtype=bool, count=n)
+
+        # Indicators listed twice for a language count twice, as in extract.
+        membership = np.zeros((len(groups), len(needles)), dtype=np.int64)
+        for row, indicators in enumerate(groups):
+            for indicator in indicators:
+                membership[row, column[indicator]] += 1
+
+        chars = _char_counts(error_texts)
+        blocks = [
+            np.fromiter(map(len, error_texts), dtype=np.int64, count=n)[:, None],
+            np.fromiter((len(text.split()) for text in error_texts), dtype=np.int64, count=n)[:, None],
+            chars[:, :2],
+            found[[column[keyword] for keyword in self.error_keywords]].T,
+            (membership @ found).T,
+            chars[:, 2:],
+            found[[column[flag] for flag in TRAILING_FLAGS]].T,
+        ]
+
+        features = np.empty((n, sum(block.shape[1] for block in blocks)), dtype=dtype)
+        start = 0
+        for block in blocks:
+            features[:, start:start + block.shape[1]] = block
+            start += block.shape[1]
+        return features
+
 class MLEngine:
 
     def __init__(self, model_dir: Path = None, quantize: bool = True, cache_size: int = 500):
@@ -274,15 +440,12 @@ class MLEngine:
         self.type_to_idx = {t: i for i, t in enumerate(unique_types)}
 
         for ex in examples:
-            features = self.feature_extractor.extract(ex.error_text, ex.language)
-
             label = np.zeros(len(unique_types))
             label[self.type_to_idx[ex.error_type]] = 1
-
-            X.append(features)
             y.append(label)
 
-        return np.array(X), np.array(y)
+        X = self.feature_extractor.extract_batch([ex.error_text for ex in examples], dtype=float)
+        return X, np.array(y)
 
     def train_classifier(self, examples: List[TrainingExample], epochs: int = 100):
         print(f"Training classifier on {len(examples)} examples...")
@@ -329,13 +492,53 @@ class MLEngine:
         if cached:
             return cached
 
-        features = self.feature_extractor.extract(error_text, language)
+        # Same precision as classify_batch, which shares this cache.
+        features = self.feature_extractor.extract(error_text, language).astype(self.feature_mean.dtype)
         features_norm = (features - self.feature_mean) / self.feature_std
         features_norm = features_norm.reshape(1, -1)
 
         probs = self.classifier.predict(features_norm)[0]
 
         top_indices = np.argsort(probs)[-3:][::-1]
+        result = self._result(probs, top_indices)
+        self._set_cache(cache_key, result)
+        return result
+
+    def classify_batch(self, error_texts: List[str], language: str = None, top_k: int = 3) -> List[Dict]:
+        """Classify many texts with a single forward pass.
+
+        Returns one result per text, shaped like ``classify_error``'s.
+        """
+        if not self.trained or self.classifier is None:
+            return [{'error': 'Model not trained'} for _ in error_texts]
+
+        results: List[Optional[Dict]] = [None] * len(error_texts)
+        pending: Dict[str, List[int]] = {}
+        for i, error_text in enumerate(error_texts):
+            cached = self._prediction_cache.get((error_text, language)) if top_k == 3 else None
+            if cached:
+                results[i] = cached
+            else:
+                pending.setdefault(error_text, []).append(i)
+
+        if pending:
+            texts = list(pending)
+            # Features in the model's own precision: float32 once quantized,
+            # as in classify_error.
+            features = self.feature_extractor.extract_batch(texts, dtype=self.feature_mean.dtype)
+            features_norm = (features - self.feature_mean) / self.feature_std
+            probs = self.classifier.predict(features_norm)
+            top_indices = np.argsort(probs, axis=1)[:, -top_k:][:, ::-1]
+
+            for text, row_probs, row_top in zip(texts, probs, top_indices):
+                result = self._result(row_probs, row_top)
+                if top_k == 3:
+                    self._set_cache((text, language), result)
+                for i in pending[text]:
+                    results[i] = result
+        return results
+
+    def _result(self, probs: np.ndarray, top_indices: np.ndarray) -> Dict:
         predictions = []
         for idx in top_indices:
             predictions.append({
@@ -343,12 +546,10 @@ class MLEngine:
                 'confidence': float(probs[idx])
             })
 
-        result = {
+        return {
             'predictions': predictions,
             'top_prediction': predictions[0] if predictions else None
         }
-        self._set_cache(cache_key, result)
-        return result
 
     def get_similar_errors(self, error_text: str, top_k: int = 5) -> List[Dict]:
         if self.embedding_model is None:
@@ -437,6 +638,34 @@ class MLEngine:
             oldest = self._cache_order.pop(0)
             self._prediction_cache.pop(oldest, None)
 
+_shared_engines: Dict[Path, Tuple[Tuple, MLEngine]] = {}
+_shared_lock = threading.Lock()
+
+
+def _model_stamp(model_dir: Path) -> Tuple:
+    stamp = []
+    for name in ('classifier.pkl', 'embeddings.pkl'):
+        try:
+            stat = (model_dir / name).stat()
+        except OSError:
+            stamp.append(None)
+        else:
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+def shared_engine(model_dir: Path = None) -> MLEngine:
+    """A loaded MLEngine shared within the process, reloaded when its model files change."""
+    model_dir = model_dir or Path.home() / '.debugbuddy' / 'models'
+    stamp = _model_stamp(model_dir)
+    with _shared_lock:
+        entry = _shared_engines.get(model_dir)
+        if entry is None or entry[0] != stamp:
+            engine = MLEngine(model_dir)
+            engine.load_models()
+            entry = _shared_engines[model_dir] = (stamp, engine)
+    return entry[1]
+
 if __name__ == '__main__':
     examples = [
         TrainingExample("NameError: name 'x' is not defined", "NameError", "python"),
@@ -1,4 +1,5 @@
 import ast
+from ..core.rules import BUILTIN_NAMES
 
 class SimpleChecker(ast.NodeVisitor):
     def __init__(self, filename):
@@ -8,17 +9,7 @@ class SimpleChecker(ast.NodeVisitor):
         self.imports = set()
         self.import_lines = {}
         self.undefined_locations = {}
-        self.builtins = {
-            'abs', 'all', 'any', 'ascii', 'bin', 'bool', 'bytearray', 'bytes', 'callable',
-            'chr', 'classmethod', 'compile', 'complex', 'delattr', 'dict', 'dir', 'divmod',
-            'enumerate', 'eval', 'exec', 'filter', 'float', 'format', 'frozenset', 'getattr',
-            'globals', 'hasattr', 'hash', 'help', 'hex', 'id', 'input', 'int', 'isinstance',
-            'issubclass', 'iter', 'len', 'list', 'locals', 'map', 'max', 'memoryview', 'min',
-            'next', 'object', 'oct', 'open', 'ord', 'pow', 'print', 'property', 'range',
-            'repr', 'reversed', 'round', 'set', 'setattr', 'slice', 'sorted', 'staticmethod',
-            'str', 'sum', 'super', 'tuple', 'type', 'vars', 'zip', '__import__',
-            'False', 'None', 'True'
-        }
+        self.builtins = set(BUILTIN_NAMES)
 
     def visit_Import(self, node):
         for alias in node.names:
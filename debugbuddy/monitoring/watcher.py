@@ -7,6 +7,8 @@ from ..core.parsers import ErrorParser
 from ..core.explainer import ErrorExplainer
 from ..monitoring.checker import SimpleChecker
 from ..utils.helpers import detect_all_errors
+from ..storage.config import ConfigManager
+from ..storage.registry import shared_registry
 
 console = Console()
 
@@ -24,6 +26,8 @@ class ErrorWatcher:
         observer = Observer()
         observer.schedule(event_handler, str(self.directory), recursive=True)
         observer.start()
+        if ConfigManager().get('pattern_hot_reload', True):
+            shared_registry().watch()
 
         if self.target_file and self.target_file.exists():
             event_handler._check_for_errors(self.target_file)
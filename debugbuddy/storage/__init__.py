@@ -2,10 +2,15 @@ from .cache import CacheManager
 from .config import ConfigManager
 from .history import HistoryManager
 from .patterns import PatternManager
+from .prediction_cache import PredictionCache
+from .registry import PatternRegistry, shared_registry
 
 __all__ = [
     'CacheManager',
     'ConfigManager',
     'HistoryManager',
-    'PatternManager'
+    'PatternManager',
+    'PredictionCache',
+    'PatternRegistry',
+    'shared_registry',
 ]
\ No newline at end of file
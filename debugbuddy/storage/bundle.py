@@ -0,0 +1,99 @@
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .. import __version__
+
+MAGIC = b'DBBUNDLE'
+BUNDLE_VERSION = 1
+
+
+class PatternBundle:
+    """Compiled pattern data cached in a single binary file.
+
+    The bundle records the path, mtime and size of every pattern file it was
+    built from. It is reused only while those still match and the bundle
+    format and package version are unchanged; otherwise it is rebuilt.
+    """
+
+    def __init__(self, pattern_mgr, cache_dir: Optional[Path] = None,
+                 languages: Optional[Sequence[str]] = None):
+        self.pattern_mgr = pattern_mgr
+        self.cache_dir = cache_dir or (Path.home() / '.debugbuddy' / 'cache')
+        self.languages = tuple(languages) if languages else None
+        name = '-'.join(('patterns',) + self.languages) if self.languages else 'patterns'
+        self.path = self.cache_dir / f'{name}.bundle'
+        self.loaded_from_bundle = False
+
+    def sources(self) -> List[Path]:
+        directories = (self.pattern_mgr.pattern_dir, self.pattern_mgr.custom_dir)
+        if self.languages:
+            return [directory / f'{lang}.json' for directory in directories for lang in self.languages]
+
+        files = sorted(self.pattern_mgr.pattern_dir.glob('*.json'))
+        if self.pattern_mgr.custom_dir.exists():
+            files.extend(sorted(self.pattern_mgr.custom_dir.glob('*.json')))
+        return files
+
+    def manifest(self) -> Tuple:
+        entries = []
+        for file in self.sources():
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            entries.append((str(file), stat.st_mtime_ns, stat.st_size))
+        return (BUNDLE_VERSION, __version__, tuple(entries))
+
+    def load(self, compile_payload: Callable[[], Any]) -> Any:
+        manifest = self.manifest()
+        payload = self._read(manifest)
+        if payload is not None:
+            self.loaded_from_bundle = True
+            return payload
+
+        self.loaded_from_bundle = False
+        payload = compile_payload()
+        self._write(manifest, payload)
+        return payload
+
+    def invalidate(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _read(self, manifest: Tuple) -> Optional[Any]:
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if not data.startswith(MAGIC):
+            return None
+        try:
+            stream = io.BytesIO(data)
+            stream.seek(len(MAGIC))
+            if pickle.load(stream) != manifest:
+                return None
+            return pickle.load(stream)
+        except Exception:
+            return None
+
+    def _write(self, manifest: Tuple, payload: Any):
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(MAGIC)
+                pickle.dump(manifest, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except (OSError, pickle.PicklingError):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
@@ -17,6 +17,11 @@ class ConfigManager:
         'ai_model': 'gpt-4',
         'default_language': 'python',
         'watch_exclude': ['__pycache__', '.git', 'node_modules', '.venv'],
+        'pattern_hot_reload': True,
+        'prediction_cache': True,
+        'prediction_cache_entries': 50000,
+        'predict_max_file_mb': 20,
+        'daemon_idle_minutes': 30,
         'languages': ''
     }
 
@@ -39,9 +44,9 @@ class ConfigManager:
     def set(self, key: str, value: Any):
         config = self._load()
 
-        if key in ['verbose', 'auto_save_history', 'color_output']:
+        if key in ['verbose', 'auto_save_history', 'color_output', 'pattern_hot_reload', 'prediction_cache']:
             value = self._parse_bool(value)
-        elif key == 'max_history':
+        elif key in ['max_history', 'predict_max_file_mb', 'daemon_idle_minutes', 'prediction_cache_entries']:
             value = int(value)
         elif key == 'languages':
             if isinstance(value, (list, tuple)):
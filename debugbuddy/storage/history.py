@@ -1,8 +1,49 @@
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+# Rows added inside ``deferred_writes``, by database file.
+_deferred: Optional[Dict[Path, List[tuple]]] = None
+
+
+@contextmanager
+def deferred_writes():
+    """Keep history rows in memory until the block ends, then write them.
+
+    The daemon answers a request before it pays for the commit.
+    """
+    global _deferred
+    if _deferred is not None:
+        yield
+        return
+    _deferred = {}
+    try:
+        yield
+    finally:
+        pending, _deferred = _deferred, None
+        for db_file, rows in pending.items():
+            _write_rows(db_file, rows)
+
+
+def _write_rows(db_file: Path, rows: List[tuple]):
+    conn = sqlite3.connect(db_file)
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO history (
+                    timestamp, error_type, message, file, line, language, simple, fix
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    finally:
+        conn.close()
+
+
 class HistoryManager:
     def __init__(self):
         self.data_dir = Path.home() / ".debugbuddy"
@@ -32,28 +73,20 @@ class HistoryManager:
         conn.close()
 
     def add(self, error: Dict, explanation: Dict):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO history (
-                timestamp, error_type, message, file, line, language, simple, fix
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                datetime.now().isoformat(),
-                error.get("type", "Unknown"),
-                error.get("message", "")[:200],
-                error.get("file"),
-                error.get("line"),
-                error.get("language", "unknown"),
-                explanation.get("simple", "")[:100],
-                explanation.get("fix", "")[:200],
-            ),
+        row = (
+            datetime.now().isoformat(),
+            error.get("type", "Unknown"),
+            error.get("message", "")[:200],
+            error.get("file"),
+            error.get("line"),
+            error.get("language", "unknown"),
+            explanation.get("simple", "")[:100],
+            explanation.get("fix", "")[:200],
         )
-        conn.commit()
-        conn.close()
+        if _deferred is not None:
+            _deferred.setdefault(self.db_file, []).append(row)
+            return
+        _write_rows(self.db_file, [row])
 
     def get_recent(self, limit: int = 10) -> List[Dict]:
         conn = sqlite3.connect(self.db_file)
@@ -67,6 +100,11 @@ class HistoryManager:
 
     def find_similar(self, error: Dict) -> Optional[Dict]:
         error_type = error.get("type", "").lower()
+        pending = _deferred.get(self.db_file, []) if _deferred is not None else []
+        for row in reversed(pending):
+            if row[1].lower() == error_type:
+                return self._row_to_dict((None,) + row)
+
         conn = sqlite3.connect(self.db_file)
         cursor = conn.cursor()
         cursor.execute(
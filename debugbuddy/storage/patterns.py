@@ -1,12 +1,16 @@
 import json
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 class PatternManager:
     def __init__(self, pattern_dir: Optional[Path] = None, custom_dir: Optional[Path] = None):
         self.pattern_dir = pattern_dir or (Path(__file__).parent.parent.parent / 'patterns')
         self.custom_dir = custom_dir or (Path.home() / '.debugbuddy' / 'patterns' / 'custom')
         self._cache: Dict[Path, Dict[str, object]] = {}
+        # Set while a file watcher keeps the cache current; loads then skip
+        # the per-file stat.
+        self.watching = False
         self.extension_map = {
             '.py': 'python',
             '.js': 'javascript',
@@ -64,7 +68,13 @@ class PatternManager:
         return errors
 
     def _load_file_errors(self, file_path: Path) -> List[dict]:
+        if self.watching:
+            cached = self._cache.get(file_path)
+            if cached is not None:
+                return cached['errors']
         if not file_path.exists():
+            if self.watching:
+                self._cache[file_path] = {'mtime': None, 'errors': []}
             return []
         mtime = file_path.stat().st_mtime
         cached = self._cache.get(file_path)
@@ -75,3 +85,75 @@ class PatternManager:
         errors = data.get('errors', [])
         self._cache[file_path] = {'mtime': mtime, 'errors': errors}
         return errors
+
+    def cached_files(self, languages: Iterable[str]) -> Dict[str, Dict[str, object]]:
+        wanted = set(languages)
+        return {
+            str(path): entry for path, entry in self._cache.items()
+            if path.stem in wanted and entry['mtime'] is not None
+        }
+
+    def forget(self, language: Optional[str] = None):
+        for path in [p for p in self._cache if language is None or p.stem == language]:
+            del self._cache[path]
+
+    def seed_cache(self, entries: Dict[str, Dict[str, object]]):
+        for path, entry in entries.items():
+            self._cache.setdefault(Path(path), entry)
+
+
+class LazyPatterns(MutableMapping):
+    """Patterns keyed by language, read through the manager on first access."""
+
+    def __init__(self, pattern_mgr: PatternManager, include_custom: bool = True):
+        self.pattern_mgr = pattern_mgr
+        self.include_custom = include_custom
+        self._available: Optional[List[str]] = None
+        self._loaded: Dict[str, List[dict]] = {}
+        self.loads = 0
+
+    @property
+    def available(self) -> List[str]:
+        if self._available is None:
+            names = set(self.pattern_mgr.available_languages())
+            if self.include_custom and self.pattern_mgr.custom_dir.exists():
+                names.update(p.stem for p in self.pattern_mgr.custom_dir.glob('*.json'))
+            self._available = sorted(names)
+        return self._available
+
+    @property
+    def loaded_languages(self) -> List[str]:
+        return list(self._loaded)
+
+    def refresh(self):
+        self._available = None
+        self._loaded.clear()
+
+    def __getitem__(self, language: str) -> List[dict]:
+        errors = self._loaded.get(language)
+        if errors is None:
+            if language not in self.available:
+                raise KeyError(language)
+            errors = self._loaded[language] = self.pattern_mgr.load_patterns(language, self.include_custom)
+            self.loads += 1
+        return errors
+
+    def __setitem__(self, language: str, errors: List[dict]):
+        if language not in self.available:
+            self._available = sorted(self.available + [language])
+        self._loaded[language] = errors
+
+    def __delitem__(self, language: str):
+        if language not in self.available:
+            raise KeyError(language)
+        self._available = [name for name in self.available if name != language]
+        self._loaded.pop(language, None)
+
+    def __contains__(self, language) -> bool:
+        return language in self._loaded or language in self.available
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.available)
+
+    def __len__(self) -> int:
+        return len(self.available)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import mmap
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Union
+
+from ..models.prediction import Prediction
+
+MAX_ENTRIES = 50000
+
+
+class PredictionCache:
+    """Predictions of unchanged files, kept in SQLite between runs.
+
+    Entries are keyed by a hash of the file content together with an
+    analysis version that callers derive from everything else the result
+    depends on (analyzer, patterns, models). Predictions are stored without
+    their file path, so a renamed or copied file is still a hit.
+
+    Entries from old file versions and old analyzers are never hit again,
+    so the cache keeps only the ``max_entries`` most recently used ones.
+    A hit refreshes an entry's timestamp at most once a day, which keeps
+    warm runs read-only.
+    """
+
+    def __init__(self, db_file: Optional[Path] = None, max_entries: Optional[int] = MAX_ENTRIES):
+        if db_file is None:
+            data_dir = Path.home() / '.debugbuddy'
+            data_dir.mkdir(exist_ok=True)
+            db_file = data_dir / 'predictions.db'
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+        self._touched: List[tuple] = []
+
+    @staticmethod
+    def key(content: Union[str, bytes, mmap.mmap], version: str) -> str:
+        if isinstance(content, str):
+            content = content.encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha1(content)
+        digest.update(b'\0' + version.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str, file: str) -> Optional[List[Prediction]]:
+        row = None
+        conn = self._connect()
+        if conn is not None:
+            try:
+                row = conn.execute("SELECT predictions, updated FROM predictions WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = datetime.now()
+        if row[1] < (now - timedelta(days=1)).isoformat():
+            self._touched.append((now.isoformat(), key))
+        return [Prediction(file=file, **fields) for fields in json.loads(row[0])]
+
+    def put(self, key: str, predictions: List[Prediction]):
+        fields = []
+        for prediction in predictions:
+            data = asdict(prediction)
+            del data['file']
+            fields.append(data)
+        self._pending.append((key, json.dumps(fields), datetime.now().isoformat()))
+
+    def flush(self):
+        """Write the entries added since the last flush in one transaction."""
+        pending, self._pending = self._pending, []
+        touched, self._touched = self._touched, []
+        conn = self._connect()
+        if conn is None or not (pending or touched):
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, predictions, updated) VALUES (?, ?, ?)",
+                    pending,
+                )
+                conn.executemany("UPDATE predictions SET updated = ? WHERE key = ?", touched)
+                if pending and self.max_entries:
+                    self._prune(conn)
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, conn: sqlite3.Connection):
+        conn.execute(
+            """
+            DELETE FROM predictions WHERE key IN (
+                SELECT key FROM predictions ORDER BY updated DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        self._pending = []
+        conn = self._connect()
+        if conn is None:
+            return
+        with conn:
+            conn.execute("DELETE FROM predictions")
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            try:
+                conn = sqlite3.connect(self.db_file, timeout=30)
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS predictions (
+                        key TEXT PRIMARY KEY,
+                        predictions TEXT,
+                        updated TEXT
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS predictions_updated ON predictions (updated)")
+                conn.commit()
+            except sqlite3.Error:
+                return None
+            self._conn = conn
+        return self._conn
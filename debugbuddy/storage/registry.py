@@ -0,0 +1,168 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from .bundle import PatternBundle
+from .patterns import LazyPatterns, PatternManager
+
+# Seconds a long-lived process trusts a compiled entry before comparing its
+# pattern files with the disk again, when no watcher is running.
+RECHECK_INTERVAL = 0.5
+
+
+class PatternRegistry:
+    """Pattern data shared by every component in the process.
+
+    Holds one PatternManager, its lazily loaded patterns and whatever has
+    been compiled from them, such as match and search indexes. Writers call
+    ``invalidate`` after changing a pattern file; readers can compare
+    ``generation`` to notice that happened. Edits made by other processes
+    are noticed by the watcher, or else by comparing each entry's pattern
+    files with the disk after ``expire`` and every ``RECHECK_INTERVAL``.
+    """
+
+    def __init__(self, pattern_dir: Optional[Path] = None, custom_dir: Optional[Path] = None,
+                 cache_dir: Optional[Path] = None):
+        self.lock = threading.RLock()
+        self.manager = PatternManager(pattern_dir, custom_dir)
+        self.patterns = LazyPatterns(self.manager)
+        self.cache_dir = cache_dir
+        self.generation = 0
+        self.reloads = 0
+        self._compiled: Dict[Hashable, Dict[str, Any]] = {}
+        # The pattern files' manifest each entry was built from, and when it
+        # was last compared with the files on disk.
+        self._manifests: Dict[Hashable, Tuple] = {}
+        self._checked: Dict[Hashable, float] = {}
+        self._observer = None
+
+    def compiled(self, key: Hashable, languages: Optional[Sequence[str]],
+                 build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        entry = self._compiled.get(key)
+        if entry is not None and self._current(key, languages):
+            return entry
+        with self.lock:
+            entry = self._compiled.get(key)
+            if entry is not None and self._current(key, languages):
+                return entry
+            bundle = self._bundle(languages)
+            manifest = bundle.manifest()
+            if self._manifests.get(key, manifest) != manifest:
+                # Without a watcher nothing told us a pattern file changed;
+                # drop everything built from the files that did.
+                self._forget_changed(self._manifests.pop(key), manifest)
+            entry = bundle.load(build)
+            self.manager.seed_cache(entry.get('files', {}))
+            self._compiled[key] = entry
+            self._manifests[key] = manifest
+            self._checked[key] = time.monotonic()
+            return entry
+
+    def expire(self):
+        """Make the next lookup of every entry check its pattern files again.
+
+        Components call this when they start serving a request, so edits made
+        by other processes are picked up even without a watcher.
+        """
+        self._checked.clear()
+
+    def compiled_keys(self):
+        return list(self._compiled)
+
+    def invalidate(self, language: Optional[str] = None):
+        with self.lock:
+            if language is None or language == 'common':
+                self.manager.forget()
+                self._compiled.clear()
+                self._manifests.clear()
+                self._checked.clear()
+                for bundle in self._bundle_dir().glob('patterns*.bundle'):
+                    bundle.unlink(missing_ok=True)
+            else:
+                self.manager.forget(language)
+                for key in [k for k in self._compiled if language in k or 'search' in k]:
+                    del self._compiled[key]
+                    self._manifests.pop(key, None)
+                    self._checked.pop(key, None)
+                self._bundle((language, 'common')).invalidate()
+                self._bundle(None).invalidate()
+            self.patterns.refresh()
+            self.generation += 1
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def watch(self) -> bool:
+        """Reload patterns when their files change instead of checking mtimes.
+
+        Returns False when watchdog is not installed.
+        """
+        with self.lock:
+            if self._observer is not None:
+                return True
+            try:
+                from .reload import start_observer
+            except ImportError:
+                return False
+
+            directories = [self.manager.pattern_dir, self.manager.custom_dir]
+            try:
+                self.manager.custom_dir.mkdir(parents=True, exist_ok=True)
+                self._observer = start_observer(self, [d for d in directories if d.is_dir()])
+            except OSError:
+                return False
+            self.manager.watching = True
+            return True
+
+    def unwatch(self):
+        with self.lock:
+            observer, self._observer = self._observer, None
+            self.manager.watching = False
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    def reload(self, language: str):
+        self.invalidate(language)
+        self.reloads += 1
+
+    def _forget_changed(self, old: Tuple, new: Tuple):
+        changed = set(old[-1]).symmetric_difference(new[-1])
+        languages = {Path(path).stem for path, _, _ in changed}
+        if not languages or 'common' in languages:
+            self.invalidate()
+            return
+        for language in languages:
+            self.invalidate(language)
+
+    def _current(self, key: Hashable, languages: Optional[Sequence[str]]) -> bool:
+        if self.watching:
+            return True
+        now = time.monotonic()
+        if now - self._checked.get(key, float('-inf')) < RECHECK_INTERVAL:
+            return True
+        if self._manifests.get(key) != self._bundle(languages).manifest():
+            return False
+        self._checked[key] = now
+        return True
+
+    def _bundle(self, languages: Optional[Sequence[str]]) -> PatternBundle:
+        return PatternBundle(self.manager, cache_dir=self.cache_dir, languages=languages)
+
+    def _bundle_dir(self) -> Path:
+        return self._bundle(None).cache_dir
+
+
+_shared: Optional[PatternRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def shared_registry() -> PatternRegistry:
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = PatternRegistry()
+    return _shared
@@ -0,0 +1,27 @@
+from pathlib import Path
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+RELOAD_EVENTS = ('created', 'modified', 'deleted', 'moved')
+
+
+class PatternReloadHandler(FileSystemEventHandler):
+    def __init__(self, registry):
+        self.registry = registry
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in RELOAD_EVENTS:
+            return
+        paths = {event.src_path, getattr(event, 'dest_path', '') or event.src_path}
+        for language in {Path(path).stem for path in paths if str(path).endswith('.json')}:
+            self.registry.reload(language)
+
+
+def start_observer(registry, directories) -> Observer:
+    handler = PatternReloadHandler(registry)
+    observer = Observer()
+    for directory in directories:
+        observer.schedule(handler, str(directory), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
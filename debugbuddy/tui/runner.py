@@ -10,10 +10,12 @@ def tui_available() -> bool:
     return True
 
 
-def should_use_tui() -> bool:
+def tui_requested() -> bool:
     flag = os.environ.get("DEBUGBUDDY_TUI", "1").lower()
     if flag in {"0", "false", "no"}:
         return False
-    if not sys.stdout.isatty():
-        return False
-    return tui_available()
+    return sys.stdout.isatty()
+
+
+def should_use_tui() -> bool:
+    return tui_requested() and tui_available()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -25,7 +27,7 @@ from textual.widgets import (
 
 from ..core.explainer import ErrorExplainer
 from ..core.parsers import ErrorParser
-from ..core.predictor import ErrorPredictor
+from ..core.predictor import ErrorPredictor, TopPredictions
 from ..core.trainer import PatternTrainer
 from ..integrations.github.client import GitHubClient
 from ..integrations.github.search import GitHubSearcher
@@ -33,6 +35,9 @@ from ..models.training import TrainingData
 from ..monitoring.watcher import ErrorWatcher
 from ..storage.config import ConfigManager
 from ..storage.history import HistoryManager
+from ..storage.registry import shared_registry
+
+PREDICT_REFRESH = 0.2
 
 
 class DebugBuddyGUI(App):
@@ -163,6 +168,11 @@ class DebugBuddyGUI(App):
     def on_mount(self) -> None:
         self.query_one("#nav", ListView).index = 0
         self._show_view("explain")
+        if ConfigManager().get('pattern_hot_reload', True):
+            shared_registry().watch()
+
+    def on_unmount(self) -> None:
+        shared_registry().unwatch()
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         item_id = event.item.id or ""
@@ -286,7 +296,7 @@ class ExplainView(VerticalScroll):
 class PredictView(VerticalScroll):
     def compose(self) -> ComposeResult:
         yield Label("Predict potential errors", classes="section-title")
-        yield Input(placeholder="File path", id="predict-path")
+        yield Input(placeholder="File or directory path", id="predict-path")
         with Horizontal(classes="form-row"):
             yield Select(
                 [
@@ -305,6 +315,7 @@ class PredictView(VerticalScroll):
         yield Label("", id="predict-status")
 
     def on_mount(self) -> None:
+        self._predict_thread: Optional[threading.Thread] = None
         table = self.query_one("#predict-table", DataTable)
         table.add_columns("File", "Line", "Type", "Confidence", "Severity", "Suggestion")
 
@@ -320,28 +331,51 @@ class PredictView(VerticalScroll):
     def _run_predict(self) -> None:
         path_value = self.query_one("#predict-path", Input).value.strip()
         if not path_value:
-            self.query_one("#predict-status", Label).update("Provide a file path.")
+            self.query_one("#predict-status", Label).update("Provide a file or directory path.")
+            return
+        if self._predict_thread and self._predict_thread.is_alive():
             return
-        severity = self.query_one("#predict-severity", Select).value or None
+        severity = self.query_one("#predict-severity", Select).value
+        severity = severity if isinstance(severity, str) else None
         limit_value = self.query_one("#predict-limit", Input).value.strip()
         limit = int(limit_value) if limit_value.isdigit() else 10
 
-        predictor = ErrorPredictor(ConfigManager())
+        self.query_one("#predict-table", DataTable).clear()
+        self.query_one("#predict-status", Label).update("Analyzing...")
+        self._predict_thread = threading.Thread(
+            target=self._predict_worker, args=(Path(path_value), severity, limit), daemon=True
+        )
+        self._predict_thread.start()
+
+    def _predict_worker(self, path: Path, severity: Optional[str], limit: int) -> None:
+        # Runs off the UI thread; the table is redrawn with the running top
+        # predictions at most every PREDICT_REFRESH seconds.
+        top = TopPredictions(limit)
+        analyzed = 0
+        last_refresh = 0.0
         try:
-            predictions = predictor.predict_file(Path(path_value))
+            predictor = ErrorPredictor(ConfigManager())
+            for _, predictions in predictor.iter_predictions([path]):
+                top.extend(p for p in predictions if not severity or p.severity == severity)
+                analyzed += 1
+                now = time.monotonic()
+                if now - last_refresh >= PREDICT_REFRESH:
+                    last_refresh = now
+                    self.app.call_from_thread(self._show_predictions, top.items(), f"Analyzed {analyzed} file(s)...")
         except Exception as exc:
-            self.query_one("#predict-status", Label).update(f"Prediction failed: {exc}")
+            self.app.call_from_thread(self._show_predictions, [], f"Prediction failed: {exc}")
             return
-        if severity:
-            predictions = [p for p in predictions if p.severity == severity]
-        predictions = predictions[:limit]
 
+        predictions = top.items()
+        status = f"Analyzed {analyzed} file(s)." if predictions else "No potential errors detected."
+        if predictor.skipped:
+            status += f" Skipped {len(predictor.skipped)} file(s)."
+        self.app.call_from_thread(self._show_predictions, predictions, status)
+
+    def _show_predictions(self, predictions: List[object], status: str) -> None:
         table = self.query_one("#predict-table", DataTable)
         table.clear()
-        if not predictions:
-            self.query_one("#predict-status", Label).update("No potential errors detected.")
-            return
-        self.query_one("#predict-status", Label).update("")
+        self.query_one("#predict-status", Label).update(status)
         for pred in predictions:
             table.add_row(
                 Path(pred.file).name if pred.file else "",
@@ -439,6 +473,7 @@ class SearchView(VerticalScroll):
             yield Input(placeholder="Keyword", id="search-keyword")
             yield Button("Search", id="search-run", variant="primary")
         yield DataTable(id="search-table")
+        self._explainer = None
 
     def on_mount(self) -> None:
         table = self.query_one("#search-table", DataTable)
@@ -457,7 +492,9 @@ class SearchView(VerticalScroll):
         keyword = self.query_one("#search-keyword", Input).value.strip()
         if not keyword:
             return
-        results = ErrorExplainer().search_patterns(keyword)
+        if self._explainer is None:
+            self._explainer = ErrorExplainer()
+        results = self._explainer.search_patterns(keyword)
         table = self.query_one("#search-table", DataTable)
         table.clear()
         for pattern in results:
@@ -1,5 +1,6 @@
 import ast
 from pathlib import Path
+from ..core.rules import parse_python
 
 def detect_all_errors(file_path: Path):
     all_errors = []
@@ -20,7 +21,7 @@ def detect_all_errors(file_path: Path):
         filename = str(file_path)
         
         try:
-            ast.parse(content, filename=filename)
+            parse_python(content, filename)
             return []
         except (SyntaxError, IndentationError) as e:
             error_type = type(e).__name__
@@ -53,7 +53,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "dbug=debugbuddy.cli:main",
+            "dbug=debugbuddy.daemon.client:main",
             "debugbuddy=debugbuddy.tui.shell:run",
         ],
     },
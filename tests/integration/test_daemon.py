@@ -0,0 +1,177 @@
+import io
+import socket
+import threading
+import time
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from debugbuddy import __version__
+from debugbuddy.cli import main
+from debugbuddy.daemon import client
+from debugbuddy.daemon.protocol import send
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix domain sockets")
+
+NAME_ERROR = "NameError: name 'foo' is not defined"
+
+@pytest.fixture
+def sock_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    path = tmp_path / 'daemon.sock'
+    monkeypatch.setenv('DEBUGBUDDY_SOCKET', str(path))
+    return path
+
+@pytest.fixture
+def daemon(sock_path):
+    from debugbuddy.daemon.server import DaemonServer
+
+    server = DaemonServer(sock_path)
+    assert server.bind()
+    server.warm()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    client.stop()
+    thread.join(timeout=5)
+
+@pytest.mark.integration
+class TestDaemon:
+
+    def test_explain_matches_in_process(self, daemon, capsys):
+        assert client.run(['explain', NAME_ERROR], autostart=False) == 0
+        remote = capsys.readouterr().out
+
+        local = CliRunner().invoke(main, ['explain', NAME_ERROR]).output
+        assert 'Name Error' in remote
+        assert remote.splitlines()[:10] == local.splitlines()[:10]
+
+    def test_predict_and_check_use_client_cwd(self, daemon, capsys, tmp_path, monkeypatch):
+        (tmp_path / 'bad.py').write_text("print(missing_name)\n")
+        monkeypatch.chdir(tmp_path)
+
+        assert client.run(['predict', 'bad.py', '--no-cache'], autostart=False) == 0
+        assert 'NameError' in capsys.readouterr().out
+        assert client.run(['check', 'bad.py'], autostart=False) == 0
+        assert 'Checking bad.py' in capsys.readouterr().out
+
+    def test_usage_errors_keep_exit_code(self, daemon, capsys):
+        assert client.run(['predict', 'does-not-exist.py'], autostart=False) == 2
+        assert 'does not exist' in capsys.readouterr().err
+        assert client.status()['requests'] == 1
+
+    def test_second_daemon_refuses_to_start(self, daemon, sock_path):
+        from debugbuddy.daemon.server import DaemonServer
+
+        assert not DaemonServer(sock_path).bind()
+
+    def test_version_mismatch_falls_back(self, daemon, sock_path):
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(str(sock_path))
+        with conn:
+            send(conn, {'op': 'status', 'version': '0.0.0'})
+            assert b'error' in conn.recv(4096)
+        for _ in range(50):
+            if client.status() is None:
+                break
+            time.sleep(0.05)
+        assert client.status() is None
+
+    def test_explain_round_trip_beats_cold_start(self, daemon, capsys, monkeypatch):
+        import subprocess
+        import sys
+
+        def timed(run):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        monkeypatch.setenv('DEBUGBUDDY_TUI', '0')
+        cold = timed(lambda: subprocess.run(
+            [sys.executable, '-m', 'debugbuddy', 'explain', NAME_ERROR],
+            cwd=Path(__file__).resolve().parents[2], capture_output=True, check=True,
+        ))
+        client.run(['explain', NAME_ERROR], autostart=False)
+        warm = timed(lambda: client.run(['explain', NAME_ERROR], autostart=False))
+
+        assert warm < cold / 5, f"daemon {warm * 1000:.1f}ms vs cold {cold * 1000:.1f}ms"
+
+@pytest.mark.integration
+class TestThinClient:
+
+    def test_no_daemon_runs_in_process(self, sock_path):
+        assert client.run(['explain', NAME_ERROR], autostart=False) is None
+        assert client.status() is None
+
+    def test_busy_daemon_falls_back(self, sock_path, monkeypatch):
+        monkeypatch.setattr(client, 'QUEUE_TIMEOUT', 0.1)
+        busy = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        busy.bind(str(sock_path))
+        busy.listen(1)
+        with busy:
+            start = time.perf_counter()
+            assert client.run(['explain', NAME_ERROR], autostart=False) is None
+            assert time.perf_counter() - start < 1
+
+    def test_abandoned_request_is_skipped(self, sock_path):
+        from debugbuddy.daemon.server import DaemonServer
+
+        server = DaemonServer(sock_path)
+        left, right = socket.socketpair()
+        with left, right:
+            send(left, {'op': 'run', 'version': __version__, 'argv': ['explain', NAME_ERROR]})
+            left.close()
+            server.handle(right)
+        assert server.requests == 0
+
+    def test_ai_explain_runs_in_process(self, monkeypatch):
+        monkeypatch.setenv('DEBUGBUDDY_TUI', '0')
+        assert not client.should_forward(['explain', '--ai', NAME_ERROR])
+
+    def test_piped_explain_runs_in_process(self, monkeypatch):
+        monkeypatch.setenv('DEBUGBUDDY_TUI', '0')
+        monkeypatch.setattr('sys.stdin', io.StringIO(NAME_ERROR))
+        assert not client.should_forward(['explain'])
+        assert not client.should_forward(['explain', '-l', 'python'])
+        assert client.should_forward(['explain', NAME_ERROR])
+
+    def test_oversized_message_is_refused(self):
+        from debugbuddy.daemon.protocol import receive
+
+        left, right = socket.socketpair()
+        with left, right:
+            send(left, {'out': 'x' * 100})
+            send(left, {'out': 'x' * 5000})
+            left.close()
+            messages = receive(right, max_size=1000)
+            assert next(messages) == {'out': 'x' * 100}
+            with pytest.raises(ValueError):
+                next(messages)
+
+    def test_should_forward(self, monkeypatch):
+        monkeypatch.setenv('DEBUGBUDDY_TUI', '0')
+        assert client.should_forward(['explain', NAME_ERROR])
+        assert client.should_forward(['predict', '.'])
+        assert not client.should_forward(['config', '--show'])
+        assert not client.should_forward([])
+        monkeypatch.setenv('DEBUGBUDDY_DAEMON', '0')
+        assert not client.should_forward(['explain', NAME_ERROR])
+
+    def test_terminal_forwards_commands_without_tui(self, monkeypatch):
+        monkeypatch.setattr(client, 'tui_requested', lambda: True)
+        monkeypatch.setattr(client, 'find_spec', lambda name: object())
+        assert client.should_forward(['check', 'app.py'])
+        assert not client.should_forward(['explain', NAME_ERROR])
+        assert not client.should_forward(['predict', '.'])
+
+    def test_history_is_written_after_the_answer(self, daemon, capsys, sock_path):
+        from debugbuddy.storage.history import HistoryManager
+
+        assert client.run(['explain', NAME_ERROR], autostart=False) == 0
+        assert client.run(['explain', NAME_ERROR], autostart=False) == 0
+        capsys.readouterr()
+
+        client.status()
+        assert len(HistoryManager().get_recent()) == 2
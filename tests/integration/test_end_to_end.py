@@ -78,6 +78,22 @@ class TestCompleteWorkflow:
         assert stats['total'] == 4
         assert len(stats['by_type']) >= 2
 
+    def test_streamed_log_commits_history_once(self, runner, tmp_path, monkeypatch):
+        from debugbuddy.storage import history
+
+        monkeypatch.setenv('HOME', str(tmp_path))
+        monkeypatch.setenv('DEBUGBUDDY_TUI', '0')
+        commits = []
+        write_rows = history._write_rows
+        monkeypatch.setattr(history, '_write_rows', lambda db, rows: commits.append(len(rows)) or write_rows(db, rows))
+        log = "\n".join(f"NameError: name 'v{i}' is not defined" for i in range(5)) + "\n"
+
+        result = runner.invoke(main, ['explain'], input=log)
+
+        assert 'Explained 5 errors' in result.output
+        assert commits == [5]
+        assert len(HistoryManager().get_recent(limit=10)) == 5
+
 class TestErrorDetectionPipeline:
 
     def test_file_check_pipeline(self, temp_error_file):
@@ -0,0 +1,94 @@
+import random
+import time
+import pytest
+from debugbuddy.core.parsers import ErrorParser
+from debugbuddy.core.parsers.detector import LanguageDetector
+
+def cascade_detect(lower_text):
+    if any(i in lower_text for i in ['referenceerror', 'urierror', 'evalerror']):
+        return 'javascript'
+    if any(i in lower_text for i in [
+        'nameerror', 'valueerror', 'indentationerror',
+        'modulenotfounderror', 'zerodivisionerror', 'filenotfounderror',
+        'traceback', 'file "', "name '", 'is not defined'
+    ]):
+        return 'python'
+    if any(i in lower_text for i in ['exception in thread', 'java.lang.', 'nullpointerexception', '.java:']):
+        return 'java'
+    if any(i in lower_text for i in ['nomethoderror', 'ruby', '.rb:', 'undefined method', 'syntaxerror']):
+        return 'ruby'
+    if any(e in lower_text for e in ['typeerror', 'syntaxerror']):
+        if any(c in lower_text for c in ['cannot read property', 'undefined', 'null', 'javascript', 'js', 'node']):
+            return 'javascript'
+        return 'python'
+    if any(e in lower_text for e in ['indexerror', 'keyerror', 'attributeerror', 'importerror']):
+        return 'python'
+    if any(i in lower_text for i in ['type error', 'cannot find name', 'typescript', 'ts', 'ts2']):
+        return 'typescript'
+    if any(i in lower_text for i in ['undefined reference', 'gcc', 'segmentation fault', 'segfault']):
+        return 'c'
+    if any(i in lower_text for i in ['parse error', 'fatal error', 'php']):
+        return 'php'
+    return None
+
+SAMPLES = [
+    "NameError: name 'x' is not defined",
+    "TypeError: unsupported operand type(s) for +",
+    "TypeError: Cannot read property 'map' of undefined",
+    "SyntaxError: invalid syntax",
+    "ReferenceError: foo is not defined",
+    'Exception in thread "main" java.lang.NullPointerException\n\tat Main.main(Main.java:10)',
+    "NoMethodError: undefined method 'name' for nil:NilClass\n\tfrom app.rb:5:in `main'",
+    "IndexError: list index out of range",
+    "error TS2304: Cannot find name 'foo'",
+    "main.c:(.text+0x5): undefined reference to 'bar'",
+    "PHP Parse error: syntax error, unexpected '}'",
+    "Segmentation fault (core dumped)",
+    "something completely different",
+    "",
+]
+
+def build_log(lines):
+    random.seed(1234)
+    words = ['build', 'step', 'compiling', 'warning', 'info', '[ok]', 'passed', 'src/main', 'the', 'a']
+    return '\n'.join(' '.join(random.choice(words) for _ in range(8)) for _ in range(lines)).lower()
+
+class TestLanguageDetection:
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_cascade(self, text):
+        detector = LanguageDetector()
+        expected = cascade_detect(text.lower())
+        assert next(detector.candidates(text.lower()), None) == expected
+        assert expected is None or expected in dict(detector.rank(text.lower()))
+
+    def test_parser_matches_cascade(self):
+        parser = ErrorParser()
+        for text in SAMPLES:
+            expected = cascade_detect(text.strip().lower()) or 'unknown'
+            assert parser.parse(text)['language'] == expected
+
+    def test_benchmark_against_cascade(self):
+        detector = LanguageDetector()
+        log = build_log(20000) + "\ntraceback (most recent call last):\nkeyerror: 'x'"
+
+        start = time.perf_counter()
+        for _ in range(5):
+            cascade_detect(log)
+        cascade_time = (time.perf_counter() - start) / 5
+
+        start = time.perf_counter()
+        for _ in range(5):
+            first = next(detector.candidates(log))
+        lazy_time = (time.perf_counter() - start) / 5
+
+        start = time.perf_counter()
+        ranking = detector.rank(log)
+        rank_time = time.perf_counter() - start
+
+        print(f"\n{len(log) / 1e6:.1f} MB log: cascade {cascade_time * 1000:.1f}ms, "
+              f"detector {lazy_time * 1000:.1f}ms, full ranking {rank_time * 1000:.1f}ms")
+        assert first == 'python'
+        assert ranking[0][0] == 'python'
+        assert lazy_time < cascade_time * 1.5 + 0.002
+        assert rank_time < 0.5, f"Ranking took {rank_time:.3f}s"
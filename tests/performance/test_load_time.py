@@ -37,6 +37,12 @@ class TestLoadTime:
         init_time = end - start
         assert init_time < 2.0, f"Explainer init took {init_time:.2f}s"
 
+    def test_fresh_registry_indexes_nothing(self):
+        from debugbuddy.core.explainer import ErrorExplainer
+        from debugbuddy.storage.registry import PatternRegistry
+
+        assert ErrorExplainer(PatternRegistry()).pattern_stats()['indexed'] == 0
+
     def test_history_manager_initialization(self):
         from debugbuddy.storage.history import HistoryManager
 
@@ -176,6 +182,19 @@ class TestMemoryUsage:
 
         assert patterns_mb < 3.0, f"Patterns use {patterns_mb:.2f}MB"
 
+    def test_only_needed_languages_resident(self):
+        from debugbuddy.core.explainer import ErrorExplainer
+        from debugbuddy.storage.registry import PatternRegistry
+
+        explainer = ErrorExplainer(PatternRegistry())
+        explainer.explain({'type': 'Key Error', 'message': "'x'", 'language': 'python'})
+        stats = explainer.pattern_stats()
+
+        assert stats['indexed'] == 1
+        assert stats['loaded'] <= 2
+        assert explainer.registry.compiled_keys() == [('match', 'python')]
+        assert set(explainer.patterns.loaded_languages) <= {'python', 'common'}
+
 import pytest
 import time
 import tempfile
@@ -61,4 +61,26 @@ class TestMemoryUsage:
             history.add(parsed, explanation)
 
         size_mb = get_size(history) / (1024 * 1024)
-        assert size_mb < 20.0, f"HistoryManager with 100 entries uses {size_mb:.2f} MB"
\ No newline at end of file
+        assert size_mb < 20.0, f"HistoryManager with 100 entries uses {size_mb:.2f} MB"
+
+class TestLargeFileMemory:
+
+    def test_predict_large_file_streams(self, tmp_path):
+        import tracemalloc
+
+        bundle = tmp_path / 'vendor.bundle.js'
+        line = "var value = compute(items[index], options && options.flag) || fallback;\n"
+        bundle.write_text(line * (3 * 1024 * 1024 // len(line)))
+        size = bundle.stat().st_size
+        predictor = ErrorPredictor({'prediction_cache': False})
+        predictor.predict_file(bundle)
+
+        tracemalloc.start()
+        try:
+            predictor.predict_file(bundle)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert not predictor.skipped
+        assert peak < size / 4, f"peak {peak / 1024 / 1024:.1f} MB for a {size / 1024 / 1024:.1f} MB file"
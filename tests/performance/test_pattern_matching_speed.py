@@ -0,0 +1,91 @@
+import random
+import time
+import pytest
+from debugbuddy.core.explainer import ErrorExplainer
+from debugbuddy.core.pattern_index import PatternIndex
+from debugbuddy.storage.registry import PatternRegistry
+
+def linear_match(patterns, error_type, message, language):
+    """The original per-pattern scan, kept as a reference for parity and speed."""
+    for group in (patterns.get(language, []), patterns.get('common', [])):
+        for pattern in group:
+            pattern_type = pattern.get('type', '').lower()
+            if pattern_type and pattern_type in error_type:
+                return pattern.copy()
+            message_lower = message.lower()
+            for keyword in pattern.get('keywords', []):
+                if keyword.lower() in message_lower:
+                    return pattern.copy()
+    return None
+
+def generated_cases(patterns, count, seed=7):
+    rng = random.Random(seed)
+    keywords = [kw for data in patterns.values() for p in data for kw in p.get('keywords', [])]
+    types = [p.get('type', '') for data in patterns.values() for p in data]
+    words = ['value', 'request', 'failed', 'at', 'index', 'null', 'config', 'x', 'Error', 'ing']
+    languages = list(patterns) + ['unknown']
+
+    for _ in range(count):
+        pieces = rng.sample(words, 3)
+        if rng.random() < 0.6:
+            keyword = rng.choice(keywords)
+            if rng.random() < 0.3:
+                keyword = keyword[1:-1] or keyword
+            pieces.insert(rng.randrange(len(pieces) + 1), keyword.upper() if rng.random() < 0.2 else keyword)
+        error_type = rng.choice(types + ['Unknown Error', 'error']).lower()
+        if rng.random() < 0.2:
+            error_type = error_type[:len(error_type) // 2]
+        yield error_type, ' '.join(pieces), rng.choice(languages)
+
+class TestPatternIndexParity:
+
+    def test_matches_linear_scan(self):
+        explainer = ErrorExplainer()
+
+        for error_type, message, language in generated_cases(explainer.patterns, 5000):
+            expected = linear_match(explainer.patterns, error_type, message, language)
+            assert explainer._match_pattern(error_type, message, language) == expected, (error_type, message, language)
+
+    def test_priority_and_short_keywords(self):
+        patterns = [
+            {'type': 'Late Error', 'keywords': ['overflow']},
+            {'type': '', 'keywords': ['ub']},
+            {'type': 'Key Error', 'keywords': ['missing key']},
+            {'type': 'Error', 'keywords': []},
+        ]
+        index = PatternIndex(patterns)
+
+        assert index.match('key error', 'missing key and overflow') is patterns[0]
+        assert index.match('key error', 'nothing here') is patterns[2]
+        assert index.match('value error', 'ub detected') is patterns[1]
+        assert index.match('value error', 'plain') is patterns[3]
+        assert index.match('warning', 'plain') is None
+
+class TestPatternIndexSpeed:
+
+    def test_faster_than_linear_scan(self, tmp_path):
+        explainer = ErrorExplainer(PatternRegistry(cache_dir=tmp_path))
+        explainer.patterns['python'] = explainer.patterns['python'] + [
+            {'type': f'Custom{i} Error', 'keywords': [f'custom failure {i}', f'widget{i} broke']}
+            for i in range(300)
+        ]
+        cases = list(generated_cases(explainer.patterns, 3000, seed=11))
+        for _, _, language in cases:
+            explainer._compiled_for(language)
+
+        def best_of(match, runs=3):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                for error_type, message, language in cases:
+                    match(error_type, message, language)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        linear = best_of(lambda *case: linear_match(explainer.patterns, *case))
+        indexed = best_of(explainer._match_pattern)
+
+        assert indexed < linear, f"indexed {indexed:.4f}s vs linear {linear:.4f}s"
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
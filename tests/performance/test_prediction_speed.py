@@ -1,8 +1,9 @@
+import os
 import pytest
 import time
 import tempfile
 from pathlib import Path
-from debugbuddy.core.predictor import ErrorPredictor
+from debugbuddy.core.predictor import ErrorPredictor, TopPredictions
 from debugbuddy.storage.config import ConfigManager
 
 @pytest.fixture
@@ -51,4 +52,110 @@ class TestPredictionSpeed:
         start = time.time()
         predictions = predictor.predict_file(large_py_file)
         duration = time.time() - start
-        assert duration < 10.0, f"Prediction on large file took {duration:.2f}s"
\ No newline at end of file
+        assert duration < 10.0, f"Prediction on large file took {duration:.2f}s"
+
+def legacy_pattern_predictions(patterns, lines):
+    """The original per-line, per-pattern, per-keyword loop."""
+    found = []
+    for i, line in enumerate(lines, 1):
+        line_lower = line.lower()
+        for pattern in patterns:
+            keywords = pattern.get('keywords', [])
+            matches = sum(1 for kw in keywords if kw.lower() in line_lower)
+            if matches >= 2:
+                found.append((i, pattern.get('type', 'Unknown'), 0.4 + (matches * 0.1)))
+    return found
+
+
+class TestKeywordScanSpeed:
+
+    def test_faster_than_legacy_loop(self, predictor, tmp_path):
+        patterns = predictor.pattern_mgr.load_patterns('python')
+        keywords = [kw for p in patterns for kw in p.get('keywords', [])]
+        lines = [f"    value_{i} = compute({keywords[i % len(keywords)]!r}, {keywords[(i * 7) % len(keywords)]!r})"
+                 for i in range(3000)]
+        path = tmp_path / 'big.py'
+        path.write_text('\n'.join(lines) + '\n')
+        content = path.read_text()
+        predictor._reset_versions()
+        predictor._keyword_scanner('python')
+
+        start = time.perf_counter()
+        legacy = legacy_pattern_predictions(patterns, content.splitlines())
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = predictor._analyze_patterns(path, content)
+        scan_time = time.perf_counter() - start
+
+        assert [(p.line, p.error_type, p.confidence) for p in predictions] == legacy
+        assert scan_time * 2 < legacy_time, f"scanner {scan_time:.3f}s vs legacy {legacy_time:.3f}s"
+
+
+class TestFeatureExtractionSpeed:
+
+    def test_batch_faster_than_per_text(self):
+        import random
+        from debugbuddy.models.ml_engine import FeatureExtractor
+
+        extractor = FeatureExtractor()
+        rng = random.Random(1)
+        words = ("error exception failed undefined null traceback py node js module import Name value "
+                 "key Index timeout : ; ( ) [ ] { } foo bar baz line File").split()
+        texts = [' '.join(rng.choice(words) for _ in range(rng.randint(3, 30))) for _ in range(5000)]
+
+        per_text = batch = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            expected = [extractor.extract(text) for text in texts]
+            per_text = min(per_text, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            features = extractor.extract_batch(texts)
+            batch = min(batch, time.perf_counter() - start)
+
+        assert features.shape == (len(texts), len(expected[0]))
+        assert batch * 1.3 < per_text, f"batch {batch:.3f}s vs per text {per_text:.3f}s"
+
+
+
+class TestEmbeddingTrainingSpeed:
+
+    # A wall-clock bound at this size depends on the machine; run it on
+    # demand rather than on every CI runner.
+    @pytest.mark.skipif(not os.environ.get('DEBUGBUDDY_BENCHMARKS'),
+                        reason="set DEBUGBUDDY_BENCHMARKS=1 to run benchmarks")
+    def test_trains_1m_tokens_per_epoch_in_seconds(self):
+        import random
+        from debugbuddy.models.ml_engine import ErrorEmbedding
+
+        rng = random.Random(2)
+        vocab = [f"token{i}" for i in range(5000)]
+        weights = [1 / (rank + 1) for rank in range(len(vocab))]
+        texts = [' '.join(rng.choices(vocab, weights, k=20)) for _ in range(50000)]
+
+        embedding = ErrorEmbedding()
+        start = time.perf_counter()
+        embedding.train(texts, epochs=1, seed=0)
+        duration = time.perf_counter() - start
+
+        assert embedding.embeddings.shape == (embedding.vocab_size, 128)
+        assert duration < 12.0, f"Training on 1M tokens took {duration:.2f}s"
+
+class TestDirectoryPredictionSpeed:
+
+    def test_predict_many_files(self, tmp_path):
+        for i in range(2000):
+            package = tmp_path / f'pkg{i // 100}'
+            package.mkdir(exist_ok=True)
+            (package / f'mod{i}.py').write_text(f"import os\ndef f{i}(x):\n    return x + {i}\n")
+
+        predictor = ErrorPredictor({'watch_exclude': [], 'prediction_cache': False})
+        start = time.time()
+        top = TopPredictions(5000)
+        for _, predictions in predictor.iter_predictions([tmp_path]):
+            top.extend(predictions)
+        duration = time.time() - start
+
+        assert sum(p.error_type == 'UnusedImport' for p in top.items()) == 2000
+        assert duration < 10.0, f"Prediction over 2000 files took {duration:.2f}s"
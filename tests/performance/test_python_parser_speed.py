@@ -0,0 +1,118 @@
+import re
+import time
+import pytest
+from debugbuddy.core.parsers.python import PythonParser
+
+class LegacyPythonParser:
+    """The pre-dispatch-table parser, kept as a reference for parity and speed."""
+
+    def parse(self, text):
+        result = {
+            "raw": text,
+            "type": "Unknown Error",
+            "message": text.strip(),
+            "file": None,
+            "line": None,
+            "language": "python"
+        }
+
+        file_match = re.search(r'File "([^"]+)", line (\d+)', text)
+        if file_match:
+            result['file'] = file_match.group(1)
+            result['line'] = int(file_match.group(2))
+
+        text_clean = text.strip()
+
+        if "NameError" in text_clean:
+            for pattern in [r"name ['\"]([^'\"]+)['\"] is not defined", r"name ([^\s]+) is not defined"]:
+                match = re.search(pattern, text_clean, re.IGNORECASE)
+                if match:
+                    result['type'] = 'Name Error'
+                    result['message'] = f"name '{match.group(1)}' is not defined"
+                    return result
+            msg_match = re.search(r'NameError:\s*(.+?)(?:\n|$)', text_clean)
+            if msg_match:
+                result['type'] = 'Name Error'
+                result['message'] = msg_match.group(1).strip()
+                return result
+
+        for name, display in [('TypeError', 'Type Error'), ('IndexError', 'Index Error'),
+                              ('KeyError', 'Key Error'), ('SyntaxError', 'Syntax Error'),
+                              ('AttributeError', 'Attribute Error')]:
+            if name in text_clean:
+                msg_match = re.search(name + r':\s*(.+?)(?:\n|$)', text_clean)
+                if msg_match:
+                    result['type'] = display
+                    result['message'] = msg_match.group(1).strip()
+                    return result
+
+        if "ImportError" in text_clean or "ModuleNotFoundError" in text_clean:
+            msg_match = re.search(r'(ImportError|ModuleNotFoundError):\s*(.+?)(?:\n|$)', text_clean)
+            if msg_match:
+                error_name = msg_match.group(1)
+                result['type'] = 'Import Error' if error_name == 'ImportError' else 'Module Not Found Error'
+                result['message'] = msg_match.group(2).strip()
+                return result
+
+        if "ValueError" in text_clean:
+            msg_match = re.search(r'ValueError:\s*(.+?)(?:\n|$)', text_clean)
+            if msg_match:
+                result['type'] = 'Value Error'
+                result['message'] = msg_match.group(1).strip()
+                return result
+
+        error_match = re.search(r'(\w+Error):\s*(.+?)(?:\n|$)', text_clean)
+        if error_match:
+            error_type = error_match.group(1)
+            base = error_type[:-5]
+            spaced = re.sub(r'([A-Z])', r' \1', base).strip()
+            result['type'] = f"{spaced} Error"
+            result['message'] = error_match.group(2).strip()
+            return result
+
+        return result
+
+CORPUS = [
+    "NameError: name 'x' is not defined",
+    'Traceback (most recent call last):\n  File "app.py", line 12, in <module>\n    run()\nNameError: name "user" is not defined',
+    "NameError: something odd",
+    "TypeError: unsupported operand type(s) for +: 'int' and 'str'",
+    "IndexError: list index out of range",
+    "KeyError: 'missing_key'",
+    "SyntaxError: invalid syntax",
+    "AttributeError: 'NoneType' object has no attribute 'x'",
+    "ImportError: cannot import name 'foo'",
+    "ModuleNotFoundError: No module named 'requests'",
+    "ValueError: invalid literal for int() with base 10: 'abc'",
+    "ZeroDivisionError: division by zero",
+    "IndentationError: unexpected indent",
+    "MyKeyError: custom",
+    "KeyError: 'a'\n\nDuring handling of the above exception, another exception occurred:\n\nTypeError: bad",
+    "ValueError: invalid literal KeyError: nested",
+    "Error: no class name",
+    "TypeError:\n  message on next line",
+    "TypeError: ",
+    "Long traceback\nNameError: complex",
+    "nothing to see here",
+    "",
+]
+
+class TestPythonParserSpeed:
+
+    @pytest.mark.parametrize("text", CORPUS)
+    def test_matches_legacy_parser(self, text):
+        assert PythonParser().parse(text) == LegacyPythonParser().parse(text)
+
+    def test_throughput(self):
+        workload = CORPUS * 500
+        rates = {'legacy': 0.0, 'dispatch': 0.0}
+        for _ in range(3):
+            for name, parser in [('legacy', LegacyPythonParser()), ('dispatch', PythonParser())]:
+                start = time.perf_counter()
+                for text in workload:
+                    parser.parse(text)
+                rates[name] = max(rates[name], len(workload) / (time.perf_counter() - start))
+
+        print(f"\nPythonParser throughput: legacy {rates['legacy']:,.0f} errors/s, "
+              f"dispatch {rates['dispatch']:,.0f} errors/s")
+        assert rates['dispatch'] > rates['legacy']
@@ -0,0 +1,54 @@
+import time
+import pytest
+from debugbuddy.core.pattern_index import SearchIndex
+
+def custom_library(size):
+    return {
+        'custom': [
+            {
+                'type': f'Widget{i} Error',
+                'simple': f'Widget {i} failed while handling request batch {i % 97}',
+                'fix': f'Restart widget {i} and check the queue settings',
+                'keywords': [f'widget{i}', 'queue', f'batch{i % 97}'],
+            }
+            for i in range(size)
+        ]
+    }
+
+def time_queries(search, queries, rounds=20):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            search(query)
+    return (time.perf_counter() - start) / (rounds * len(queries))
+
+class TestSearchSpeed:
+
+    QUERIES = ['widget123 error', 'restart widget42 ', 'no such text']
+
+    def test_latency_stays_flat_as_library_grows(self):
+        small = SearchIndex(custom_library(500))
+        large = SearchIndex(custom_library(5000))
+
+        small_time = time_queries(small.search, self.QUERIES)
+        large_time = time_queries(large.search, self.QUERIES)
+
+        print(f"\nsearch latency: 500 patterns {small_time * 1e6:.0f}us, 5000 patterns {large_time * 1e6:.0f}us")
+        assert large_time < small_time * 4, f"{large_time:.6f}s vs {small_time:.6f}s"
+
+    def test_faster_than_linear_scan(self):
+        library = custom_library(5000)
+        index = SearchIndex(library)
+
+        def linear(keyword):
+            keyword = keyword.lower()
+            return [
+                pattern for data in library.values() for pattern in data
+                if any(keyword in str(field).lower() for field in
+                       [pattern['type'], pattern['simple'], pattern['fix']] + pattern['keywords'])
+            ]
+
+        assert time_queries(index.search, self.QUERIES, rounds=3) < time_queries(linear, self.QUERIES, rounds=3)
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,41 @@
+import pytest
+from debugbuddy.core.parsers import ErrorParser
+
+ERRORS = [
+    "NameError: name 'x' is not defined",
+    "TypeError: Cannot read property 'map' of undefined",
+    'Exception in thread "main" java.lang.NullPointerException\n\tat Main.main(Main.java:10)',
+    "IndexError: list index out of range",
+    "something completely different",
+]
+
+class TestParseMany:
+
+    def test_small_input_parses_in_process(self, monkeypatch):
+        import debugbuddy.core.parsers as parsers
+
+        def fail(*args, **kwargs):
+            raise AssertionError("process pool used for a small batch")
+
+        monkeypatch.setattr(parsers, 'ProcessPoolExecutor', fail)
+        parser = ErrorParser()
+
+        results = parser.parse_many(ERRORS, workers=4)
+
+        assert results == [parser.parse(text) for text in ERRORS]
+
+    def test_pool_preserves_input_order(self):
+        parser = ErrorParser()
+        texts = [f"NameError: name 'v{i}' is not defined" if i % 2 else ERRORS[i % len(ERRORS)]
+                 for i in range(ErrorParser.PARALLEL_THRESHOLD + 37)]
+
+        results = parser.parse_many(iter(texts), workers=2, chunk_size=100)
+
+        assert len(results) == len(texts)
+        assert results == [parser.parse(text) for text in texts]
+
+    @pytest.mark.parametrize("workers", [None, 1])
+    def test_language_override(self, workers):
+        results = ErrorParser().parse_many(["KeyError: 'k'"], workers=workers, language='python')
+        assert results[0]['language'] == 'python'
+        assert results[0]['type'] == 'Key Error'
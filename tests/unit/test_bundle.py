@@ -0,0 +1,91 @@
+import json
+import os
+import pytest
+from debugbuddy.storage.bundle import MAGIC, PatternBundle
+from debugbuddy.storage.patterns import PatternManager
+
+@pytest.fixture
+def bundle(tmp_path):
+    pattern_dir = tmp_path / 'patterns'
+    custom_dir = tmp_path / 'custom'
+    pattern_dir.mkdir()
+    (pattern_dir / 'python.json').write_text(json.dumps({'errors': [{'type': 'Key Error', 'keywords': ['key']}]}))
+    mgr = PatternManager(pattern_dir=pattern_dir, custom_dir=custom_dir)
+    return PatternBundle(mgr, cache_dir=tmp_path / 'cache')
+
+class Compiler:
+    def __init__(self, mgr):
+        self.mgr = mgr
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'patterns': self.mgr.load_patterns()}
+
+def test_second_load_reads_bundle(bundle):
+    compile_payload = Compiler(bundle.pattern_mgr)
+
+    first = bundle.load(compile_payload)
+    second = bundle.load(compile_payload)
+
+    assert compile_payload.calls == 1
+    assert bundle.loaded_from_bundle
+    assert first == second
+    assert bundle.path.read_bytes().startswith(MAGIC)
+
+def test_changed_source_rebuilds(bundle):
+    compile_payload = Compiler(bundle.pattern_mgr)
+    bundle.load(compile_payload)
+
+    source = bundle.pattern_mgr.pattern_dir / 'python.json'
+    source.write_text(json.dumps({'errors': [{'type': 'Value Error', 'keywords': []}]}))
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    payload = bundle.load(compile_payload)
+    assert compile_payload.calls == 2
+    assert payload['patterns']['python'][0]['type'] == 'Value Error'
+
+def test_new_custom_file_rebuilds(bundle):
+    compile_payload = Compiler(bundle.pattern_mgr)
+    bundle.load(compile_payload)
+
+    bundle.pattern_mgr.custom_dir.mkdir()
+    (bundle.pattern_mgr.custom_dir / 'python.json').write_text(json.dumps({'errors': [{'type': 'Mine'}]}))
+
+    payload = bundle.load(compile_payload)
+    assert compile_payload.calls == 2
+    assert [p['type'] for p in payload['patterns']['python']] == ['Key Error', 'Mine']
+
+def test_corrupt_bundle_rebuilds(bundle):
+    compile_payload = Compiler(bundle.pattern_mgr)
+    bundle.load(compile_payload)
+    bundle.path.write_bytes(MAGIC + b'not a pickle')
+
+    bundle.load(compile_payload)
+    assert compile_payload.calls == 2
+    assert not bundle.loaded_from_bundle
+
+def test_explainer_loads_from_bundle(tmp_path):
+    from debugbuddy.core.explainer import ErrorExplainer
+    from debugbuddy.storage.registry import PatternRegistry
+
+    def registry():
+        return PatternRegistry(custom_dir=tmp_path / 'custom', cache_dir=tmp_path / 'cache')
+
+    ErrorExplainer(registry())._match_pattern('nameerror', "name 'x' is not defined", 'python')
+    explainer = ErrorExplainer(registry())
+
+    assert explainer._match_pattern('nameerror', "name 'x' is not defined", 'python') is not None
+    assert explainer.pattern_stats()['file_loads'] == 0
+
+def test_lazy_patterns_load_on_demand(bundle):
+    from debugbuddy.storage.patterns import LazyPatterns
+
+    patterns = LazyPatterns(bundle.pattern_mgr)
+
+    assert list(patterns) == ['python']
+    assert patterns.loaded_languages == []
+    assert patterns['python'][0]['type'] == 'Key Error'
+    assert patterns.get('ruby') is None
+    assert patterns.loaded_languages == ['python'] and patterns.loads == 1
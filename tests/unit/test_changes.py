@@ -0,0 +1,157 @@
+import shutil
+import subprocess
+import pytest
+from debugbuddy.core.changes import GitError, changed_lines, in_ranges, parse_diff
+from debugbuddy.core.predictor import ErrorPredictor
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+HINT = "# attribute error: has no attribute\n"
+
+def git(repo, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, 'init', '-q', '-b', 'main')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'app.py').write_text("import os\n" + HINT + "value = 1\n")
+    (tmp_path / 'pkg' / 'util.py').write_text("def helper():\n    return 1\n")
+    (tmp_path / 'README.md').write_text("readme\n")
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+    return tmp_path
+
+@pytest.fixture
+def predictor():
+    return ErrorPredictor({'prediction_cache': False, 'watch_exclude': ['.git']})
+
+class TestParseDiff:
+
+    def test_hunks(self):
+        diff = (
+            "diff --git a/a.py b/a.py\n"
+            "--- a/a.py\n"
+            "+++ b/a.py\n"
+            "@@ -1 +1 @@\n"
+            "@@ -10,0 +11,3 @@ def f():\n"
+            "@@ -20,2 +22,0 @@\n"
+            "diff --git a/b c.py b/b c.py\n"
+            "--- \"a/b\\tc.py\"\n"
+            "+++ \"b/b\\tc.py\"\n"
+            "@@ -5,2 +5,2 @@\n"
+        )
+        assert parse_diff(diff) == {'a.py': ((1, 1), (11, 13)), 'b\tc.py': ((5, 6),)}
+
+    def test_in_ranges(self):
+        ranges = ((3, 5), (9, 9))
+        assert [line for line in range(1, 12) if in_ranges(line, ranges)] == [3, 4, 5, 9]
+        assert in_ranges(1, None)
+        assert not in_ranges(1, ())
+
+class TestChangedLines:
+
+    def test_clean_tree(self, repo):
+        assert changed_lines(repo) == {}
+
+    def test_working_tree_and_untracked(self, repo):
+        (repo / 'pkg' / 'util.py').write_text("def helper():\n    return 2\n\n\ndef other():\n    pass\n")
+        (repo / 'pkg' / 'new.py').write_text("x = 1\n")
+        (repo / 'README.md').unlink()
+
+        changes = changed_lines(repo)
+
+        assert changes == {
+            repo.resolve() / 'pkg' / 'util.py': ((2, 6),),
+            repo.resolve() / 'pkg' / 'new.py': None,
+        }
+
+    @pytest.mark.parametrize("option", ['diff.noprefix', 'diff.mnemonicPrefix'])
+    def test_ignores_prefix_config(self, repo, option):
+        git(repo, 'config', option, 'true')
+        (repo / 'pkg' / 'util.py').write_text("def helper():\n    return 2\n")
+        git(repo, 'add', 'pkg/util.py')
+
+        assert changed_lines(repo) == {repo.resolve() / 'pkg' / 'util.py': ((2, 2),)}
+
+    def test_staged_and_scoped_to_path(self, repo):
+        (repo / 'pkg' / 'util.py').write_text("def helper():\n    return 2\n")
+        git(repo, 'add', 'pkg/util.py')
+        (repo / 'other.py').write_text("y = 2\n")
+
+        assert list(changed_lines(repo / 'pkg')) == [repo.resolve() / 'pkg' / 'util.py']
+
+    def test_base_uses_merge_base(self, repo):
+        git(repo, 'checkout', '-q', '-b', 'feature')
+        (repo / 'pkg' / 'util.py').write_text("def helper():\n    return 3\n")
+        git(repo, 'commit', '-q', '-am', 'feature change')
+        git(repo, 'checkout', '-q', 'main')
+        (repo / 'pkg' / 'app.py').write_text("import os\n" + HINT + "value = 2\n")
+        git(repo, 'commit', '-q', '-am', 'main change')
+        git(repo, 'checkout', '-q', 'feature')
+
+        assert changed_lines(repo) == {}
+        assert changed_lines(repo, base='main') == {repo.resolve() / 'pkg' / 'util.py': ((2, 2),)}
+
+    def test_unknown_base(self, repo):
+        with pytest.raises(GitError):
+            changed_lines(repo, base='no-such-branch')
+
+    def test_not_a_repository(self, tmp_path):
+        (tmp_path / 'plain').mkdir()
+        if subprocess.run(['git', 'rev-parse'], cwd=tmp_path / 'plain', capture_output=True).returncode == 0:
+            pytest.skip("temporary directory is inside a git repository")
+        with pytest.raises(GitError):
+            changed_lines(tmp_path / 'plain')
+
+class TestChangedPredictions:
+
+    def test_only_changed_files_and_lines(self, repo, predictor):
+        app = repo / 'pkg' / 'app.py'
+        app.write_text("import os\n" + HINT + "value = 1\n" + HINT)
+
+        results = dict(predictor.iter_changed_predictions(repo, workers=1))
+
+        assert list(results) == [str(app.resolve())]
+        found = {(p.line, p.error_type) for p in results[str(app.resolve())]}
+        # The unused import is outside the change but still reported, while
+        # the pattern hit on the untouched line 2 is not.
+        assert (1, 'UnusedImport') in found
+        assert (4, 'AttributeError') in found
+        assert (2, 'AttributeError') not in found
+
+        full = {(p.line, p.error_type) for p in predictor.predict_file(app)}
+        assert found < full
+
+    def test_deleted_lines_still_check_the_file(self, repo, predictor):
+        app = repo / 'pkg' / 'app.py'
+        app.write_text("value = os.getcwd()\n")
+
+        results = dict(predictor.iter_changed_predictions(repo, workers=1))
+
+        assert [p.error_type for p in results[str(app.resolve())]] == ['NameError']
+
+    def test_excluded_and_non_source_files(self, repo, predictor):
+        (repo / 'README.md').write_text("changed\n")
+        (repo / 'node_modules').mkdir()
+        (repo / 'node_modules' / 'dep.js').write_text("x\n")
+        predictor.config['watch_exclude'] = ['node_modules']
+
+        assert list(predictor.iter_changed_predictions(repo, workers=1)) == []
+
+    def test_ranges_are_part_of_the_cache_key(self, repo, tmp_path):
+        from debugbuddy.storage.prediction_cache import PredictionCache
+
+        predictor = ErrorPredictor({})
+        predictor.cache = PredictionCache(tmp_path / 'predictions.db')
+        app = repo / 'pkg' / 'app.py'
+        app.write_text("import os\n" + HINT + "value = 1\n" + HINT)
+
+        changed = dict(predictor.iter_changed_predictions(repo, workers=1))[str(app.resolve())]
+        full = predictor.predict_file(app.resolve())
+
+        assert predictor.cache_stats() == (0, 2)
+        assert len(full) > len(changed)
@@ -0,0 +1,78 @@
+import pytest
+from debugbuddy.core.fingerprint import SignatureCache, normalize, signature
+from debugbuddy.core.parsers import ErrorParser
+from debugbuddy.core.explainer import ErrorExplainer
+
+class TestNormalize:
+
+    @pytest.mark.parametrize("first, second", [
+        ("object at 0x7f3a2b10 is bad", "object at 0xdeadbeef is bad"),
+        ('File "/tmp/pytest-1/test_a.py", line 12', 'File "/tmp/pytest-9/test_b.py", line 480'),
+        ("name 'user_id' is not defined", "name 'order' is not defined"),
+        ("list index 5 out of range", "list index 12 out of range"),
+        ("app.js:10:5 failed", "app.js:212:17 failed"),
+    ])
+    def test_volatile_parts_are_stripped(self, first, second):
+        assert normalize(first) == normalize(second)
+
+    def test_signature_is_stable_and_distinguishes_types(self):
+        a = {'language': 'python', 'type': 'Key Error', 'message': "'a' at 0x1f"}
+        b = {'language': 'python', 'type': 'Key Error', 'message': "'b' at 0x2e"}
+        c = {'language': 'python', 'type': 'Name Error', 'message': "'a' at 0x1f"}
+
+        assert signature(a) == signature(b)
+        assert signature(a) != signature(c)
+        assert len(signature(a)) == 16
+
+class TestSignatureCache:
+
+    def test_evicts_least_recently_used(self):
+        cache = SignatureCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+
+class TestCachedParseAndExplain:
+
+    def test_parse_returns_independent_copies(self):
+        parser = ErrorParser()
+        first = parser.parse("KeyError: 'cached'")
+        first['type'] = 'mutated'
+
+        assert parser.parse("KeyError: 'cached'")['type'] == 'Key Error'
+
+    def test_explain_reuses_cached_explanation(self):
+        explainer = ErrorExplainer()
+        parser = ErrorParser()
+
+        first = explainer.explain(parser.parse("IndexError: list index 3 out of range"))
+        hits = explainer._explain_cache.hits
+        second = explainer.explain(parser.parse("IndexError: list index 97 out of range"))
+
+        assert explainer._explain_cache.hits == hits + 1
+        assert first == second
+        assert first is not second
+
+    def test_name_suggestions_stay_specific(self):
+        explainer = ErrorExplainer()
+        x = explainer.explain({'type': 'Name Error', 'language': 'python', 'message': "name 'prnt' is not defined"})
+        y = explainer.explain({'type': 'Name Error', 'language': 'python', 'message': "name 'lenn' is not defined"})
+
+        assert any('print' in s for s in x['suggestions'])
+        assert any('len' in s for s in y['suggestions'])
+
+    def test_numeric_keywords_are_not_merged(self):
+        explainer = ErrorExplainer()
+        unauthorized = {'type': 'HTTP Error', 'language': 'common', 'message': 'request failed with 401'}
+        server = {'type': 'HTTP Error', 'language': 'common', 'message': 'request failed with 500'}
+
+        for parsed in (unauthorized, server, unauthorized):
+            expected = explainer._match_pattern(parsed['type'].lower(), parsed['message'], 'common')
+            expected = expected or explainer._generic_explanation(parsed)
+            assert explainer.explain(parsed)['simple'] == expected['simple']
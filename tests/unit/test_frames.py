@@ -0,0 +1,60 @@
+from debugbuddy.core.parsers import ErrorParser
+from debugbuddy.core.parsers.frames import Frame, LazyFrames, extract_frames
+
+PYTHON_TRACE = '''Traceback (most recent call last):
+  File "/app/main.py", line 10, in <module>
+    run()
+  File "/app/lib.py", line 4, in run
+    items[5]
+IndexError: list index out of range'''
+
+JS_TRACE = '''TypeError: Cannot read property 'x' of undefined
+    at handler (/app/server.js:12:5)
+    at /app/index.js:3:1'''
+
+JAVA_TRACE = '''Exception in thread "main" java.lang.NullPointerException
+\tat com.example.Main.run(Main.java:14)
+\tat jdk.internal.reflect.NativeMethodAccessorImpl.invoke0(Native Method)'''
+
+def test_python_frames():
+    frames = extract_frames(PYTHON_TRACE, 'python')
+
+    assert [(f.file, f.line, f.function) for f in frames] == [
+        ('/app/main.py', 10, '<module>'),
+        ('/app/lib.py', 4, 'run'),
+    ]
+    assert PYTHON_TRACE[frames[1].offset:].startswith('File "/app/lib.py"')
+
+def test_javascript_frames():
+    frames = extract_frames(JS_TRACE, 'javascript')
+
+    assert [(f.file, f.line, f.function) for f in frames] == [
+        ('/app/server.js', 12, 'handler'),
+        ('/app/index.js', 3, None),
+    ]
+
+def test_java_frames():
+    frames = extract_frames(JAVA_TRACE, 'java')
+
+    assert [(f.file, f.line, f.function) for f in frames] == [
+        ('Main.java', 14, 'com.example.Main.run'),
+        ('Native Method', None, 'jdk.internal.reflect.NativeMethodAccessorImpl.invoke0'),
+    ]
+
+def test_unsupported_language_has_no_frames():
+    assert extract_frames("main.c:3:5: error: expected ';'", 'c') == []
+
+def test_frame_is_slotted():
+    frame = Frame('a.py', 1, 'f', 0)
+
+    assert not hasattr(frame, '__dict__')
+
+def test_parse_attaches_lazy_frames():
+    parsed = ErrorParser().parse(PYTHON_TRACE + '\n# lazy')
+    frames = parsed['frames']
+
+    assert isinstance(frames, LazyFrames)
+    assert not frames.materialized
+    assert len(frames) == 2
+    assert frames.materialized
+    assert frames[0].file == parsed['file']
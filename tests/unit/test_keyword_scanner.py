@@ -0,0 +1,43 @@
+import random
+from debugbuddy.core.pattern_index import KeywordScanner
+from debugbuddy.storage.patterns import PatternManager
+
+def naive_scan(patterns, lines):
+    results = []
+    for i, line in enumerate(lines, 1):
+        line_lower = line.lower()
+        for priority, pattern in enumerate(patterns):
+            matches = sum(1 for kw in pattern.get('keywords', []) if kw.lower() in line_lower)
+            if matches:
+                results.append((i, priority, matches))
+    return results
+
+class TestKeywordScanner:
+
+    def test_overlapping_and_nested_keywords(self):
+        patterns = [
+            {'keywords': ['he', 'she', 'hers']},
+            {'keywords': ['his', 'she', 'SHE']},
+            {'keywords': ['x\ny', 'ushers']},
+        ]
+        lines = ['ushers', 'HIS hers', '', 'nothing', 'sHe']
+        assert KeywordScanner(patterns).scan(lines) == naive_scan(patterns, lines)
+
+    def test_empty_keyword_matches_every_line(self):
+        patterns = [{'keywords': ['', 'abc']}, {'keywords': ['abc']}]
+        lines = ['abc', '', 'xyz']
+        assert KeywordScanner(patterns).scan(lines) == naive_scan(patterns, lines)
+
+    def test_matches_naive_scan_on_real_patterns(self):
+        rng = random.Random(3)
+        manager = PatternManager()
+        for language in ('python', 'javascript', 'php'):
+            patterns = manager.load_patterns(language)
+            keywords = [kw for p in patterns for kw in p.get('keywords', [])]
+            lines = []
+            for _ in range(400):
+                words = [rng.choice(keywords) if rng.random() < 0.4 else rng.choice(['x', 'İ', 'None', 'def'])
+                         for _ in range(rng.randrange(6))]
+                lines.append(' '.join(w.upper() if rng.random() < 0.2 else w for w in words))
+            scanner = KeywordScanner(patterns)
+            assert scanner.scan(lines) == naive_scan(patterns, lines), language
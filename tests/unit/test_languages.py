@@ -50,3 +50,35 @@ def test_language_mapping_for_new_extensions(file_name, expected):
     mgr = PatternManager()
     language = mgr.get_language_for_file(Path(file_name))
     assert language == expected
+
+def test_language_detector_ranks_by_score():
+    from debugbuddy.core.parsers.detector import LanguageDetector
+
+    detector = LanguageDetector()
+    ranking = detector.rank("typeerror: cannot read property 'x' of undefined in node")
+    assert ranking[0] == ('javascript', 4)
+    assert ('python', 1) in ranking
+
+    # Python's rule comes first, but TypeScript has more evidence.
+    text = "error ts2304: cannot find name 'foo'"
+    assert next(detector.candidates(text)) == 'python'
+    assert detector.rank(text) == [('typescript', 3), ('python', 1)]
+
+def test_language_detector_reports_overlapping_indicators():
+    from debugbuddy.core.parsers.detector import LanguageDetector
+
+    detector = LanguageDetector()
+    hits = detector.scan('ts2304: cannot find name')
+    assert {'ts', 'ts2', 'cannot find name'} <= hits
+    assert detector.rank('') == []
+
+def test_language_detector_scan_matches_substring_checks():
+    import random
+    from debugbuddy.core.parsers.detector import LanguageDetector
+
+    detector = LanguageDetector()
+    rng = random.Random(0)
+    pieces = [part for ind in detector.indicators for part in (ind, ind[:len(ind) // 2], ind[len(ind) // 2:])]
+    for _ in range(500):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 6)))
+        assert detector.scan(text) == {ind for ind in detector.indicators if ind in text}, text
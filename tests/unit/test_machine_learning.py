@@ -180,6 +180,48 @@ class TestErrorEmbedding:
 
         assert sim_12 > sim_13
 
+    def test_negative_sampling_separates_topics(self):
+        import random
+
+        rng = random.Random(0)
+        common = "error : ' is not the in line file".split()
+        topics = [[f"topic{t}word{i}" for i in range(20)] for t in range(4)]
+        texts = []
+        for _ in range(1000):
+            topic = rng.choice(topics)
+            texts.append(' '.join(rng.choice(common) if rng.random() < 0.4 else rng.choice(topic)
+                                  for _ in range(15)))
+
+        embedding = ErrorEmbedding(embedding_dim=32)
+        embedding.train(texts, epochs=5, seed=0)
+
+        def cosine_sim(a, b):
+            return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8)
+
+        first = embedding.embed(' '.join(topics[0][:5]))
+        same = cosine_sim(first, embedding.embed(' '.join(topics[0][5:10])))
+        other = cosine_sim(first, embedding.embed(' '.join(topics[1][5:10])))
+
+        assert same > 0.9
+        assert other < 0.8
+
+    def test_training_is_reproducible_with_seed(self):
+        texts = ["NameError: name 'x' is not defined", "TypeError: cannot add int and str"] * 20
+
+        first = ErrorEmbedding(embedding_dim=16)
+        second = ErrorEmbedding(embedding_dim=16)
+        first.train(texts, epochs=2, seed=3)
+        second.train(texts, epochs=2, seed=3)
+
+        np.testing.assert_array_equal(first.embeddings, second.embeddings)
+
+    def test_training_without_pairs(self):
+        embedding = ErrorEmbedding(embedding_dim=8)
+
+        embedding.train(["x", "y"], epochs=2)
+
+        assert embedding.embeddings.shape == (2, 8)
+
 class TestFeatureExtractor:
 
     def test_initialization(self):
@@ -218,6 +260,35 @@ class TestFeatureExtractor:
 
         assert not np.array_equal(py_features, js_features)
 
+    def test_extract_batch_matches_extract(self):
+        import random
+
+        extractor = FeatureExtractor()
+        rng = random.Random(3)
+        pieces = list("aZ(){}[]:;\n \t\r\x85éİΣß漢") + [
+            'error', 'Traceback', 'undefined reference', 'NullPointerException', 'ts', 'Warning', 'node ',
+        ]
+        texts = [''.join(rng.choice(pieces) for _ in range(rng.randrange(30))) for _ in range(500)]
+        texts += ['', "NameError: name 'x' is not defined\n  File \"a.py\", line 3"]
+
+        expected = np.array([extractor.extract(text) for text in texts])
+        batch = extractor.extract_batch(texts)
+
+        assert batch.dtype == np.float32
+        assert np.array_equal(batch, expected.astype(np.float32))
+        assert np.array_equal(extractor.extract_batch(texts, dtype=float), expected)
+        assert extractor.extract_batch([]).shape == (0, expected.shape[1])
+
+    def test_extract_batch_follows_keyword_lists(self):
+        extractor = FeatureExtractor()
+        extractor.error_keywords = extractor.error_keywords + ['deadlock', 'error']
+        extractor.language_indicators['go'] = ['goroutine', 'panic', 'panic']
+        texts = ["fatal error: all goroutines are asleep - deadlock!", "panic: runtime error"]
+
+        expected = np.array([extractor.extract(text) for text in texts])
+
+        assert np.array_equal(extractor.extract_batch(texts, dtype=float), expected)
+
 class TestMLEngine:
 
     @pytest.fixture
@@ -313,6 +384,66 @@ class TestMLEngine:
         assert 0 <= top1['confidence'] <= 1.0
         assert 0 <= top2['confidence'] <= 1.0
 
+    def test_classify_batch_matches_single(self, sample_examples, tmp_path):
+        engine = MLEngine(model_dir=tmp_path)
+        engine.train_classifier(sample_examples, epochs=30)
+        texts = ["NameError: name 'z' is not defined", "IndexError: bad index", "plain text",
+                 "NameError: name 'z' is not defined"]
+
+        batch = engine.classify_batch(texts, "python")
+        single = MLEngine(model_dir=tmp_path)
+        single.__dict__.update(engine.__dict__, _prediction_cache={}, _cache_order=[])
+
+        assert len(batch) == len(texts)
+        for text, result in zip(texts, batch):
+            expected = single.classify_error(text, "python")
+            assert [p['type'] for p in result['predictions']] == [p['type'] for p in expected['predictions']]
+            assert np.allclose([p['confidence'] for p in result['predictions']],
+                               [p['confidence'] for p in expected['predictions']], atol=1e-6)
+
+    def test_single_and_batch_share_precision(self, sample_examples, tmp_path):
+        engine = MLEngine(model_dir=tmp_path)
+        engine.train_classifier(sample_examples, epochs=5)
+        seen = []
+        predict = engine.classifier.predict
+        engine.classifier.predict = lambda X: seen.append(X.dtype) or predict(X)
+
+        engine.classify_error("NameError: name 'z' is not defined", "python")
+        engine.classify_batch(["IndexError: bad index"], "python")
+
+        assert seen == [np.float32, np.float32]
+
+    def test_classify_batch_top_k(self, sample_examples, tmp_path):
+        engine = MLEngine(model_dir=tmp_path)
+        engine.train_classifier(sample_examples, epochs=5)
+
+        results = engine.classify_batch(["TypeError: x", "NameError: y"], top_k=1)
+
+        assert all(len(r['predictions']) == 1 for r in results)
+        assert MLEngine(model_dir=tmp_path).classify_batch(["x"]) == [{'error': 'Model not trained'}]
+
+    def test_predictor_ml_analysis_runs(self, tmp_path):
+        from debugbuddy.core.predictor import ErrorPredictor
+
+        class StubEngine:
+            def __init__(self):
+                self.calls = []
+
+            def classify_batch(self, texts, language=None):
+                self.calls.append((list(texts), language))
+                return [{'top_prediction': {'type': 'NameError', 'confidence': 0.95 if 'Error' in t else 0.2}}
+                        for t in texts]
+
+        source = tmp_path / 'sample.py'
+        source.write_text("# comment\n\nNameError: name 'x' is not defined\nx = 1\n")
+        predictor = ErrorPredictor({})
+        predictor.ml_engine = StubEngine()
+
+        predictions = predictor._analyze_ml(source)
+
+        assert predictor.ml_engine.calls == [(["NameError: name 'x' is not defined", "x = 1"], 'python')]
+        assert [(p.line, p.error_type, p.severity) for p in predictions] == [(3, 'NameError', 'critical')]
+
 class TestMLIntegration:
 
     def test_integration_with_parser(self, tmp_path):
@@ -0,0 +1,65 @@
+import pickle
+import pytest
+from debugbuddy.core.parsers import ErrorParser
+from debugbuddy.core.parsers.record import ParsedError
+from debugbuddy.core.explainer import ErrorExplainer
+from debugbuddy.storage.history import HistoryManager
+
+TRACE = '''Traceback (most recent call last):
+  File "app.py", line 7, in main
+    config['port']
+KeyError: 'port'  '''
+
+def test_fields_reference_source_buffer():
+    parsed = ErrorParser().parse(TRACE)
+
+    assert isinstance(parsed, ParsedError)
+    assert parsed['raw'] == TRACE.strip()
+    assert parsed['message'] == "'port'"
+    assert parsed.source == TRACE.strip()
+    assert isinstance(parsed._message, tuple)
+
+def test_behaves_like_a_dict():
+    parsed = ErrorParser().parse(TRACE)
+    plain = parsed.to_dict()
+
+    assert dict(parsed) == plain
+    assert parsed == plain
+    assert list(parsed.keys()) == ['raw', 'type', 'message', 'file', 'line', 'language', 'frames']
+    assert parsed.get('missing', 'default') == 'default'
+    assert 'type' in parsed and 'missing' not in parsed
+
+    parsed['extra'] = 1
+    parsed['message'] = 'replaced'
+    assert parsed['extra'] == 1 and parsed['message'] == 'replaced'
+    del parsed['extra']
+    with pytest.raises(KeyError):
+        parsed['extra']
+    with pytest.raises(KeyError):
+        del parsed['type']
+
+def test_memoryview_source():
+    data = b"error: disk full on /dev/sda1"
+    parsed = ParsedError(memoryview(data), message=(7, 16), type='IO Error')
+
+    assert parsed['raw'] == data.decode()
+    assert parsed['message'] == 'disk full'
+
+def test_copies_and_pickles_independently():
+    parsed = ErrorParser().parse(TRACE)
+    clone = parsed.copy()
+    clone['type'] = 'Other'
+
+    assert parsed['type'] == 'Key Error'
+    assert pickle.loads(pickle.dumps(parsed)) == parsed
+
+def test_existing_consumers_accept_records(tmp_path):
+    parsed = ErrorParser().parse(TRACE)
+    explanation = ErrorExplainer().explain(parsed)
+
+    history = HistoryManager()
+    history.db_file = tmp_path / 'history.db'
+    history._init_db()
+    history.add(parsed, explanation)
+
+    assert history.get_recent(1)[0]['message'] == "'port'"
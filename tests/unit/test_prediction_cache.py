@@ -0,0 +1,89 @@
+import json
+import pytest
+from debugbuddy.core.predictor import ErrorPredictor
+from debugbuddy.storage.registry import PatternRegistry
+from debugbuddy.storage.prediction_cache import PredictionCache
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'src'
+    root.mkdir()
+    for i in range(140):
+        (root / f'mod{i:03}.py').write_text(f"import os\nvalue = missing_{i}\n")
+    return root
+
+@pytest.fixture
+def predictor(tmp_path):
+    predictor = ErrorPredictor({'watch_exclude': []})
+    predictor.cache = PredictionCache(tmp_path / 'predictions.db')
+    return predictor
+
+class TestPredictionCache:
+
+    def test_second_run_hits_everything(self, predictor, tree):
+        first = dict(predictor.iter_predictions([tree], workers=1))
+        assert predictor.cache_stats() == (0, 140)
+
+        second = dict(predictor.iter_predictions([tree], workers=1))
+        assert predictor.cache_stats() == (140, 140)
+        assert second == first
+
+    def test_only_changed_files_are_analyzed(self, predictor, tree):
+        list(predictor.iter_predictions([tree], workers=1))
+        (tree / 'mod005.py').write_text("print(changed)\n")
+
+        results = dict(predictor.iter_predictions([tree], workers=1))
+
+        assert predictor.cache_stats() == (139, 141)
+        changed = results[str(tree / 'mod005.py')]
+        assert [p.message for p in changed] == ["name 'changed' is not defined"]
+
+    def test_hit_reports_current_path(self, predictor, tree):
+        original = predictor.predict_file(tree / 'mod001.py')
+        copy = tree / 'copy.py'
+        copy.write_text((tree / 'mod001.py').read_text())
+
+        cached = predictor.predict_file(copy)
+
+        assert predictor.cache_stats() == (1, 1)
+        assert [p.file for p in cached] == [str(copy)] * len(original)
+        assert [p.message for p in cached] == [p.message for p in original]
+
+    def test_pattern_change_invalidates(self, predictor, tree, tmp_path):
+        pattern_dir = tmp_path / 'patterns'
+        pattern_dir.mkdir()
+        python_patterns = pattern_dir / 'python.json'
+        python_patterns.write_text(json.dumps({'errors': []}))
+        predictor.registry = PatternRegistry(pattern_dir, tmp_path / 'custom', tmp_path / 'cache')
+        predictor.pattern_mgr = predictor.registry.manager
+        target = tree / 'mod002.py'
+
+        assert not any(p.error_type == 'Risky' for p in predictor.predict_file(target))
+        python_patterns.write_text(json.dumps({'errors': [{'type': 'Risky', 'keywords': ['value', 'missing']}]}))
+
+        assert any(p.error_type == 'Risky' for p in predictor.predict_file(target))
+        assert predictor.cache_stats() == (0, 2)
+
+    def test_parallel_workers_fill_and_share_cache(self, predictor, tree):
+        parallel = dict(predictor.iter_predictions([tree], workers=2))
+        assert predictor.cache_stats() == (0, 140)
+
+        sequential = dict(predictor.iter_predictions([tree], workers=1))
+        assert predictor.cache_stats() == (140, 140)
+        assert parallel == sequential
+
+    def test_keeps_most_recently_used_entries(self, tmp_path):
+        cache = PredictionCache(tmp_path / 'predictions.db', max_entries=3)
+        for i in range(3):
+            cache.put(f'key{i}', [])
+        cache.flush()
+        with cache._connect() as conn:
+            conn.execute("UPDATE predictions SET updated = '2000-01-01' WHERE key = 'key0'")
+            conn.execute("UPDATE predictions SET updated = '2000-01-02' WHERE key = 'key1'")
+
+        assert cache.get('key0', 'a.py') == []
+        cache.put('key3', [])
+        cache.flush()
+
+        assert cache.get('key1', 'a.py') is None
+        assert all(cache.get(key, 'a.py') == [] for key in ('key0', 'key2', 'key3'))
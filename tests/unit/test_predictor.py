@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 import tempfile
-from debugbuddy.core.predictor import ErrorPredictor
+from debugbuddy.core.predictor import ErrorPredictor, TopPredictions
 from debugbuddy.storage.config import ConfigManager
 from debugbuddy.models.prediction import Prediction
 
@@ -11,7 +11,9 @@ def config_manager():
 
 @pytest.fixture
 def predictor(config_manager):
-    return ErrorPredictor(config_manager)
+    predictor = ErrorPredictor(config_manager)
+    predictor.cache = None
+    return predictor
 
 @pytest.fixture
 def python_file_with_errors():
@@ -119,6 +121,106 @@ class TestErrorPredictor:
 
         assert isinstance(predictions, list)
 
+@pytest.fixture
+def project_tree(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'a.py').write_text("print(missing_a)\n")
+    (tmp_path / 'pkg' / 'b.js').write_text("console.log('ok');\n")
+    (tmp_path / 'notes.txt').write_text("print(not_code)\n")
+    for excluded in ('node_modules', '.venv'):
+        (tmp_path / excluded).mkdir()
+        (tmp_path / excluded / 'dep.py').write_text("print(missing_dep)\n")
+    for i in range(150):
+        (tmp_path / f'mod{i:03}.py').write_text(f"value = missing_{i}\n")
+    return tmp_path
+
+@pytest.fixture
+def tree_predictor():
+    # Uncached, so every run walks the tree and analyzes each file.
+    predictor = ErrorPredictor({'watch_exclude': ['node_modules', '.venv']})
+    predictor.cache = None
+    return predictor
+
+class TestDirectoryPrediction:
+
+    def test_walk_honours_exclude(self, project_tree):
+        predictor = ErrorPredictor({'watch_exclude': ['node_modules', '.*']})
+        files = [p.relative_to(project_tree).as_posix() for p in predictor.iter_source_files(project_tree)]
+
+        assert 'pkg/a.py' in files and 'pkg/b.js' in files
+        assert 'notes.txt' not in files
+        assert not any(f.startswith(('node_modules', '.venv')) for f in files)
+        assert len(files) == 152
+
+    def test_parallel_matches_sequential(self, project_tree, tree_predictor):
+        predictor = tree_predictor
+
+        sequential = dict(predictor.iter_predictions([project_tree], workers=1))
+        parallel = dict(predictor.iter_predictions([project_tree], workers=2))
+
+        assert parallel == sequential
+        assert {file for file, preds in sequential.items() if any(p.error_type == 'NameError' for p in preds)} >= {
+            str(project_tree / 'pkg' / 'a.py'), str(project_tree / 'mod149.py')
+        }
+
+    def test_workers_do_not_inherit_held_locks(self, project_tree, tree_predictor):
+        import threading
+        from debugbuddy.storage.registry import shared_registry
+
+        # The TUI predicts on a thread while the pattern watcher runs; a
+        # forked worker would copy the registry lock in its held state.
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with shared_registry().lock:
+                held.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        held.wait()
+        try:
+            results = dict(tree_predictor.iter_predictions([project_tree], workers=2))
+        finally:
+            release.set()
+            holder.join()
+        assert len(results) == 152
+
+    def test_file_path_is_predicted_directly(self, predictor, python_file_with_errors):
+        assert dict(predictor.iter_predictions([python_file_with_errors])) == {
+            str(python_file_with_errors): predictor.predict_file(python_file_with_errors)
+        }
+
+class TestStreamingPredictions:
+
+    def test_iter_predictions_covers_every_file(self, project_tree, tree_predictor):
+        predictor = tree_predictor
+        expected = [str(file) for file in predictor.iter_source_files(project_tree)]
+
+        for workers in (1, 2):
+            streamed = list(predictor.iter_predictions([project_tree], workers=workers))
+            assert len(streamed) == 152
+            assert sorted(file for file, _ in streamed) == sorted(expected)
+
+    def test_iter_predictions_is_lazy(self, project_tree, tree_predictor):
+        stream = tree_predictor.iter_predictions([project_tree / 'pkg' / 'a.py', project_tree / 'pkg'], workers=1)
+
+        file, predictions = next(stream)
+        assert file == str(project_tree / 'pkg' / 'a.py')
+        assert any(p.error_type == 'NameError' for p in predictions)
+        stream.close()
+
+    def test_top_predictions_matches_stable_sort(self):
+        predictions = [
+            Prediction('f.py', i, None, 'E', str(i), confidence, '', 'low')
+            for i, confidence in enumerate([0.5, 0.9, 0.5, 1.0, 0.4, 0.9, 0.5, 0.85])
+        ]
+        for n in (1, 3, 5, 20):
+            top = TopPredictions(n)
+            top.extend(predictions)
+            assert top.items() == sorted(predictions, key=lambda p: p.confidence, reverse=True)[:n]
+            assert len(top) == min(n, len(predictions))
+
 class TestPredictionModel:
 
     def test_prediction_creation(self):
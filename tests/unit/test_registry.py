@@ -0,0 +1,167 @@
+import threading
+import pytest
+from debugbuddy.core.explainer import ErrorExplainer
+from debugbuddy.core.predictor import ErrorPredictor
+from debugbuddy.core.trainer import PatternTrainer
+from debugbuddy.models.training import TrainingData
+from debugbuddy.storage import registry as registry_module
+from debugbuddy.storage.config import ConfigManager
+from debugbuddy.storage.registry import PatternRegistry, shared_registry
+
+@pytest.fixture
+def isolated_registry(monkeypatch, tmp_path):
+    custom_dir = tmp_path / 'custom'
+    custom_dir.mkdir()
+    registry = PatternRegistry(custom_dir=custom_dir, cache_dir=tmp_path / 'cache')
+    monkeypatch.setattr(registry_module, '_shared', registry)
+    return registry
+
+def test_components_share_one_manager(isolated_registry):
+    config = ConfigManager()
+
+    assert shared_registry() is isolated_registry
+    assert ErrorExplainer().pattern_mgr is isolated_registry.manager
+    assert ErrorPredictor(config).pattern_mgr is isolated_registry.manager
+    assert PatternTrainer(config).pattern_mgr is isolated_registry.manager
+
+def test_indexes_are_compiled_once_per_process(isolated_registry):
+    ErrorExplainer()._match_pattern('key error', "'x'", 'python')
+    loads = isolated_registry.patterns.loads
+
+    ErrorExplainer()._match_pattern('key error', "'y'", 'python')
+
+    assert isolated_registry.patterns.loads == loads
+    assert isolated_registry.compiled_keys() == [('match', 'python')]
+
+def test_compile_runs_once_across_threads(isolated_registry):
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def build():
+        calls.append(1)
+        return {'files': {}, 'value': 42}
+
+    def worker():
+        barrier.wait()
+        isolated_registry.compiled(('test',), ('python',), build)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+def test_trainer_writes_invalidate_shared_patterns(isolated_registry):
+    explainer = ErrorExplainer()
+    message = 'flux capacitor overloaded'
+    parsed = {'type': 'Capacitor Fault', 'message': message, 'language': 'python'}
+    assert explainer.explain(parsed)['simple'] == 'Generic error occurred.'
+
+    trainer = PatternTrainer(ConfigManager())
+    trainer.custom_patterns_dir = isolated_registry.manager.custom_dir
+    generation = isolated_registry.generation
+    trainer.train_pattern([TrainingData(
+        error_text=f'CapacitorError: {message}',
+        explanation='The capacitor is overloaded',
+        fix='Reduce the load',
+        language='python',
+    )])
+
+    assert isolated_registry.generation == generation + 1
+    assert explainer.explain(parsed)['simple'] == 'The capacitor is overloaded'
+
+    assert trainer.delete_custom_pattern('CapacitorError')
+    assert explainer.explain(parsed)['simple'] == 'Generic error occurred.'
+
+def test_watched_loads_skip_stat(tmp_path, monkeypatch):
+    import json
+    import pathlib
+
+    pattern_dir = tmp_path / 'patterns'
+    pattern_dir.mkdir()
+    (pattern_dir / 'python.json').write_text(json.dumps({'errors': [{'type': 'KeyError'}]}))
+    registry = PatternRegistry(pattern_dir=pattern_dir, custom_dir=tmp_path / 'custom', cache_dir=tmp_path / 'cache')
+    registry.manager.watching = True
+    registry.manager.load_patterns('python')
+
+    calls = []
+    real_stat = pathlib.Path.stat
+    monkeypatch.setattr(pathlib.Path, 'stat', lambda self, **kw: calls.append(self) or real_stat(self, **kw))
+
+    assert registry.manager.load_patterns('python')[0]['type'] == 'KeyError'
+    assert calls == []
+
+def test_file_change_reloads_only_that_language(tmp_path):
+    import json
+    import time
+
+    pattern_dir = tmp_path / 'patterns'
+    pattern_dir.mkdir()
+    for language in ('python', 'ruby', 'common'):
+        (pattern_dir / f'{language}.json').write_text(json.dumps({'errors': [{'type': f'{language} old'}]}))
+    registry = PatternRegistry(pattern_dir=pattern_dir, custom_dir=tmp_path / 'custom', cache_dir=tmp_path / 'cache')
+    explainer = ErrorExplainer(registry)
+    explainer._match_pattern('x', '', 'python')
+    explainer._match_pattern('x', '', 'ruby')
+
+    if not registry.watch():
+        pytest.skip("watchdog is not installed")
+    try:
+        (pattern_dir / 'ruby.json').write_text(json.dumps({'errors': [{'type': 'ruby new', 'keywords': ['gem']}]}))
+        deadline = time.time() + 5
+        while registry.reloads == 0 and time.time() < deadline:
+            time.sleep(0.05)
+
+        assert registry.reloads > 0
+        assert ('match', 'python') in registry.compiled_keys()
+        assert ('match', 'ruby') not in registry.compiled_keys()
+        assert explainer._match_pattern('x', 'missing gem', 'ruby')['type'] == 'ruby new'
+    finally:
+        registry.unwatch()
+    assert not registry.manager.watching
+
+def test_unwatched_registry_notices_edited_files(tmp_path):
+    import json
+    import os
+
+    pattern_dir = tmp_path / 'patterns'
+    pattern_dir.mkdir()
+    for language in ('python', 'ruby', 'common'):
+        (pattern_dir / f'{language}.json').write_text(json.dumps({'errors': []}))
+    python_file = pattern_dir / 'python.json'
+    python_file.write_text(json.dumps({'errors': [{'type': 'Old Error', 'keywords': ['flux'], 'simple': 'old'}]}))
+    registry = PatternRegistry(pattern_dir=pattern_dir, custom_dir=tmp_path / 'custom', cache_dir=tmp_path / 'cache')
+    parsed = {'type': 'Flux Error', 'message': 'flux', 'language': 'python'}
+    assert ErrorExplainer(registry).explain(parsed)['simple'] == 'old'
+    ErrorExplainer(registry)._match_pattern('x', '', 'ruby')
+
+    python_file.write_text(json.dumps({'errors': [{'type': 'New Error', 'keywords': ['flux'], 'simple': 'new'}]}))
+    stat = python_file.stat()
+    os.utime(python_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert ErrorExplainer(registry).explain(parsed)['simple'] == 'new'
+    assert ('match', 'ruby') in registry.compiled_keys()
+
+def test_changed_file_replaces_entry_in_place(tmp_path):
+    import json
+    import os
+
+    pattern_dir = tmp_path / 'patterns'
+    pattern_dir.mkdir()
+    python_file = pattern_dir / 'python.json'
+    python_file.write_text(json.dumps({'errors': [{'type': 'Old', 'keywords': ['flux']}]}))
+    registry = PatternRegistry(pattern_dir=pattern_dir, custom_dir=tmp_path / 'custom', cache_dir=tmp_path / 'cache')
+    build = lambda: {'files': {}, 'patterns': registry.manager.load_patterns('python')}
+
+    first = registry.compiled(('predict', 'python'), ('python',), build)
+    python_file.write_text(json.dumps({'errors': [{'type': 'New', 'keywords': ['flux', 'gem']}]}))
+    stat = python_file.stat()
+    os.utime(python_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    registry.expire()
+    second = registry.compiled(('predict', 'python'), ('python',), build)
+
+    assert first['patterns'][0]['type'] == 'Old'
+    assert second['patterns'][0]['type'] == 'New'
+    assert registry.compiled_keys() == [('predict', 'python')]
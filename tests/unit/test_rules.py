@@ -0,0 +1,101 @@
+import ast
+import pytest
+from pathlib import Path
+from debugbuddy.core.rules import Rule, RuleEngine, default_engine, parse_python
+from debugbuddy.monitoring.checker import SimpleChecker
+
+SOURCES = [
+    "import os, sys\nimport os.path\nfrom json import loads as parse, dumps\n\nprint(parse(x))\n",
+    "def f(a):\n    return a + b + c\n\nclass K:\n    y = f(z)\n\nprint(z, z, undefined)\n",
+    "from x import *\nvalue = later\nlater = 1\nprint(value, later)\n",
+    "",
+]
+
+def checker_findings(source, filename='mod.py'):
+    checker = SimpleChecker(filename)
+    checker.visit(ast.parse(source))
+    found = {('NameError', line, name) for name, lines in checker.undefined_locations.items() for line in lines}
+    found |= {('UnusedImport', checker.import_lines[name], name) for name in checker.imports if name not in checker.used}
+    return found
+
+def engine_findings(source, filename='mod.py'):
+    found = set()
+    for p in default_engine().run(ast.parse(source), filename):
+        name = p.message.split("'")[1]
+        found.add((p.error_type, p.line, name))
+        assert p.file == filename
+    return found
+
+class TestRuleEngine:
+
+    @pytest.mark.parametrize('source', SOURCES)
+    def test_matches_simple_checker(self, source):
+        assert engine_findings(source) == checker_findings(source)
+
+    def test_matches_simple_checker_on_package(self):
+        for path in sorted((Path(__file__).parents[2] / 'debugbuddy').rglob('*.py')):
+            source = path.read_text(encoding='utf-8')
+            assert engine_findings(source, str(path)) == checker_findings(source, str(path)), path
+
+    def test_dispatch_follows_node_visitor_order(self):
+        seen = []
+
+        class Recorder(Rule):
+            def visit_Name(self, node):
+                seen.append(('rule', node.id))
+
+            def visit_Call(self, node):
+                seen.append(('rule', 'call'))
+
+        class Visitor(ast.NodeVisitor):
+            def visit_Name(self, node):
+                expected.append(('rule', node.id))
+                self.generic_visit(node)
+
+            def visit_Call(self, node):
+                expected.append(('rule', 'call'))
+                self.generic_visit(node)
+
+        tree = ast.parse("a = f(b, g(c)[d])\nfor e in h: i(e)\n")
+        expected = []
+        Visitor().visit(tree)
+        RuleEngine([Recorder]).run(tree, 'x.py')
+
+        assert seen == expected
+
+    def test_dispatch_table_only_lists_wanted_types(self):
+        engine = RuleEngine()
+        assert set(engine.dispatch) == {ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Assign, ast.Name}
+        assert [index for index, _ in engine.dispatch[ast.Name]] == [0, 1]
+
+class TestParsePython:
+
+    def test_tree_is_shared(self):
+        source = "shared_tree_value = 1\n"
+        assert parse_python(source, 'a.py') is parse_python(source, 'b.py')
+
+    def test_syntax_error_is_cached(self, monkeypatch):
+        import ast
+
+        source = "if True\n    pass\n"
+        with pytest.raises(SyntaxError) as first:
+            parse_python(source, 'a.py')
+        monkeypatch.setattr(ast, 'parse', lambda *args, **kwargs: pytest.fail("parsed twice"))
+
+        errors = []
+        for name in ('b.py', 'b.py', 'c.py'):
+            with pytest.raises(SyntaxError) as raised:
+                parse_python(source, name)
+            errors.append(raised.value)
+
+        assert errors[0] is not errors[1]
+        assert [e.filename for e in errors] == ['b.py', 'b.py', 'c.py']
+        assert (errors[2].msg, errors[2].lineno, errors[2].offset) == (
+            first.value.msg, first.value.lineno, first.value.offset)
+        depths = []
+        for error in errors:
+            tb, depth = error.__traceback__, 0
+            while tb is not None:
+                tb, depth = tb.tb_next, depth + 1
+            depths.append(depth)
+        assert depths[0] == depths[-1]
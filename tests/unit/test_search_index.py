@@ -0,0 +1,41 @@
+import pytest
+from debugbuddy.core.explainer import ErrorExplainer
+from debugbuddy.core.pattern_index import SearchIndex
+
+def linear_search(patterns, keyword):
+    keyword_lower = keyword.lower()
+    found = []
+    for lang, data in patterns.items():
+        for pattern in data:
+            searchable = [pattern.get('type', ''), pattern.get('simple', ''), pattern.get('fix', '')]
+            searchable += pattern.get('keywords', [])
+            if any(keyword_lower in str(field).lower() for field in searchable):
+                found.append((lang, pattern.get('type')))
+    return found
+
+@pytest.mark.parametrize("keyword", ['import', 'Name', 'undefined', 'in', 'x', 'null pointer', 'zzqx', 'TS2'])
+def test_same_matches_as_linear_scan(keyword):
+    explainer = ErrorExplainer()
+    results = explainer.search_patterns(keyword)
+
+    got = sorted((r['language'], r['name']) for r in results)
+    assert got == sorted(linear_search(explainer.patterns, keyword))
+
+def test_ranks_by_field_weight_and_count():
+    patterns = {
+        'python': [
+            {'type': 'Other', 'simple': '', 'fix': 'retry the socket', 'keywords': []},
+            {'type': 'Socket Error', 'simple': 'socket closed', 'fix': '', 'keywords': ['socket']},
+            {'type': 'Timeout', 'simple': 'the socket timed out', 'fix': '', 'keywords': []},
+        ]
+    }
+    index = SearchIndex(patterns)
+
+    ranked = [(score, pattern['type']) for score, _, pattern in index.search('SOCKET')]
+    assert ranked == [(10, 'Socket Error'), (2, 'Timeout'), (1, 'Other')]
+
+def test_limit_and_score_in_results():
+    results = ErrorExplainer().search_patterns('error', limit=3)
+
+    assert len(results) == 3
+    assert results[0]['score'] >= results[-1]['score']
@@ -0,0 +1,86 @@
+import io
+import pytest
+from debugbuddy.core.parsers import ErrorParser
+from debugbuddy.core.parsers.segmenter import LogSegmenter, iter_error_blocks
+
+MIXED_LOG = """step 1 ok
+Traceback (most recent call last):
+  File "app.py", line 3, in <module>
+    main()
+NameError: name 'y' is not defined
+building more
+Exception in thread "main" java.lang.NullPointerException: boom
+\tat com.example.Main.main(Main.java:10)
+TypeError: Cannot read property 'map' of undefined
+    at render (/srv/app.js:10:5)
+    at main (/srv/app.js:20:3)
+src/main.c:12:5: error: expected ';' before '}' token
+   12 |   return 0
+      |           ^
+done
+"""
+
+class TestLogSegmenter:
+
+    def test_splits_mixed_log(self):
+        blocks = list(iter_error_blocks(io.StringIO(MIXED_LOG)))
+
+        assert len(blocks) == 4
+        assert blocks[0].startswith('Traceback') and blocks[0].endswith("is not defined")
+        assert blocks[1].startswith('Exception in thread') and 'Main.java:10' in blocks[1]
+        assert blocks[2].count('    at ') == 2
+        assert blocks[3].startswith('src/main.c:12:5: error:') and blocks[3].endswith('^')
+
+    def test_parse_stream_detects_each_language(self):
+        parser = ErrorParser()
+        parsed = list(parser.parse_stream(io.StringIO(MIXED_LOG)))
+
+        assert len(parsed) == 4
+        assert [p['language'] for p in parsed[:3]] == ['python', 'java', 'javascript']
+        assert parsed[0]['type'] == 'Name Error'
+
+    def test_yields_block_before_stream_ends(self):
+        def lines():
+            yield "KeyError: 'x'\n"
+            yield "unrelated output\n"
+            raise AssertionError("segmenter read past the completed block")
+
+        assert next(LogSegmenter().segments(lines())) == "KeyError: 'x'"
+
+    def test_block_size_is_bounded(self):
+        frames = ''.join(f'  File "deep.py", line {i}, in f\n    f()\n' for i in range(5000))
+        log = "Traceback (most recent call last):\n" + frames + "RecursionError: maximum recursion depth exceeded\n"
+
+        blocks = list(LogSegmenter(max_block_lines=50).segments(io.StringIO(log)))
+
+        assert len(blocks) == 1
+        lines = blocks[0].splitlines()
+        assert len(lines) <= 51
+        assert 'lines omitted' in blocks[0]
+        assert lines[-1].startswith('RecursionError')
+
+    def test_keeps_location_of_script_syntax_error(self, tmp_path):
+        import subprocess
+        import sys
+
+        script = tmp_path / 'bad.py'
+        script.write_text("print(\n")
+        stderr = subprocess.run([sys.executable, str(script)], capture_output=True, text=True).stderr
+
+        blocks = list(iter_error_blocks(io.StringIO(stderr)))
+        assert len(blocks) == 1
+        assert blocks[0].lstrip().startswith(f'File "{script}", line 1')
+
+        parsed = ErrorParser().parse(blocks[0])
+        assert parsed['type'] == 'Syntax Error'
+        assert parsed['language'] == 'python'
+        assert parsed['file'] == str(script)
+        assert parsed['line'] == 1
+
+    def test_falls_back_to_whole_text(self):
+        blocks = list(iter_error_blocks(io.StringIO("Something failed badly\nwith details\n")))
+        assert blocks == ["Something failed badly\nwith details"]
+
+    @pytest.mark.parametrize("text", ["", "\n\n"])
+    def test_empty_input(self, text):
+        assert list(iter_error_blocks(io.StringIO(text))) == []
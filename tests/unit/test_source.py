@@ -0,0 +1,82 @@
+import io
+import random
+import pytest
+from debugbuddy.core.predictor import ErrorPredictor
+from debugbuddy.core.source import SNIFF_BYTES, SkippedFile, SourceFile
+
+@pytest.fixture
+def write(tmp_path):
+    def write(data, name='sample.js'):
+        path = tmp_path / name
+        path.write_bytes(data)
+        return path
+    return write
+
+class TestSourceFile:
+
+    def test_lines_match_splitlines(self, write):
+        rng = random.Random(5)
+        alphabet = ['a', 'é', ' ', '\n', '\r', '\r\n', '\x0b', '\x0c', '\x1c', '\x85', '\u2028']
+        for _ in range(500):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+            raw = text.encode('utf-8')
+            with SourceFile.open(write(raw)) as source:
+                assert list(source.lines()) == text.splitlines(), repr(text)
+                assert source.text() == io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8').read()
+
+    def test_empty_file(self, write):
+        with SourceFile.open(write(b'')) as source:
+            assert len(source) == 0
+            assert list(source.lines()) == []
+
+    def test_binary_is_skipped(self, write):
+        with pytest.raises(SkippedFile) as skipped:
+            SourceFile.open(write(b'text\x00more'))
+        assert skipped.value.reason == 'binary'
+
+    def test_non_utf8_is_skipped(self, write):
+        with pytest.raises(SkippedFile) as skipped:
+            SourceFile.open(write('café'.encode('latin-1')))
+        assert skipped.value.reason == 'not UTF-8'
+
+    def test_character_split_by_sniff_boundary(self, write):
+        data = b'a' * (SNIFF_BYTES - 1) + 'é'.encode('utf-8')
+        with SourceFile.open(write(data)) as source:
+            assert list(source.lines()) == ['a' * (SNIFF_BYTES - 1) + 'é']
+
+    def test_size_cap(self, write):
+        path = write(b'x = 1\n' * 1000)
+        with pytest.raises(SkippedFile) as skipped:
+            SourceFile.open(path, max_bytes=1024)
+        assert 'larger than' in skipped.value.reason
+        SourceFile.open(path, max_bytes=6000).close()
+
+class TestPredictorSkips:
+
+    def test_skipped_files_are_reported(self, tmp_path):
+        (tmp_path / 'ok.py').write_text("print(missing)\n")
+        (tmp_path / 'blob.py').write_bytes(b'\x00\x01\x02')
+        (tmp_path / 'big.js').write_text("let x = 1;\n" * 500)
+        predictor = ErrorPredictor({'watch_exclude': [], 'prediction_cache': False})
+        predictor.max_file_bytes = 1024
+
+        results = dict(predictor.iter_predictions([tmp_path], workers=1))
+
+        skipped = dict(predictor.skipped)
+        assert sorted(skipped) == [str(tmp_path / 'big.js'), str(tmp_path / 'blob.py')]
+        assert skipped[str(tmp_path / 'big.js')].startswith('larger than')
+        assert skipped[str(tmp_path / 'blob.py')] == 'binary'
+        assert [p.file for predictions in results.values() for p in predictions] == [str(tmp_path / 'ok.py')]
+
+    def test_streamed_analysis_matches_string_analysis(self, tmp_path):
+        predictor = ErrorPredictor({'prediction_cache': False})
+        keywords = [kw for p in predictor.pattern_mgr.load_patterns('python') for kw in p.get('keywords', [])]
+        lines = [f"x{i} = f({keywords[i % len(keywords)]!r}, {keywords[(3 * i) % len(keywords)]!r})\r"
+                 for i in range(300)]
+        path = tmp_path / 'mixed.py'
+        path.write_bytes('\n'.join(lines).encode('utf-8'))
+        content = path.read_text(encoding='utf-8')
+
+        with SourceFile.open(path) as source:
+            assert predictor._analyze_patterns(path, source) == predictor._analyze_patterns(path, content)
+            assert predictor._analyze_static(path, source) == predictor._analyze_static(path, content)
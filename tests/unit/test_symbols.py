@@ -0,0 +1,65 @@
+import pytest
+from debugbuddy.core.explainer import ErrorExplainer
+from debugbuddy.core.symbols import SymbolIndex, defined_names, edit_distance, file_index, suggest_names
+
+@pytest.mark.parametrize("typo, expected", [
+    ('prnt', 'print'),
+    ('pirnt', 'print'),
+    ('lenn', 'len'),
+    ('jsn', 'json'),
+    ('colections', 'collections'),
+    ('Flase', 'False'),
+])
+def test_builtin_and_stdlib_suggestions(typo, expected):
+    assert suggest_names(typo)[0] == expected
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance('ab', 'ba', 2) == 1
+    assert edit_distance('kitten', 'sitting', 3) == 3
+    assert edit_distance('kitten', 'sitting', 2) == 3
+
+def test_lookup_prefers_closest_names():
+    index = SymbolIndex((name, 'file') for name in ['total', 'totals', 'subtotal', 'tote'])
+
+    assert sorted(symbol for _, symbol, _ in index.lookup('totl')) == ['total', 'tote']
+    assert index.lookup('total') == [(1, 'totals', 'file')]
+    assert index.lookup('subtotl') == [(1, 'subtotal', 'file')]
+
+def test_defined_names_cover_common_bindings():
+    source = "import os.path as osp\nfrom x import y\nclass Shape:\n    def area(self, width):\n        global total\n        height = 2\n"
+
+    assert set(defined_names(source)) >= {'osp', 'y', 'Shape', 'area', 'self', 'width', 'total', 'height'}
+    assert defined_names("def broken(:") == []
+
+def test_file_symbols_are_suggested_first(tmp_path):
+    source = tmp_path / 'app.py'
+    source.write_text("user_count = 0\ndef render_page():\n    pass\n")
+
+    assert suggest_names('user_cont', str(source)) == ['user_count']
+    assert suggest_names('rendr_page', str(source))[0] == 'render_page'
+
+def test_file_index_is_cached_by_content(tmp_path):
+    first = tmp_path / 'a.py'
+    second = tmp_path / 'b.py'
+    first.write_text("alpha = 1\n")
+    second.write_text("alpha = 1\n")
+
+    assert file_index(str(first)) is file_index(str(second))
+    second.write_text("beta = 1\n")
+    assert file_index(str(first)) is not file_index(str(second))
+    assert file_index(str(tmp_path / 'missing.py')) is None
+
+def test_explainer_uses_project_symbols(tmp_path):
+    source = tmp_path / 'main.py'
+    source.write_text("customer_name = 'x'\nprint(custmer_name)\n")
+    parsed = {
+        'type': 'Name Error',
+        'message': "name 'custmer_name' is not defined",
+        'file': str(source),
+        'line': 2,
+        'language': 'python',
+    }
+
+    suggestions = ErrorExplainer().explain(parsed)['suggestions']
+
+    assert suggestions[0] == 'Did you mean: customer_name?'